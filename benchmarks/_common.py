@@ -0,0 +1,182 @@
+"""
+基准测试公共工具
+计时与峰值内存统计、本地桩HTTP服务、结果写出与对比
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import statistics
+import tracemalloc
+import subprocess
+from datetime import datetime
+
+# 以插件根目录为导入根，使 src 可以作为包导入（需要在AstrBot环境中运行）
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PLUGIN_ROOT not in sys.path:
+    sys.path.insert(0, PLUGIN_ROOT)
+
+FIXTURES_DIR = os.path.join(PLUGIN_ROOT, "benchmarks", "fixtures")
+RESULTS_DIR = os.path.join(PLUGIN_ROOT, "benchmarks", "results")
+
+
+def quiet_logs():
+    """压低插件日志级别，避免大量INFO日志影响计时"""
+    from astrbot.api import logger
+    logger.setLevel(logging.WARNING)
+
+
+def read_fixture(name: str, mode: str = "r"):
+    """读取 fixtures 目录下的文件"""
+    encoding = None if "b" in mode else "utf-8"
+    with open(os.path.join(FIXTURES_DIR, name), mode, encoding=encoding) as f:
+        return f.read()
+
+
+def _summary(stage: str, samples: list[float], peak_bytes: int, items: int, **labels) -> dict:
+    """根据每次耗时（秒）生成统计结果"""
+    ordered = sorted(samples)
+    mean = statistics.fmean(ordered)
+    return {
+        "stage": stage,
+        **labels,
+        "iterations": len(ordered),
+        "mean_ms": round(mean * 1000, 4),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+        "throughput_per_s": round(items / mean, 2) if mean > 0 else None,
+        "peak_kib": round(peak_bytes / 1024, 1),
+    }
+
+
+def measure(stage: str, func, iterations: int, items: int = 1, setup=None, **labels) -> dict:
+    """
+    测量同步函数：每次执行前调用 setup（不计时），统计耗时与峰值内存
+    items 为单次执行处理的条目数，用于计算吞吐量
+    """
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    # tracemalloc 会显著拖慢执行，峰值内存单独跑一次测量
+    if setup:
+        setup()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return _summary(stage, samples, peak, items, **labels)
+
+
+async def measure_async(stage: str, func, iterations: int, items: int = 1, setup=None, **labels) -> dict:
+    """测量异步函数，见 measure"""
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+
+    # tracemalloc 会显著拖慢执行，峰值内存单独跑一次测量
+    if setup:
+        setup()
+    tracemalloc.start()
+    await func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return _summary(stage, samples, peak, items, **labels)
+
+
+async def start_stub_server(routes: dict, host: str = "127.0.0.1", port: int = 0):
+    """
+    启动本地桩HTTP服务
+    routes: {路径: aiohttp 处理函数}
+    返回 (runner, 基础地址)
+    """
+    from aiohttp import web
+
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_route("*", path, handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PLUGIN_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def write_results(suite: str, results: list[dict], output: str = "") -> str:
+    """把结果写成JSON文件，返回文件路径"""
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{suite}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    payload = {
+        "suite": suite,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return output
+
+
+def _result_key(result: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in result.items() if not k.endswith(("_ms", "_kib", "_per_s")) and k != "iterations"))
+
+
+def compare_results(results: list[dict], baseline_path: str, threshold: float) -> list[str]:
+    """
+    与基线结果对比平均耗时
+    返回超过 threshold 倍（如 1.2 表示慢20%）的回归项描述
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {_result_key(result): result for result in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        base = baseline.get(_result_key(result))
+        if not base or not base["mean_ms"]:
+            continue
+        ratio = result["mean_ms"] / base["mean_ms"]
+        if ratio > threshold:
+            labels = ", ".join(f"{k}={v}" for k, v in _result_key(result))
+            regressions.append(f"{labels}: {base['mean_ms']}ms → {result['mean_ms']}ms（{ratio:.2f}x）")
+    return regressions
+
+
+def print_table(results: list[dict]):
+    """在终端打印结果表格"""
+    if not results:
+        return
+    metrics = ["mean_ms", "p95_ms", "throughput_per_s", "peak_kib"]
+    label_keys = []
+    for result in results:
+        label_keys += [k for k in result if k not in label_keys and k not in metrics + ["iterations", "p50_ms"]]
+    header = label_keys + metrics
+    rows = [[str(result.get(key, "")) for key in header] for result in results]
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(header)]
+    print("  ".join(h.ljust(w) for h, w in zip(header, widths)))
+    for row in rows:
+        print("  ".join(cell.ljust(w) for cell, w in zip(row, widths)))
@@ -0,0 +1,189 @@
+"""
+比赛爬取基准测试
+基于录制的平台响应（或仓库内的平台快照）离线测量：
+- 各平台解析耗时、吞吐量与峰值内存（cf 只有流式解析，单独测量）
+- 各平台经由回放服务的获取+解析耗时
+- update() 端到端耗时（正常回放、注入延迟与失败两种场景）
+
+用法（在插件根目录、AstrBot 运行环境中执行）：
+    python -m benchmarks.bench_contest_crawler
+    python -m benchmarks.bench_contest_crawler --latency 0.2 --slow atcoder=3 --fail cf=1 --set contest_source_timeout=2
+    python -m benchmarks.bench_contest_crawler --compare benchmarks/results/contest_crawler_xxx.json
+
+默认使用 benchmarks/recordings/ 中的录制数据（见 benchmarks.contest_replay），不存在时回放 benchmarks/fixtures 中的平台快照
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+import tempfile
+
+from benchmarks._common import (
+    measure, measure_async, write_results, compare_results, print_table, quiet_logs,
+)
+from benchmarks.contest_replay import (
+    RECORDINGS_DIR, SOURCES, ReplayServer, has_recordings, load_recordings, load_fixtures,
+    parse_source_values, _build_crawler,
+)
+
+HTML_SOURCES = ("atcoder", "nowcoder")
+
+
+def _parse_overrides(pairs: list[str]) -> dict:
+    """把 --set key=value 解析为配置覆盖项，值按JSON解析（失败时作为字符串）"""
+    overrides = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        try:
+            overrides[key] = json.loads(value)
+        except json.JSONDecodeError:
+            overrides[key] = value
+    return overrides
+
+
+def bench_parse(recordings: dict, storage_root: str, iterations: int) -> list[dict]:
+    """直接解析录制的响应，测量各平台的解析耗时与内存"""
+    http_client, crawler = _build_crawler(storage_root, {})
+    results = []
+    for source in SOURCES:
+        # cf 只有流式解析，见 bench_parse_stream
+        if source == "cf" or source not in recordings:
+            continue
+        text = recordings[source]["body"].decode("utf-8", errors="replace")
+        parse = getattr(crawler, f"_parse_{source}_contest")
+        items = len(parse(text))
+        # 只有 HTML 页面的解析受解析后端影响
+        labels = {"parser": crawler.html_parser.name} if source in HTML_SOURCES else {}
+        results.append(measure(
+            "parse", lambda: parse(text), iterations,
+            items=max(items, 1), source=source, **labels,
+        ))
+    return results
+
+
+async def bench_parse_stream(recordings: dict, storage_root: str, iterations: int) -> list[dict]:
+    """按网络分块的方式喂给cf流式解析，测量解析耗时与内存"""
+    if "cf" not in recordings:
+        return []
+    http_client, crawler = _build_crawler(storage_root, {})
+    body = recordings["cf"]["body"]
+    chunk_size = crawler.CF_STREAM_CHUNK_SIZE
+
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    items = len(await crawler._parse_cf_contest_stream(chunks()))
+    return [await measure_async(
+        "parse_stream", lambda: crawler._parse_cf_contest_stream(chunks()), iterations,
+        items=max(items, 1), source="cf",
+    )]
+
+
+async def bench_fetch(recordings: dict, storage_root: str, args, overrides: dict) -> list[dict]:
+    """经由回放服务测量各平台单独的获取+解析耗时"""
+    server = ReplayServer(recordings, latency=parse_source_values(args.latency))
+    source_urls = await server.start()
+    http_client, crawler = _build_crawler(storage_root, source_urls, overrides)
+    results = []
+    try:
+        for source in SOURCES:
+            if source not in recordings:
+                continue
+            fetch = getattr(crawler, f"_fetch_{source}_contest")
+            await fetch()   # 预热连接
+            results.append(await measure_async(
+                "fetch", fetch, args.iterations, source=source,
+            ))
+    finally:
+        await http_client.close()
+        await server.close()
+    return results
+
+
+async def bench_update(recordings: dict, workdir: str, scenario: str, latency: dict, failures: dict,
+                       args, overrides: dict) -> list[dict]:
+    """测量 update() 端到端耗时，并打印各平台状态与注入情况"""
+    server = ReplayServer(recordings, latency=latency, failures=failures, seed=args.seed)
+    source_urls = await server.start()
+    storage_root = os.path.join(workdir, scenario)
+    os.makedirs(storage_root, exist_ok=True)
+    http_client, crawler = _build_crawler(storage_root, source_urls, overrides)
+
+    last = {}
+
+    async def run_update():
+        # 忽略刷新策略，保证每轮五个平台都真正请求
+        last.update(await crawler.update(force=True))
+
+    try:
+        result = await measure_async(
+            "update", run_update, args.iterations, items=1, scenario=scenario,
+        )
+    finally:
+        await http_client.close()
+        await server.close()
+
+    statuses = ", ".join(
+        f"{source}={stat['status']}({stat['count']}, {stat['elapsed']}s)" for source, stat in last["sources"].items()
+    )
+    print(f"[{scenario}] 最后一轮: {len(last['contests'])}个比赛; {statuses}; 注入失败: {dict(server.injected_failures)}")
+    return [result]
+
+
+async def run(args) -> list[dict]:
+    overrides = _parse_overrides(args.set)
+    with tempfile.TemporaryDirectory(prefix="contest_bench_") as workdir:
+        if has_recordings(args.recordings):
+            recordings = load_recordings(args.recordings)
+        else:
+            recordings = load_fixtures()
+            print(f"未找到录制数据 {args.recordings}，使用 benchmarks/fixtures 中的平台快照")
+
+        results = bench_parse(recordings, workdir, args.iterations)
+        results += await bench_parse_stream(recordings, workdir, args.iterations)
+        results += await bench_fetch(recordings, workdir, args, overrides)
+
+        latency = parse_source_values(args.latency)
+        results += await bench_update(recordings, workdir, "replay", latency, {}, args, overrides)
+        degraded_latency = {**latency, **parse_source_values(args.slow)}
+        degraded_failures = parse_source_values(args.fail)
+        results += await bench_update(recordings, workdir, "degraded", degraded_latency, degraded_failures, args, overrides)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比赛爬取基准测试")
+    parser.add_argument("--recordings", default=RECORDINGS_DIR, help="录制数据目录")
+    parser.add_argument("--iterations", type=int, default=5, help="每项的测量次数")
+    parser.add_argument("--latency", nargs="*", default=["0.05"],
+                        help="回放延迟（秒），格式为 秒 或 平台=秒")
+    parser.add_argument("--slow", nargs="*", default=["nowcoder=1"],
+                        help="degraded 场景额外的延迟，格式为 平台=秒")
+    parser.add_argument("--fail", nargs="*", default=["cf=1"],
+                        help="degraded 场景的失败概率，格式为 平台=概率")
+    parser.add_argument("--set", nargs="*", default=[],
+                        help="覆盖插件配置，如 contest_source_timeout=5 http_pool_size_per_host=2")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（失败注入）")
+    parser.add_argument("--output", default="", help="结果JSON路径（默认写入 benchmarks/results/）")
+    parser.add_argument("--compare", default="", help="基线结果JSON路径")
+    parser.add_argument("--threshold", type=float, default=1.2, help="判定回归的耗时倍数")
+    args = parser.parse_args()
+
+    quiet_logs()
+    results = asyncio.run(run(args))
+    print_table(results)
+    print(f"结果已写入: {write_results('contest_crawler', results, args.output)}")
+
+    if args.compare:
+        regressions = compare_results(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"[回归] {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+通知处理流程基准测试
+获取 → 解析 → 去重保存 → 排序 → 分页读取 → 报告数据准备 → 标题搜索，
+分别在 1k / 10k / 100k 条通知的合成存储（csv、sqlite）上测量各阶段的耗时、吞吐量与峰值内存
+
+用法（在插件根目录、AstrBot 运行环境中执行）：
+    python -m benchmarks.bench_notice_pipeline
+    python -m benchmarks.bench_notice_pipeline --sizes 1000 10000 --backends sqlite
+    python -m benchmarks.bench_notice_pipeline --compare benchmarks/results/notice_pipeline_xxx.json
+
+结果以JSON写入 benchmarks/results/，指定 --compare 时与基线对比，出现回归则以非零状态码退出
+"""
+
+import os
+import csv
+import sys
+import shutil
+import asyncio
+import argparse
+import tempfile
+import itertools
+from datetime import date, timedelta
+
+from benchmarks._common import (
+    measure, measure_async, start_stub_server, read_fixture,
+    write_results, compare_results, print_table, quiet_logs,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+STORAGE_BACKENDS = ["csv", "sqlite"]
+PARSER_BACKENDS = ["selectolax", "lxml", "html.parser"]
+LIST_PATH = "/tztg/cxycyjybgs.htm"
+ARCHIVE_PATH = "/tztg/cxycyjybgs/1.htm"
+SAVE_BATCH = 20         # 每轮保存的通知数（与通知列表单页条数相当）
+PAGE_LEN = 10           # 分页读取与报告使用的每页条数
+# 标题搜索的查询：选择性高（只命中少数标题）与命中全部标题两种情况
+SEARCH_QUERIES = {"selective": "第4242届", "broad": "挑战杯"}
+
+
+def _synthetic_rows(size: int) -> list[dict]:
+    """生成按日期倒序排列的合成通知（每天约3条）"""
+    start = date(2024, 12, 31)
+    return [
+        {
+            "时间": (start - timedelta(days=i // 3)).strftime("%Y-%m-%d"),
+            "标题": f"关于举办第{i}届“挑战杯”大学生课外学术科技作品竞赛校内选拔赛的通知",
+            "链接": f"https://bksy.csu.edu.cn/info/1012/{100000 + i}.htm",
+        }
+        for i in range(size)
+    ]
+
+
+def _write_csv(path: str, rows: list[dict]):
+    from src.storage import NOTICE_FIELDNAMES
+    with open(path, "w", encoding="UTF-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=NOTICE_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _build_handler(storage_root: str, backend: str, url: str, rows: list[dict]):
+    """
+    在 storage_root 下构造指定后端的通知数据处理器
+    合成数据先写成CSV；sqlite 后端首次启动时会从CSV迁移（与真实升级路径一致）
+    """
+    from src.core import ConfigManager, HttpClient, NoticeDataHandler
+    from src.reports import ReportGenerator
+
+    os.makedirs(storage_root, exist_ok=True)
+    _write_csv(os.path.join(storage_root, "csu_innovation_notices.csv"), rows)
+    config = ConfigManager({
+        "storage_root": storage_root + os.sep,
+        "storage_backend": backend,
+        "url": url,
+        "base_url": url.rsplit("/tztg/", 1)[0],
+        "render_cache_size": 0,
+    })
+    http_client = HttpClient(config)
+    data_handler = NoticeDataHandler(config=config, http_client=http_client)
+    report_generator = ReportGenerator(config, data_handler)
+    return http_client, data_handler, report_generator
+
+
+async def bench_fetch(base_url: str, iterations: int) -> list[dict]:
+    """通过本地桩服务测量页面获取（连接复用后的单次请求耗时）"""
+    from src.core import ConfigManager, HttpClient, NoticeDataHandler
+
+    results = []
+    with tempfile.TemporaryDirectory() as storage_root:
+        config = ConfigManager({"storage_root": storage_root + os.sep, "storage_backend": "csv"})
+        http_client = HttpClient(config)
+        data_handler = NoticeDataHandler(config=config, http_client=http_client)
+        try:
+            for path in (LIST_PATH, ARCHIVE_PATH):
+                url = base_url + path
+                await data_handler.fetch_url_content(url)    # 预热连接
+                results.append(await measure_async(
+                    "fetch", lambda: data_handler.fetch_url_content(url), iterations, page=path,
+                ))
+        finally:
+            await http_client.close()
+            data_handler.close()
+    return results
+
+
+def bench_parse(html_content: str, iterations: int) -> list[dict]:
+    """分别测量各个已安装解析后端解析通知列表页的耗时"""
+    from src.core import ConfigManager, HttpClient, NoticeDataHandler
+    from src.core.html_parsers import get_html_parser
+
+    results = []
+    with tempfile.TemporaryDirectory() as storage_root:
+        config = ConfigManager({"storage_root": storage_root + os.sep, "storage_backend": "csv"})
+        data_handler = NoticeDataHandler(config=config, http_client=HttpClient(config))
+        try:
+            for name in PARSER_BACKENDS:
+                backend = get_html_parser(name)
+                if backend.name != name:
+                    print(f"跳过未安装的解析后端: {name}")
+                    continue
+                data_handler.html_parser = backend
+                items = len(data_handler.parse_notices(html_content))
+                results.append(measure(
+                    "parse", lambda: data_handler.parse_notices(html_content), iterations,
+                    items=items, parser=name,
+                ))
+        finally:
+            data_handler.close()
+    return results
+
+
+async def bench_store(workdir: str, backend: str, size: int, base_url: str, iterations: int) -> list[dict]:
+    """在指定规模的合成存储上测量保存、排序、读取与报告数据准备"""
+    rows = _synthetic_rows(size)
+    storage_root = os.path.join(workdir, f"{backend}_{size}")
+    labels = {"backend": backend, "size": size}
+    results = []
+
+    http_client, data_handler, report_generator = _build_handler(storage_root, backend, base_url + LIST_PATH, rows)
+    try:
+        # 去重保存：一半是已存储的通知，一半是新通知
+        counter = itertools.count()
+
+        def save_batch():
+            batch = [dict(row) for row in rows[:SAVE_BATCH // 2]]
+            for _ in range(SAVE_BATCH - len(batch)):
+                i = next(counter)
+                batch.append({"时间": "2025-01-01", "标题": f"新通知{i}", "链接": f"https://bksy.csu.edu.cn/info/new/{i}.htm"})
+            return data_handler.save_notices(batch)
+
+        results.append(measure("save", save_batch, iterations, items=SAVE_BATCH, **labels))
+        results.append(measure("sort", data_handler.sort_notices_by_time, iterations, items=size, **labels))
+
+        last_page = max(1, size // PAGE_LEN)
+        for page in (1, last_page):
+            results.append(measure(
+                "read_notices", lambda: data_handler.read_notices(PAGE_LEN, page), iterations,
+                items=PAGE_LEN, page=page, **labels,
+            ))
+            results.append(await measure_async(
+                "prepare_render_data", lambda: report_generator._prepare_render_data(page, PAGE_LEN), iterations,
+                items=PAGE_LEN, page=page, **labels,
+            ))
+
+        for kind, query in SEARCH_QUERIES.items():
+            results.append(measure(
+                "search", lambda: data_handler.search_notices(query, PAGE_LEN), iterations,
+                query=kind, **labels,
+            ))
+    finally:
+        await http_client.close()
+        data_handler.close()
+        shutil.rmtree(storage_root, ignore_errors=True)
+    return results
+
+
+async def run(args) -> list[dict]:
+    from aiohttp import web
+
+    list_html = read_fixture("csu_notice_list.html")
+    archive_html = read_fixture("csu_notice_archive.html")
+
+    def page_handler(body: str):
+        async def handler(request):
+            return web.Response(text=body, content_type="text/html", charset="utf-8")
+        return handler
+
+    # 本地桩服务，代替 bksy.csu.edu.cn
+    runner, base_url = await start_stub_server({
+        LIST_PATH: page_handler(list_html),
+        ARCHIVE_PATH: page_handler(archive_html),
+    })
+    results = []
+    try:
+        results += await bench_fetch(base_url, args.iterations)
+        results += bench_parse(list_html, args.iterations)
+        with tempfile.TemporaryDirectory(prefix="csu_notice_bench_") as workdir:
+            for backend in args.backends:
+                for size in args.sizes:
+                    print(f"测量 {backend} 后端，{size} 条通知...")
+                    results += await bench_store(workdir, backend, size, base_url, args.iterations)
+    finally:
+        await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="通知处理流程基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="合成存储的通知条数")
+    parser.add_argument("--backends", nargs="+", default=STORAGE_BACKENDS, choices=STORAGE_BACKENDS, help="存储后端")
+    parser.add_argument("--iterations", type=int, default=5, help="每个阶段的测量次数")
+    parser.add_argument("--output", default="", help="结果JSON路径（默认写入 benchmarks/results/）")
+    parser.add_argument("--compare", default="", help="基线结果JSON路径")
+    parser.add_argument("--threshold", type=float, default=1.2, help="判定回归的耗时倍数")
+    args = parser.parse_args()
+
+    quiet_logs()
+    results = asyncio.run(run(args))
+    print_table(results)
+    print(f"结果已写入: {write_results('notice_pipeline', results, args.output)}")
+
+    if args.compare:
+        regressions = compare_results(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"[回归] {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+比赛平台响应的录制与回放
+- record：启动本地转发服务，ContestCrawler 的请求经由它转发到真实平台，响应按平台保存下来
+- load_fixtures：没有录制数据（或无法联网）时，回放 benchmarks/fixtures 中提交的平台快照
+- ReplayServer：从录制目录回放响应，可按平台注入延迟与失败
+
+录制目录结构：
+    manifest.json     {平台: {"status", "content_type", "file", "recorded_at"}}
+    <平台>.body        响应原文
+
+用法（在插件根目录、AstrBot 运行环境中执行）：
+    python -m benchmarks.contest_replay record
+    python -m benchmarks.contest_replay fixtures --output /tmp/contest_recordings
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from collections import Counter
+
+from benchmarks._common import PLUGIN_ROOT, start_stub_server, quiet_logs, read_fixture
+
+RECORDINGS_DIR = os.path.join(PLUGIN_ROOT, "benchmarks", "recordings")
+MANIFEST = "manifest.json"
+SOURCES = ["cf", "lougu", "atcoder", "nowcoder", "leetcode"]
+# 转发时保留的请求头
+FORWARD_HEADERS = ("User-Agent", "Content-Type", "Referer", "Accept")
+
+
+def has_recordings(recordings_dir: str) -> bool:
+    return os.path.exists(os.path.join(recordings_dir, MANIFEST))
+
+
+def load_recordings(recordings_dir: str) -> dict:
+    """读取录制目录，返回 {平台: {"status", "content_type", "body"(bytes), "recorded_at"}}"""
+    with open(os.path.join(recordings_dir, MANIFEST), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    recordings = {}
+    for source, entry in manifest.items():
+        with open(os.path.join(recordings_dir, entry["file"]), "rb") as f:
+            recordings[source] = {**entry, "body": f.read()}
+    return recordings
+
+
+def _save_recording(recordings_dir: str, source: str, status: int, content_type: str, body: bytes):
+    os.makedirs(recordings_dir, exist_ok=True)
+    manifest_path = os.path.join(recordings_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    file_name = f"{source}.body"
+    with open(os.path.join(recordings_dir, file_name), "wb") as f:
+        f.write(body)
+    manifest[source] = {
+        "status": status,
+        "content_type": content_type,
+        "file": file_name,
+        "recorded_at": int(time.time()),
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=4)
+
+
+def _build_crawler(storage_root: str, source_urls: dict, overrides: dict = None):
+    """构造指向指定地址的 ContestCrawler，返回 (http_client, crawler)"""
+    from src.core import ConfigManager, HttpClient
+    from src.crawlers import ContestCrawler
+
+    config = ConfigManager({"storage_root": storage_root + os.sep, **(overrides or {})})
+    http_client = HttpClient(config)
+    return http_client, ContestCrawler(config, http_client, source_urls=source_urls)
+
+
+###### 录制 ######
+
+async def record(recordings_dir: str = RECORDINGS_DIR) -> dict:
+    """
+    让 ContestCrawler 经由本地转发服务请求真实平台，保存每个平台的响应
+    请求方式、请求头、GraphQL 请求体都来自爬虫本身，录制结果与线上请求一致
+    返回 update() 的各平台状态
+    """
+    import aiohttp
+    from aiohttp import web
+    from src.crawlers import ContestCrawler
+
+    upstream_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+
+    def forward(source: str):
+        async def handler(request: web.Request):
+            body = await request.read()
+            headers = {key: request.headers[key] for key in FORWARD_HEADERS if key in request.headers}
+            async with upstream_session.request(
+                request.method, ContestCrawler.SOURCE_URLS[source], headers=headers, data=body or None,
+            ) as upstream:
+                payload = await upstream.read()
+                content_type = upstream.headers.get("Content-Type", "application/octet-stream")
+                _save_recording(recordings_dir, source, upstream.status, content_type, payload)
+                print(f"已录制 {source}: HTTP {upstream.status}, {len(payload)} 字节")
+                return web.Response(body=payload, status=upstream.status, headers={"Content-Type": content_type})
+        return handler
+
+    runner, base_url = await start_stub_server({f"/{source}": forward(source) for source in SOURCES})
+    try:
+        with tempfile.TemporaryDirectory() as storage_root:
+            http_client, crawler = _build_crawler(
+                storage_root, {source: f"{base_url}/{source}" for source in SOURCES}
+            )
+            try:
+                result = await crawler.update(force=True)
+            finally:
+                await http_client.close()
+    finally:
+        await runner.cleanup()
+        await upstream_session.close()
+    return result["sources"]
+
+
+###### 仓库内的平台快照 ######
+
+# benchmarks/fixtures 中各平台的响应快照，清单记录快照时刻与各平台的文件、Content-Type
+FIXTURES_MANIFEST = "contest_fixtures.json"
+# JSON 接口中随快照时刻平移的时间戳字段（按平台解析时会过滤已开始的比赛）
+_SHIFTED_FIELDS = {
+    "cf": ("startTimeSeconds",),
+    "lougu": ("startTime", "endTime", "currentTime"),
+    "leetcode": ("startTime",),
+}
+
+
+def _shift_times(value, fields: tuple, delta: int):
+    """递归平移 JSON 中的时间戳字段"""
+    if isinstance(value, dict):
+        return {
+            key: item + delta if key in fields and isinstance(item, int) else _shift_times(item, fields, delta)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_shift_times(item, fields, delta) for item in value]
+    return value
+
+
+def load_fixtures(now: int = None) -> dict:
+    """
+    读取 benchmarks/fixtures 中的平台快照，返回与 load_recordings 相同的结构
+    JSON 接口的时间戳整体平移到相对当前时刻（保证仍有尚未开始的比赛可解析），HTML 页面原样回放
+    """
+    manifest = json.loads(read_fixture(FIXTURES_MANIFEST))
+    now = int(time.time()) if now is None else now
+    delta = now - manifest["snapshot_at"]
+    recordings = {}
+    for source, entry in manifest["sources"].items():
+        body = read_fixture(entry["file"], "rb")
+        if source in _SHIFTED_FIELDS:
+            payload = _shift_times(json.loads(body), _SHIFTED_FIELDS[source], delta)
+            body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        recordings[source] = {
+            "status": 200,
+            "content_type": entry["content_type"],
+            "file": entry["file"],
+            "recorded_at": manifest["snapshot_at"],
+            "body": body,
+        }
+    return recordings
+
+
+def export_fixtures(recordings_dir: str, now: int = None):
+    """把平台快照（时间戳已平移）写成录制目录，供 ReplayServer 或其它工具使用"""
+    for source, recording in load_fixtures(now).items():
+        _save_recording(recordings_dir, source, recording["status"], recording["content_type"], recording["body"])
+
+
+###### 回放 ######
+
+class ReplayServer:
+    """
+    从录制目录回放比赛平台的响应
+    latency：{平台: 秒}，"*" 为默认延迟
+    failures：{平台: 失败概率}，失败时返回 failure_status
+    """
+
+    def __init__(self, recordings: dict, latency: dict = None, failures: dict = None,
+                 failure_status: int = 503, seed: int = 0):
+        self.recordings = recordings
+        self.latency = latency or {}
+        self.failures = failures or {}
+        self.failure_status = failure_status
+        self.requests = Counter()           # 各平台收到的请求数
+        self.injected_failures = Counter()  # 各平台注入的失败数
+        self._rng = random.Random(seed)
+        self._runner = None
+
+    def _handler(self, source: str):
+        from aiohttp import web
+
+        async def handler(request: web.Request):
+            await request.read()
+            self.requests[source] += 1
+            delay = self.latency.get(source, self.latency.get("*", 0))
+            if delay:
+                await asyncio.sleep(delay)
+            if self._rng.random() < self.failures.get(source, 0):
+                self.injected_failures[source] += 1
+                return web.Response(status=self.failure_status, text="injected failure")
+            recording = self.recordings[source]
+            return web.Response(
+                body=recording["body"], status=recording["status"],
+                headers={"Content-Type": recording["content_type"]},
+            )
+        return handler
+
+    async def start(self) -> dict:
+        """启动回放服务，返回可直接传给 ContestCrawler 的 source_urls"""
+        self._runner, base_url = await start_stub_server(
+            {f"/{source}": self._handler(source) for source in self.recordings}
+        )
+        return {source: f"{base_url}/{source}" for source in self.recordings}
+
+    async def close(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def parse_source_values(pairs: list[str], cast=float) -> dict:
+    """把命令行的 平台=值 列表解析为字典，单独的值作为默认值（"*"）"""
+    values = {}
+    for pair in pairs or []:
+        source, sep, value = pair.partition("=")
+        if sep:
+            values[source] = cast(value)
+        else:
+            values["*"] = cast(source)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比赛平台响应的录制与导出")
+    sub = parser.add_subparsers(dest="command", required=True)
+    record_parser = sub.add_parser("record", help="经由本地转发服务请求真实平台并保存响应")
+    record_parser.add_argument("--output", default=RECORDINGS_DIR)
+    fixtures_parser = sub.add_parser("fixtures", help="把仓库内的平台快照导出为录制目录")
+    fixtures_parser.add_argument("--output", default=RECORDINGS_DIR)
+    args = parser.parse_args()
+
+    quiet_logs()
+    if args.command == "record":
+        sources = asyncio.run(record(args.output))
+        for source, stat in sources.items():
+            print(f"{source}: {stat['status']} {stat['count']}个比赛 {stat['elapsed']}s {stat['error']}")
+    else:
+        export_fixtures(args.output)
+        print(f"平台快照已导出: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
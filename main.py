@@ -2,7 +2,7 @@ from astrbot.api.event import filter, AstrMessageEvent, MessageEventResult
 from astrbot.api.star import Context, Star, register
 from astrbot.api import logger
 from astrbot.api import AstrBotConfig
-from .src.core import BotManager, ConfigManager, NoticeDataHandler, CommandHelper
+from .src.core import BotManager, ConfigManager, NoticeDataHandler, CommandHelper, HttpClient, NoticeBackfiller, LoopLagMonitor, NoticeRefreshCoordinator
 from .src.reports import ReportGenerator
 from .src.scheduler import AutoScheduler
 from .src.crawlers import ContestCrawler, Contest
@@ -29,11 +29,22 @@ class MyPlugin(Star):
                     """
                      )
 
+        # 初始化共享的HTTP客户端（通知与比赛爬虫共用连接池）
+        self.http_client = HttpClient(self.config_manager)
+
         # 初始化数据处理工具
-        self.data_handler = NoticeDataHandler(config=self.config_manager)
+        self.data_handler = NoticeDataHandler(config=self.config_manager, http_client=self.http_client)
+
+        # 初始化历史通知回填器
+        self.backfiller = NoticeBackfiller(self.config_manager, self.data_handler)
 
         # 初始化报告生成器
-        self.report_generator = ReportGenerator(self.config_manager)
+        self.report_generator = ReportGenerator(self.config_manager, self.data_handler)
+
+        # 初始化通知刷新协调器（更新命令与定时推送共享同一次获取、保存与渲染）
+        self.notice_refresh = NoticeRefreshCoordinator(
+            self.config_manager, self.data_handler, self.report_generator, self.html_render
+        )
 
         # 初始化命令辅助类
         # 初始化群组配置管理器
@@ -50,30 +61,35 @@ class MyPlugin(Star):
             ReportGenerator=self.report_generator,
             html_render_func=self.html_render,
             bot_manager=self.bot_manager,
+            notice_refresh=self.notice_refresh,
+            group_config=self.group_config_manager,
         )
 
         # 初始化比赛爬虫
-        self.contest_crawler = ContestCrawler(self.config_manager)
+        self.contest_crawler = ContestCrawler(self.config_manager, self.http_client)
+
+        # 初始化事件循环延迟监控
+        self.loop_monitor = LoopLagMonitor()
 
 
     async def initialize(self):
         """可选择实现异步的插件初始化方法，当实例化该插件类之后会自动调用该方法。"""
+        # 启动共享的HTTP客户端
+        await self.http_client.start()
+        # 启动事件循环延迟监控
+        self.loop_monitor.start()
+
         # 启动自动调度器
         await self.auto_scheduler.start_scheduler()
         await self.bot_manager.initialize_from_config()
 
 
         # 预处理
-        # 事先爬取https://bksy.csu.edu.cn/tztg/cxycyjybgs/xx.htm里所有通知，xx为1~18
-        # 若本地存储的数量过少，爬取所有通知
-        if len(self.data_handler._get_existing_links()) < 250:
+        # 事先爬取https://bksy.csu.edu.cn/tztg/cxycyjybgs/xx.htm里所有通知（页数从首页分页栏自动识别）
+        # 若本地存储的数量过少，或上次回填未完成，爬取所有通知
+        if await self.data_handler.count_notices_async() < 250 or self.backfiller.has_pending():
             logger.info("本地存储的通知数量过少，开始爬取所有通知")
-            for page in range(1, 19):
-                test_content = await self.data_handler.fetch_url_content(f"https://bksy.csu.edu.cn/tztg/cxycyjybgs/{page}.htm")
-                # 写入
-                notices = self.data_handler.parse_notices(test_content)
-                new_count = self.data_handler.save_notices(notices)
-                logger.info(f"写入了{new_count}条新通知")
+            await self.backfiller.run()
 
 
 
@@ -94,10 +110,22 @@ class MyPlugin(Star):
     async def config(self, event: AstrMessageEvent):
         # 手动计算距离下次执行时间
         """查看配置"""
+        loop_lag = self.loop_monitor.get_stats()
+        delivery_stats = "; ".join(
+            f"{group_id}: 投递{stats['deliveries']}次/失败{stats['failures']}次/最近耗时{stats['last_latency']}秒"
+            for group_id, stats in self.auto_scheduler.dispatcher.stats.items()
+        ) or "暂无"
+        group_task_stats = "; ".join(
+            f"{job_id}: {stats['sessions']}个会话/下次 {stats['next_run']}"
+            for job_id, stats in self.auto_scheduler.group_tasks.stats().items()
+        ) or "暂无"
         configText = f"""
         配置信息：
         - 目标URL: {self.config_manager.get_url()}
         - 下次自动更新时间: {self.auto_scheduler.get_next_execution_time()}
+        - 事件循环延迟: 最近平均 {loop_lag['recent_avg_ms']}ms, 最近最大 {loop_lag['recent_max_ms']}ms, 历史最大 {loop_lag['max_ms']}ms
+        - 群推送统计: {delivery_stats}
+        - 群组推送任务: {group_task_stats}
         """
         yield event.plain_result(configText)
 
@@ -109,9 +137,10 @@ class MyPlugin(Star):
         - list_len: 每页显示的通知数量，默认10条
         """
         try:
-            image_url = await self.report_generator.generate_image_report(self.html_render, page, list_len)
-            if image_url:
-                yield event.image_result(image_url)
+            images = await self.report_generator.generate_image_report(self.html_render, page, list_len)
+            if images:
+                for image in images:
+                    yield event.image_result(image)
             else:
                 yield event.plain_result("❌ 报告图片生成失败")
 
@@ -119,27 +148,64 @@ class MyPlugin(Star):
             logger.error(f"查找通知时出错: {str(e)}")
             yield event.plain_result("❌ 查找通知时出错，请稍后重试")
 
+    @filter.command("CSU通知搜索", alias={"csu通知搜索", "Csu通知搜索"})
+    async def search(self, event: AstrMessageEvent):
+        """
+        按标题搜索本地存储的通知，格式：CSU通知搜索 关键词 [显示数量]
+        参数（从消息文本中解析，关键词可以包含空格）：
+        - 关键词，如 蓝桥杯、挑战杯 省赛
+        - 显示数量：末尾的正整数，默认10条
+        """
+        # 去掉指令本身，剩余部分为关键词；末尾是数字时作为显示数量
+        args = event.message_str.split()[1:]
+        list_len = 10
+        if len(args) > 1 and args[-1].lstrip("+-").isdigit():
+            list_len = int(args.pop())
+            if list_len <= 0:
+                yield event.plain_result("显示数量需为正整数，如：CSU通知搜索 蓝桥杯 20")
+                return
+        keyword = " ".join(args)
+        if not keyword:
+            yield event.plain_result("请提供关键词，如：CSU通知搜索 蓝桥杯")
+            return
+        try:
+            total, notices = await self.data_handler.search_notices_async(keyword, list_len)
+            if not notices:
+                yield event.plain_result(f"❌ 没有找到与“{keyword}”相关的通知")
+                return
+
+            images = await self.report_generator.generate_search_report(self.html_render, keyword, total, notices)
+            for image in images or []:
+                yield event.image_result(image)
+            notice_link = ""
+            for notice in notices:
+                notice_link += notice["时间"] + " " + notice["标题"] + ": " + notice["链接"] + "\n"
+            yield event.plain_result(f"共找到 {total} 条相关通知：\n{notice_link}")
+
+        except Exception as e:
+            logger.error(f"搜索通知时出错: {str(e)}")
+            yield event.plain_result("❌ 搜索通知时出错，请稍后重试")
+
     @filter.command("CSU通知更新", alias={"csu通知更新", "Csu通知更新"})
     async def update(self, event: AstrMessageEvent):
         """更新本地存储的通知"""
         try:
-            # 1. 从URL获取内容
-            html_content = await self.data_handler.fetch_url_content(self.config_manager.get_url())
-            if not html_content:
+            # 1. 获取、解析并保存通知（与进行中的定时推送合并，短时间内重复执行直接复用结果）
+            result = await self.notice_refresh.refresh(use_cache=True)
+            if not result.ok:
                 yield event.plain_result("❌ 无法获取URL内容，请检查链接是否有效")
                 return
 
-            # 2. 解析并保存通知
-            notices = self.data_handler.parse_notices(html_content)
-            new_notices = self.data_handler.save_notices(notices)
+            new_notices = result.new_notices
             if len(new_notices) > 0:
                 yield event.plain_result(f"✅ 已保存 {len(new_notices)} 条新通知到本地")    
 
-                # 3. 生成new_notices的报告图片
-                image_url = await self.report_generator.generate_new_image_report(self.html_render, new_notices)
+                # 2. 生成new_notices的报告图片
+                images = await self.notice_refresh.render_new(new_notices)
 
-                if image_url:
-                    yield event.image_result(image_url)
+                if images:
+                    for image in images:
+                        yield event.image_result(image)
                     # 合成通知链接
                     notice_link = ""
                     for notice in new_notices:
@@ -162,24 +228,21 @@ class MyPlugin(Star):
         """测试从本地文件读取比赛信息，默认读取3天内的比赛"""
         await self.contest_crawler.update()
         try:
-            contests = await self.contest_crawler.read()
+            contests = await self.contest_crawler.read_index()
             if contests:
                 yield event.plain_result(f"✅ 成功读取 {len(contests)} 条比赛信息")
                 test = ''
 
                 # 读取关键消息
                 curTime = time.time()
-                for contest in contests:
-                    if contest.stime < curTime + day * 24 * 60 * 60 + hour * 60 * 60 + minute * 60 + second:
-                        
-                        test += f"{contest.name}\n"
-                        test += f"比赛平台：{contest.oj}\n"
-                        test += f"时间范围：{Contest.timestamp_to_time(contest.stime)} ~ {Contest.timestamp_to_time(contest.etime)}\n"
-                        test += f"持续时间：{Contest.dtime_to_time(contest.dtime)}\n"
-                        test += f"链接直达：{contest.link}\n"
-                        test += "------------\n"
-
-
+                window = contests.starting_within(end=curTime + day * 24 * 60 * 60 + hour * 60 * 60 + minute * 60 + second)
+                for contest in window:
+                    test += f"{contest.name}\n"
+                    test += f"比赛平台：{contest.oj}\n"
+                    test += f"时间范围：{Contest.timestamp_to_time(contest.stime)} ~ {Contest.timestamp_to_time(contest.etime)}\n"
+                    test += f"持续时间：{Contest.dtime_to_time(contest.dtime)}\n"
+                    test += f"链接直达：{contest.link}\n"
+                    test += "------------\n"
 
                 yield event.plain_result(test)
             else:
@@ -191,4 +254,10 @@ class MyPlugin(Star):
     async def terminate(self):
         """可选择实现异步的插件销毁方法，当插件被卸载/停用时会调用。"""
         # 关闭自动调度器
-        await self.auto_scheduler.stop_scheduler()
\ No newline at end of file
+        await self.auto_scheduler.stop_scheduler()
+        # 关闭共享的HTTP客户端
+        await self.http_client.close()
+        # 停止事件循环延迟监控
+        self.loop_monitor.stop()
+        # 关闭本地通知存储
+        self.data_handler.close()
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+生成报告用的子集字体
+从完整的 Noto Sans SC 字体中只保留报告用到的字符，输出到 assets/fonts/NotoSansSC-<字重>.woff2，
+由 src/reports/fonts.py 内联进报告模板或以本地文件引用，渲染报告时不再访问 fonts.googleapis.com
+仓库不附带生成的字体文件；Noto Sans SC 使用 SIL Open Font License 1.1，分发子集时需一并附带 OFL.txt
+
+字符集：ASCII、常用中文标点、GB2312 一级汉字（3755 个常用字）、报告模板中的文字，
+以及 --csv（已存储的通知）/ --chars 指定的文字；子集之外的字符渲染时回退到系统字体
+
+依赖 fontTools（输出 woff2 还需要 brotli，未安装时输出 woff）：
+    pip install fonttools brotli
+在插件根目录执行：
+    python -m scripts.subset_fonts NotoSansSC-Regular.otf NotoSansSC-Bold.otf
+    python -m scripts.subset_fonts NotoSansSC-Regular.otf --csv data/csu_innovation_notices.csv
+"""
+
+import os
+import csv
+import argparse
+
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(ROOT, "assets", "fonts")
+TEMPLATE_SOURCES = (
+    os.path.join(ROOT, "src", "reports", "templates.py"),
+)
+PUNCTUATION = "，。、；：？！“”‘’（）《》〈〉【】「」『』—…·～￥％＋－＝／"
+
+
+def gb2312_level1() -> str:
+    """GB2312 一级汉字（区位 16-55 区）"""
+    chars = []
+    for high in range(0xB0, 0xD8):
+        for low in range(0xA1, 0xFF):
+            try:
+                chars.append(bytes((high, low)).decode("gb2312"))
+            except UnicodeDecodeError:
+                continue
+    return "".join(chars)
+
+
+def collect_text(csv_paths: list[str], extra: str) -> set[str]:
+    text = [
+        "".join(chr(code) for code in range(0x20, 0x7F)),
+        PUNCTUATION,
+        gb2312_level1(),
+        extra,
+    ]
+    for path in TEMPLATE_SOURCES:
+        with open(path, "r", encoding="utf-8") as f:
+            text.append(f.read())
+    for path in csv_paths:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            text.extend(row.get("标题", "") for row in csv.DictReader(f))
+    return {char for char in "".join(text) if char.isprintable()}
+
+
+def subset_font(source: str, chars: set[str], flavor: str) -> str:
+    """生成一个子集字体，返回输出路径"""
+    weight = TTFont(source, lazy=True)["OS/2"].usWeightClass
+    options = subset.Options()
+    options.flavor = flavor
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.hinting = False         # 截图渲染不需要 hinting，去掉可显著减小体积
+    options.desubroutinize = True   # CFF 去子程序化后 woff2 压缩率更高
+
+    font = subset.load_font(source, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=[ord(char) for char in chars])
+    subsetter.subset(font)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output = os.path.join(OUTPUT_DIR, f"NotoSansSC-{weight}.{flavor}")
+    subset.save_font(font, output, options)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成报告用的 Noto Sans SC 子集字体")
+    parser.add_argument("fonts", nargs="+", help="完整字体文件（每个字重一个，如 Regular/Bold）")
+    parser.add_argument("--csv", action="append", default=[], help="额外包含该通知CSV中标题的字符（可多次指定）")
+    parser.add_argument("--chars", default="", help="额外包含的字符")
+    args = parser.parse_args()
+
+    try:
+        import brotli  # noqa: F401
+        flavor = "woff2"
+    except ImportError:
+        print("未安装 brotli，输出 woff 格式")
+        flavor = "woff"
+
+    chars = collect_text(args.csv, args.chars)
+    print(f"字符集共 {len(chars)} 个字符")
+    for source in args.fonts:
+        output = subset_font(source, chars, flavor)
+        print(f"{source} → {output}（{os.path.getsize(output) / 1024:.0f} KB）")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from .group_config import GroupConfigManager
 
-all = [
+__all__ = [
     "GroupConfigManager"
 ]
\ No newline at end of file
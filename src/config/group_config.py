@@ -1,11 +1,13 @@
 """
 群组配置类
 用来管理每个群组的独立配置
-暂未实装
+推送任务（push_tasks）由 scheduler.GroupTaskExecutor 按各自的 cron 表达式执行，
+配置写入后通过变更回调通知执行器重新加载
 """
 
 # 标准库
 import os
+import asyncio
 import traceback
 
 # 三方库
@@ -16,6 +18,7 @@ from typing import Any
 # 本地模块
 from astrbot.api import logger
 from ..core import ConfigManager
+from ..scheduler.job_scheduler import CronTrigger
 
 
 
@@ -27,6 +30,8 @@ class GroupConfigManager:
         # self.config_manager = config_manager
         self.context = context
         self.storage_group_config = config_manager.get_storage_root() + "/group_config.json"
+        self._write_lock = asyncio.Lock()      # 读-改-写之间不能交错，否则后写的会覆盖先写的修改
+        self._change_listeners = []
         self._init_storage()
     
     ### 私有方法 ###
@@ -41,22 +46,43 @@ class GroupConfigManager:
 
 
     def _is_valid_cron(self, cron_expr: str) -> bool:
-        """验证cron表达式格式是否正确"""
-
-        # 正则匹配cron表达式格式
-        import re
-        cron_pattern = r"^(\d+|\*)\s+(\d+|\*)\s+(\d+|\*)\s+(\d+|\*)\s+(\d+|\*)\s+(\d+|\*)$"
-        return re.match(cron_pattern, cron_expr) is not None
-            
+        """验证cron表达式格式是否正确（5段：分 时 日 月 周，或6段：秒 分 时 日 月 周）"""
+        try:
+            CronTrigger(cron_expr)
+            return True
+        except ValueError:
+            return False
+
+    def _notify_change(self):
+        """配置写入后通知监听者"""
+        for listener in self._change_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"群组配置变更回调执行失败: {str(e)}")
 
     ### 对外方法 ###
+    def add_change_listener(self, listener):
+        """注册配置写入后的回调（无参数）"""
+        self._change_listeners.append(listener)
+
+    def load_all(self) -> dict:
+        """同步读取所有群组的配置 {会话ID: 配置}"""
+        try:
+            with open(self.storage_group_config, "r", encoding="utf-8") as f:
+                content = f.read()
+            return json.loads(content) if content else {}
+        except Exception as e:
+            logger.error(f"读取群组配置出错: {str(e)}")
+            return {}
+
     # 群组基础配置
     async def set_group_settings(self, group_id: str, setting_key: str, setting_value: Any):
         """设置群组的独立配置，修改某个群的某个配置项"""
         
         try:
             # 异步打开storage_group_config指向的文件
-            async with aiofiles.open(self.storage_group_config, "r+", encoding="utf-8") as f:
+            async with self._write_lock, aiofiles.open(self.storage_group_config, "r+", encoding="utf-8") as f:
                 # 读取文件内容
                 content = await f.read()
                 # 解析为 JSON 对象
@@ -69,6 +95,7 @@ class GroupConfigManager:
                 await f.seek(0)
                 await f.write(json.dumps(group_settings, ensure_ascii=False, indent=4))
                 await f.truncate()
+            self._notify_change()
         except Exception as e:
             logger.error(f"尝试将群组{group_id}的{setting_key}配置为{setting_value}出错: {str(e)}")
             logger.error(traceback.format_exc())
@@ -109,7 +136,7 @@ class GroupConfigManager:
             raise ValueError(f"无效的cron表达式: {cron_expr}")
 
         # 写入配置
-        async with aiofiles.open(self.storage_group_config, "r+", encoding="utf-8") as f:
+        async with self._write_lock, aiofiles.open(self.storage_group_config, "r+", encoding="utf-8") as f:
             # 读取文件内容
             content = await f.read()
             # 解析为 JSON 对象
@@ -117,9 +144,10 @@ class GroupConfigManager:
             # 更新群组配置
             if session_id not in group_settings:
                 group_settings[session_id] = {}
-            
+            push_tasks = group_settings[session_id].setdefault("push_tasks", [])
+
             # 在群组配置中添加/修改推送任务
-            for task in group_settings[session_id].get("push_tasks", []):
+            for task in push_tasks:
                 if task["script_path"] == script_path:
                     if cron_expr != "-1":
                         # 修改已存在任务
@@ -128,25 +156,23 @@ class GroupConfigManager:
                     task.update({
                         "enabled": enabled,
                     })
-                    logger.info(f"已修改脚本路径为 {script_path} 的推送任务，cron表达式为 {cron_expr}，状态为 {'开启' if enabled else '关闭'}")
+                    logger.info(f"已修改脚本路径为 {script_path} 的推送任务，cron表达式为 {task['cron_expr']}，状态为 {'开启' if enabled else '关闭'}")
+                    break
             else:
-                logger.info(f"未找到脚本路径为 {script_path} 的推送任务，添加新任务")
                 # 添加新任务
-                group_settings[session_id]["push_tasks"] = group_settings[session_id].get("push_tasks", []) + [
-                    {
-                        "script_path": script_path,
-                        "cron_expr": cron_expr if cron_expr != "-1" else "0 8 * * *",
-                        "enabled": enabled,
-                    }
-                ]
-
+                push_tasks.append({
+                    "script_path": script_path,
+                    "cron_expr": cron_expr if cron_expr != "-1" else "0 8 * * *",
+                    "enabled": enabled,
+                })
+                logger.info(f"已添加脚本路径为 {script_path} 的推送任务，cron表达式为 {push_tasks[-1]['cron_expr']}，状态为 {'开启' if enabled else '关闭'}")
 
             # 写入文件
-            logger.info(f"已添加脚本路径为 {script_path} 的推送任务，cron表达式为 {cron_expr}，状态为 {'开启' if enabled else '关闭'}")
             await f.seek(0)
             await f.write(json.dumps(group_settings, ensure_ascii=False, indent=4))
             await f.truncate()
-        
+        self._notify_change()
+
     async def remove_push_task(self, session_id: str, script_path: str) -> None:
         """
         为当前群聊移除推送任务
@@ -154,26 +180,27 @@ class GroupConfigManager:
         :param session_id: 会话ID（可选，默认使用事件的会话ID）
         """
         # 写入配置
-        async with aiofiles.open(self.storage_group_config, "r+", encoding="utf-8") as f:
+        async with self._write_lock, aiofiles.open(self.storage_group_config, "r+", encoding="utf-8") as f:
             # 读取文件内容
             content = await f.read()
             # 解析为 JSON 对象
             group_settings = json.loads(content) if content else {}
-            # 更新群组配置
-            if session_id not in group_settings:
-                group_settings[session_id] = {}
-            
+
             # 在群组配置中移除推送任务
-            for task in group_settings[session_id].get("push_tasks", []):
+            push_tasks = group_settings.get(session_id, {}).get("push_tasks", [])
+            for task in push_tasks:
                 if task["script_path"] == script_path:
                     # 移除任务
-                    group_settings[session_id]["push_tasks"].remove(task)
+                    push_tasks.remove(task)
                     break
             else:
                 # 未找到任务
                 logger.error(f"未找到脚本路径为 {script_path} 的推送任务")
                 return
 
-
-
-
+            # 写入文件
+            await f.seek(0)
+            await f.write(json.dumps(group_settings, ensure_ascii=False, indent=4))
+            await f.truncate()
+        logger.info(f"已移除脚本路径为 {script_path} 的推送任务")
+        self._notify_change()
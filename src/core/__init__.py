@@ -6,12 +6,23 @@ from .bot_manager import BotManager
 from .webui_config import ConfigManager
 from .data_handler import NoticeDataHandler
 from .command_handler import CommandHelper
+from .http_client import HttpClient
+from .notice_backfill import NoticeBackfiller
+from .loop_monitor import LoopLagMonitor
+from .single_flight import SingleFlight
+from .notice_refresh import NoticeRefreshCoordinator, NoticeRefreshResult
 
 
 
-all = [
+__all__ = [
     "BotManager",
     "NoticeDataHandler",
     "ConfigManager",
     "CommandHelper",
+    "HttpClient",
+    "NoticeBackfiller",
+    "LoopLagMonitor",
+    "SingleFlight",
+    "NoticeRefreshCoordinator",
+    "NoticeRefreshResult",
 ]
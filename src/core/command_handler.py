@@ -59,6 +59,8 @@ def command_error_handler(func):
             if event and isinstance(event, AstrMessageEvent):
                 yield event.plain_result("操作执行失败，请查看日志获取详细信息")
 
+    return wrapper
+
 class CommandHelper:
     def __init__(self, config_manager, context, group_config: GroupConfigManager):
         # self.config_manager = config_manager
@@ -92,9 +94,10 @@ class CommandHelper:
         if session_id == "":
             session_id = event.get_session_id()
 
-        # 如果为xx:xx这种格式，转化为x x * * *
+        # 如果为HH:MM这种格式，转化为 "M H * * *"（cron 第一段是分钟）
         if ":" in time:
-            cron_expr = f"{time.split(':')[0]} {time.split(':')[1]} * * *"   # 每天time时间推送
+            pushing_time = datetime.strptime(time.strip(), "%H:%M")
+            cron_expr = f"{pushing_time.minute} {pushing_time.hour} * * *"   # 每天time时间推送
         else:
             cron_expr = time
         await self.group_config.set_push_task(session_id, script_path, cron_expr)
@@ -5,72 +5,159 @@
 
 
 import os
-import csv
+import json
+import asyncio
+import hashlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 # import requests 这种非异步的方式，问题是会阻塞事件循环
-import aiohttp  # 异步HTTP客户端
 from astrbot.api import logger
-from bs4 import BeautifulSoup
-from datetime import datetime   
 from ..core import ConfigManager
+from .http_client import HttpClient
+from .html_parsers import get_html_parser
+from ..storage import create_notice_store, NoticeSearchIndex
 
 class NoticeDataHandler:
     """中南大学通知数据处理工具类"""
     
-    def __init__(self, config: ConfigManager):
-        self.storage_path = config.get_storage_root() + "csu_innovation_notices.csv"   # 本地存储文件路径
+    def __init__(self, config: ConfigManager, http_client: HttpClient):
+        self.http_client = http_client                                  # 共享的HTTP客户端
+        self.storage_root = config.get_storage_root()                   # 本地存储根目录
         self.base_url = config.get_base_url()                           # 用于补全相对链接的基础URL
+        self.html_parser = get_html_parser(config.get_html_parser())    # HTML解析后端
+        self.validators_path = config.get_storage_root() + "csu_innovation_notices_validators.json"  # 条件请求校验信息
         self._init_storage()                                            # 初始化存储目录
+        self.store = create_notice_store(config)                        # 通知存储后端（sqlite / csv）
+        self._validators = self._load_validators()                      # {url: {"etag", "last_modified", "content_hash"}}
+        self._pending_validators = {}                                   # 已获取但尚未处理完成的校验信息
+        self._validators_lock = asyncio.Lock()                          # 校验信息在工作线程中写入，写入之间不能交错
+        self.store_version = 0                                          # 每次新增通知后递增，用于缓存失效
+        self._change_listeners = []                                     # 新增通知时的回调
+        # 标题全文索引，随每次新增通知增量更新
+        self.search_index = NoticeSearchIndex(os.path.join(self.storage_root, "csu_innovation_notices_search.json"))
+        self._sync_search_index()
+        self.add_change_listener(self.search_index.add)
+        # 解析与存储读写在工作线程中执行，避免阻塞事件循环
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.get_worker_threads(), thread_name_prefix="csu-notice"
+        )
 
     def _init_storage(self):
         """初始化存储目录（如果不存在则创建）"""
-        dir_path = os.path.dirname(self.storage_path)
+        dir_path = self.storage_root
         if dir_path and not os.path.exists(dir_path):
             os.makedirs(dir_path, exist_ok=True)
             logger.info(f"创建存储目录: {dir_path}")
 
     async def fetch_url_content(self, target_url: str) -> str:
         """从目标URL获取页面内容"""
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(target_url, headers=headers, timeout=10) as response:
-                    response.raise_for_status()  # 触发HTTP错误
-                    # response.encoding = "UTF-8"
-                    logger.info(f"成功获取URL内容: {target_url}")
-                    return await response.text()
+            async with self.http_client.get(target_url) as response:
+                response.raise_for_status()  # 触发HTTP错误
+                # response.encoding = "UTF-8"
+                logger.info(f"成功获取URL内容: {target_url}")
+                return await response.text()
         except Exception as e:
             logger.error(f"获取URL内容失败: {str(e)}")
             return ""
 
+    async def fetch_url_content_if_changed(self, target_url: str) -> Optional[str]:
+        """
+        条件请求获取页面内容（ETag / Last-Modified，内容哈希兜底）
+        返回：
+        - None：页面与上次处理时相同（304 或内容哈希一致），无需解析
+        - ""：获取失败
+        - 其他：新的页面内容，处理完成后需调用 commit_validators_async 记录校验信息
+        """
+        # 本地没有数据时不使用缓存校验，保证能重新写入
+        cached = self._validators.get(target_url, {}) if await self.count_notices_async() > 0 else {}
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            async with self.http_client.get(target_url, headers=headers) as response:
+                if response.status == 304:
+                    logger.info(f"页面未修改（304），跳过解析: {target_url}")
+                    return None
+                response.raise_for_status()  # 触发HTTP错误
+                content = await response.text()
+                validators = {
+                    "etag": response.headers.get("ETag", ""),
+                    "last_modified": response.headers.get("Last-Modified", ""),
+                    "content_hash": hashlib.sha256(content.encode("UTF-8")).hexdigest(),
+                }
+        except Exception as e:
+            logger.error(f"获取URL内容失败: {str(e)}")
+            return ""
+
+        if cached and validators["content_hash"] == cached.get("content_hash"):
+            logger.info(f"页面内容哈希未变化，跳过解析: {target_url}")
+            # 内容未变，但服务器可能下发了新的ETag，直接记录
+            await self._store_validators(target_url, validators)
+            return None
+
+        logger.info(f"成功获取URL内容: {target_url}")
+        self._pending_validators[target_url] = validators
+        return content
+
+    async def commit_validators_async(self, target_url: str):
+        """页面内容处理（解析、保存）完成后，记录其校验信息，下次请求时使用"""
+        validators = self._pending_validators.pop(target_url, None)
+        if validators:
+            await self._store_validators(target_url, validators)
+
+    async def _store_validators(self, target_url: str, validators: dict):
+        """记录校验信息，有变化时才在工作线程中写入文件"""
+        if self._validators.get(target_url) == validators:
+            return
+        self._validators[target_url] = validators
+        async with self._validators_lock:
+            await self._run_in_worker(self._save_validators, dict(self._validators))
+
+    def _load_validators(self) -> dict:
+        """读取本地保存的条件请求校验信息"""
+        if not os.path.exists(self.validators_path):
+            return {}
+        try:
+            with open(self.validators_path, "r", encoding="UTF-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"读取条件请求校验信息失败: {str(e)}")
+            return {}
+
+    def _save_validators(self, validators: dict):
+        """保存条件请求校验信息（先写临时文件再替换）"""
+        tmp_path = self.validators_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="UTF-8") as f:
+                json.dump(validators, f, ensure_ascii=False)
+            os.replace(tmp_path, self.validators_path)
+        except Exception as e:
+            logger.error(f"保存条件请求校验信息失败: {str(e)}")
+
     def parse_notices(self, html_content: str) -> list:
         """解析HTML内容，提取通知数据（时间、标题、链接）"""
         if not html_content:
             logger.warning("HTML内容为空，无法解析")
             return []
 
-        soup = BeautifulSoup(html_content, "html.parser")
-        right_list = soup.find("ul", class_="right-list")
-        if not right_list:
+        items = self.html_parser.notice_items(html_content)
+        if items is None:
             logger.warning("未找到通知列表容器（ul.right-list）")
             return []
 
         notices = []
-        for item in right_list.find_all("li"):
-            a_tag = item.find("a")
-            span_tag = item.find("span")
-            if not (a_tag and span_tag):
-                continue  # 跳过不完整的条目
-
-            # 提取并处理数据
-            title = a_tag.get_text(strip=True)
-            link = a_tag.get("href", "")
+        for title, link, time in items:
             # 补全相对链接（如 ../xxx → https://bksy.csu.edu.cn/xxx）
             if str(link).startswith("../"):
                 link = str(link).replace("../", "")
                 link = f"{self.base_url}/{link}"
-            time = span_tag.get_text(strip=True).strip("[]")
+            time = time.strip("[]")
 
             notices.append({
                 "时间": time,
@@ -89,108 +176,107 @@ class NoticeDataHandler:
         if not new_notices:
             return []
 
-        # 获取已存在的链接（用于去重）
-        existing_links = self._get_existing_links()
-        # 筛选未存储过的通知
-        filtered_notices = [
-            notice for notice in new_notices
-            if notice["链接"] not in existing_links
-        ]
+        # 存储后端负责按链接去重
+        filtered_notices = self.store.add_notices(new_notices)
         if not filtered_notices:
             logger.info("没有新通知需要保存")
             return []
 
+        logger.info(f"已保存 {len(filtered_notices)} 条新通知")
+        self.store_version += 1
+        for listener in self._change_listeners:
+            try:
+                listener(filtered_notices)
+            except Exception as e:
+                logger.error(f"通知变更回调执行失败: {str(e)}")
+        return filtered_notices
 
+    def add_change_listener(self, listener):
+        """注册新增通知时的回调，参数为新增通知列表（可能在工作线程中调用）"""
+        self._change_listeners.append(listener)
 
-        # 追加写入CSV
-        with open(self.storage_path, "a", encoding="UTF-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["时间", "标题", "链接"])
-            # 如果文件为空，先写表头
-            if not os.path.exists(self.storage_path) or os.path.getsize(self.storage_path) == 0:
-                writer.writeheader()
-            # 写入新通知
-            writer.writerows(filtered_notices)
-
-        logger.info(f"已保存 {len(filtered_notices)} 条新通知到 {self.storage_path}")
-
-        # 对Csv文件进行排序
-        self.sort_notices_by_time()
-        
-        return filtered_notices
+    def _sync_search_index(self):
+        """搜索索引与存储的通知数量不一致时（首次启用、文件丢失等）补齐或重建"""
+        count = self.store.count()
+        if len(self.search_index) == count:
+            return
+        notices = self.store.read_page(count, 1) if count else []
+        if len(self.search_index) > count:
+            self.search_index.rebuild(notices)
+        else:
+            added = self.search_index.add(notices)
+            logger.info(f"通知搜索索引已补齐 {added} 条")
 
     def _get_existing_links(self) -> set:
         """获取本地已存储的所有通知链接（用于去重）"""
-        if not os.path.exists(self.storage_path) or os.path.getsize(self.storage_path) == 0:
-            return set()
+        return self.store.existing_links()
 
-        try:
-            with open(self.storage_path, "r", encoding="UTF-8") as f:
-                reader = csv.DictReader(f)
-                return {row["链接"] for row in reader}
-        except Exception as e:
-            logger.error(f"读取已存储链接失败: {str(e)}")
-            return set()
-
-    # 重构本地的csv文件， 按时间排序
     def sort_notices_by_time(self):
-        """根据时间字段对本地CSV文件进行排序"""
-        if not os.path.exists(self.storage_path) or os.path.getsize(self.storage_path) == 0:
-            logger.info("本地存储文件为空或不存在，无需排序")
-            return
-        
-        try:
-            # 读取所有行
-            with open(self.storage_path, "r", encoding="UTF-8") as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            
-            # 按时间字段排序，新的在前面
-            rows.sort(key=lambda x: datetime.strptime(x["时间"], "%Y-%m-%d"), reverse=True)
-            
-            # 写回文件
-            with open(self.storage_path, "w", encoding="UTF-8", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=["时间", "标题", "链接"])
-                writer.writeheader()
-                writer.writerows(rows)
-            
-
-            logger.info(f"已按时间排序 {len(rows)} 条通知")
-        except Exception as e:
-            logger.error(f"排序本地通知失败: {str(e)}")
+        """按时间字段对本地存储进行排序（CSV后端需要，SQLite后端由索引保证顺序）"""
+        self.store.sort()
 
     # 对外接口
+    def count_notices(self) -> int:
+        """获取本地存储的通知数量"""
+        return self.store.count()
+
+    def latest_notice_date(self) -> Optional[str]:
+        """获取本地存储中最新一条通知的日期"""
+        return self.store.latest_date()
+
     def read_top_n(self, n: int) -> list:
         """读取本地存储的前N条通知"""
-        if not os.path.exists(self.storage_path) or os.path.getsize(self.storage_path) == 0:
-            logger.info("本地存储文件为空或不存在")
-            return []
-
-        try:
-            with open(self.storage_path, "r", encoding="UTF-8") as f:
-                reader = csv.DictReader(f)
-                # 取前N条并转为列表
-                top_notices = list(reader)[:n]
-                logger.info(f"成功读取前 {len(top_notices)} 条通知")
-                return top_notices
-        except Exception as e:
-            logger.error(f"读取本地通知失败: {str(e)}")
-            return []
+        top_notices = self.store.read_page(n, 1)
+        logger.info(f"成功读取前 {len(top_notices)} 条通知")
+        return top_notices
     
+    def search_notices(self, keyword: str, n: int) -> tuple[int, list[dict]]:
+        """按标题搜索通知，返回 (匹配总数, 相关度最高的前n条)"""
+        total, notices = self.search_index.search(keyword, n)
+        logger.info(f"搜索“{keyword}”共匹配 {total} 条通知")
+        return total, notices
+
     def read_notices(self, n: int, page: int) -> list:
         """读取本地存储的第page页前n条通知"""
-        if not os.path.exists(self.storage_path) or os.path.getsize(self.storage_path) == 0:
-            logger.info("本地存储文件为空或不存在")
-            return []
+        notices = self.store.read_page(n, page)
+        logger.info(f"成功读取第{page}页前 {len(notices)} 条通知")
+        return notices
 
-        try:
-            with open(self.storage_path, "r", encoding="UTF-8") as f:
-                reader = csv.DictReader(f)
-                # 计算跳过的条数
-                skip = (page - 1) * n
-                # 取第page页前n条并转为列表
-                notices = list(reader)[skip:skip+n]
-                logger.info(f"成功读取第{page}页前 {len(notices)} 条通知")
-                return notices
-        except Exception as e:
-            logger.error(f"读取本地通知失败: {str(e)}")
-            return []
+    # 异步接口：在工作线程中执行解析与存储读写，事件循环不被阻塞
+    async def _run_in_worker(self, func, *args):
+        """在工作线程池中执行阻塞函数"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def parse_notices_async(self, html_content: str) -> list:
+        """异步解析HTML内容，见 parse_notices"""
+        return await self._run_in_worker(self.parse_notices, html_content)
+
+    async def save_notices_async(self, new_notices: list) -> list[dict]:
+        """异步写入通知到本地，见 save_notices"""
+        return await self._run_in_worker(self.save_notices, new_notices)
+
+    async def count_notices_async(self) -> int:
+        """异步获取本地存储的通知数量"""
+        return await self._run_in_worker(self.count_notices)
+
+    async def latest_notice_date_async(self) -> Optional[str]:
+        """异步获取本地存储中最新一条通知的日期"""
+        return await self._run_in_worker(self.latest_notice_date)
+
+    async def read_top_n_async(self, n: int) -> list:
+        """异步读取本地存储的前N条通知"""
+        return await self._run_in_worker(self.read_top_n, n)
+
+    async def read_notices_async(self, n: int, page: int) -> list:
+        """异步读取本地存储的第page页前n条通知"""
+        return await self._run_in_worker(self.read_notices, n, page)
+
+    async def search_notices_async(self, keyword: str, n: int) -> tuple[int, list[dict]]:
+        """异步按标题搜索通知，见 search_notices"""
+        return await self._run_in_worker(self.search_notices, keyword, n)
+
+    def close(self):
+        """关闭工作线程池与本地存储"""
+        self._executor.shutdown(wait=True)
+        self.store.close()
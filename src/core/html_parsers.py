@@ -0,0 +1,299 @@
+"""
+HTML解析后端模块
+通知列表页、AtCoder、NowCoder 页面只需要从中取出一小块内容，
+因此解析后端只提供几个定向提取的方法，返回纯数据，由调用方构造通知/比赛
+
+可选后端（按速度从快到慢）：
+- selectolax：基于 lexbor 的C实现
+- lxml：基于 libxml2 的C实现
+- html.parser：BeautifulSoup + 标准库，纯Python实现，始终可用
+"""
+
+import re
+from typing import Optional
+
+from astrbot.api import logger
+
+
+# AtCoder 表格行：(开始时间文本, 比赛链接, 比赛名称, 时长文本)，缺失的单元格为 None
+AtcoderRow = tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+# 各标签的开/闭标签匹配模式，截取片段时用于配平嵌套的同名标签
+_TAG_PATTERNS: dict[str, re.Pattern] = {}
+
+
+def _slice_fragment(html_content: str, marker: str, tag: str) -> str:
+    """
+    定向截取包含 marker 的片段，只解析这一小段而不是整个页面
+    从 marker 之前最近的 <tag 开始，按开闭标签配平，截取到与之对应的 </tag> 为止（内部嵌套的同名标签不会提前结束片段）
+    找不到 marker 时返回原文，找不到对应的闭合标签时截取到末尾
+    """
+    pos = html_content.find(marker)
+    if pos == -1:
+        return html_content
+    start = html_content.rfind(f"<{tag}", 0, pos)
+    if start == -1:
+        return html_content
+
+    pattern = _TAG_PATTERNS.get(tag)
+    if pattern is None:
+        pattern = _TAG_PATTERNS[tag] = re.compile(rf"<(/?){tag}\b", re.IGNORECASE)
+    depth = 0
+    for match in pattern.finditer(html_content, start):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            end = html_content.find(">", match.end())
+            return html_content[start:] if end == -1 else html_content[start:end + 1]
+    return html_content[start:]
+
+
+class HtmlParserBackend:
+    """解析后端基类"""
+
+    name = ""
+
+    def notice_items(self, html_content: str) -> Optional[list[tuple[str, str, str]]]:
+        """
+        提取通知列表（ul.right-list 下的 li）
+        返回 [(标题, 链接, 日期文本)]，找不到列表容器时返回 None
+        """
+        raise NotImplementedError
+
+    def atcoder_rows(self, html_content: str) -> Optional[list[AtcoderRow]]:
+        """
+        提取 AtCoder 即将开始的比赛表格（#contest-table-upcoming，跳过表头行）
+        找不到表格时返回 None
+        """
+        raise NotImplementedError
+
+    def nowcoder_items(self, html_content: str) -> Optional[list[str]]:
+        """
+        提取 NowCoder 比赛项的 data-json 属性（div.platform-mod.js-current 下的 div.platform-item.js-item）
+        找不到比赛容器时返回 None
+        """
+        raise NotImplementedError
+
+
+class BeautifulSoupBackend(HtmlParserBackend):
+    """BeautifulSoup + html.parser（纯Python实现）"""
+
+    name = "html.parser"
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup = lambda html_content: BeautifulSoup(html_content, "html.parser")
+
+    def notice_items(self, html_content):
+        right_list = self._soup(html_content).find("ul", class_="right-list")
+        if not right_list:
+            return None
+
+        items = []
+        for item in right_list.find_all("li"):
+            a_tag = item.find("a")
+            span_tag = item.find("span")
+            if not (a_tag and span_tag):
+                continue  # 跳过不完整的条目
+            items.append((a_tag.get_text(strip=True), str(a_tag.get("href", "")), span_tag.get_text(strip=True)))
+        return items
+
+    def atcoder_rows(self, html_content):
+        contest_table = self._soup(html_content).find("div", id="contest-table-upcoming")
+        if not contest_table:
+            return None
+
+        rows = []
+        for row in contest_table.find_all("tr")[1:]:    # 跳过表头行
+            cells = row.find_all("td")
+            time_tag = cells[0].find("time") if len(cells) > 0 else None
+            a_tag = cells[1].find("a") if len(cells) > 1 else None
+            rows.append((
+                time_tag.text if time_tag else None,
+                a_tag.get("href", "") if a_tag else None,
+                a_tag.text.strip() if a_tag else None,
+                cells[2].text.strip() if len(cells) > 2 else None,
+            ))
+        return rows
+
+    def nowcoder_items(self, html_content):
+        contest_container = self._soup(html_content).select_one("div.platform-mod.js-current")
+        if not contest_container:
+            return None
+        return [
+            str(item.get("data-json"))
+            for item in contest_container.select("div.platform-item.js-item")
+            if item.get("data-json")
+        ]
+
+
+class LxmlBackend(HtmlParserBackend):
+    """lxml（libxml2）"""
+
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        self._parse = lxml.html.document_fromstring
+
+    def _find(self, html_content: str, fragment: str, xpath: str):
+        """先在截取的片段中查找，找不到时再解析整个页面"""
+        for content in (fragment, html_content) if fragment is not html_content else (html_content,):
+            found = self._parse(content).xpath(xpath)
+            if found:
+                return found[0]
+        return None
+
+    @staticmethod
+    def _class_xpath(tag: str, *classes: str) -> str:
+        conditions = " and ".join(
+            f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in classes
+        )
+        return f".//{tag}[{conditions}]"
+
+    @staticmethod
+    def _text(element, strip: bool = True) -> str:
+        if strip:
+            return "".join(text.strip() for text in element.itertext())
+        return "".join(element.itertext())
+
+    def notice_items(self, html_content):
+        fragment = _slice_fragment(html_content, "right-list", "ul")
+        right_list = self._find(html_content, fragment, self._class_xpath("ul", "right-list"))
+        if right_list is None:
+            return None
+
+        items = []
+        for item in right_list.iter("li"):
+            a_tag = next(item.iter("a"), None)
+            span_tag = next(item.iter("span"), None)
+            if a_tag is None or span_tag is None:
+                continue  # 跳过不完整的条目
+            items.append((self._text(a_tag), a_tag.get("href", ""), self._text(span_tag)))
+        return items
+
+    def atcoder_rows(self, html_content):
+        fragment = _slice_fragment(html_content, "contest-table-upcoming", "div")
+        contest_table = self._find(html_content, fragment, ".//div[@id='contest-table-upcoming']")
+        if contest_table is None:
+            return None
+
+        rows = []
+        for row in list(contest_table.iter("tr"))[1:]:  # 跳过表头行
+            cells = list(row.iter("td"))
+            time_tag = next(cells[0].iter("time"), None) if len(cells) > 0 else None
+            a_tag = next(cells[1].iter("a"), None) if len(cells) > 1 else None
+            rows.append((
+                self._text(time_tag, strip=False) if time_tag is not None else None,
+                a_tag.get("href", "") if a_tag is not None else None,
+                self._text(a_tag, strip=False).strip() if a_tag is not None else None,
+                self._text(cells[2], strip=False).strip() if len(cells) > 2 else None,
+            ))
+        return rows
+
+    def nowcoder_items(self, html_content):
+        fragment = _slice_fragment(html_content, "platform-mod js-current", "div")
+        contest_container = self._find(html_content, fragment, self._class_xpath("div", "platform-mod", "js-current"))
+        if contest_container is None:
+            return None
+        return [
+            item.get("data-json")
+            for item in contest_container.xpath(self._class_xpath("div", "platform-item", "js-item"))
+            if item.get("data-json")
+        ]
+
+
+class SelectolaxBackend(HtmlParserBackend):
+    """selectolax（lexbor）"""
+
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parse = LexborHTMLParser
+
+    def _find(self, html_content: str, fragment: str, selector: str):
+        """先在截取的片段中查找，找不到时再解析整个页面"""
+        for content in (fragment, html_content) if fragment is not html_content else (html_content,):
+            found = self._parse(content).css_first(selector)
+            if found is not None:
+                return found
+        return None
+
+    def notice_items(self, html_content):
+        fragment = _slice_fragment(html_content, "right-list", "ul")
+        right_list = self._find(html_content, fragment, "ul.right-list")
+        if right_list is None:
+            return None
+
+        items = []
+        for item in right_list.css("li"):
+            a_tag = item.css_first("a")
+            span_tag = item.css_first("span")
+            if a_tag is None or span_tag is None:
+                continue  # 跳过不完整的条目
+            items.append((a_tag.text(strip=True), a_tag.attributes.get("href") or "", span_tag.text(strip=True)))
+        return items
+
+    def atcoder_rows(self, html_content):
+        fragment = _slice_fragment(html_content, "contest-table-upcoming", "div")
+        contest_table = self._find(html_content, fragment, "div#contest-table-upcoming")
+        if contest_table is None:
+            return None
+
+        rows = []
+        for row in contest_table.css("tr")[1:]:        # 跳过表头行
+            cells = row.css("td")
+            time_tag = cells[0].css_first("time") if len(cells) > 0 else None
+            a_tag = cells[1].css_first("a") if len(cells) > 1 else None
+            rows.append((
+                time_tag.text() if time_tag is not None else None,
+                (a_tag.attributes.get("href") or "") if a_tag is not None else None,
+                a_tag.text().strip() if a_tag is not None else None,
+                cells[2].text().strip() if len(cells) > 2 else None,
+            ))
+        return rows
+
+    def nowcoder_items(self, html_content):
+        fragment = _slice_fragment(html_content, "platform-mod js-current", "div")
+        contest_container = self._find(html_content, fragment, "div.platform-mod.js-current")
+        if contest_container is None:
+            return None
+        return [
+            item.attributes["data-json"]
+            for item in contest_container.css("div.platform-item.js-item")
+            if item.attributes.get("data-json")
+        ]
+
+
+# 后端优先级（auto 模式下依次尝试）
+_BACKENDS = {
+    SelectolaxBackend.name: SelectolaxBackend,
+    LxmlBackend.name: LxmlBackend,
+    BeautifulSoupBackend.name: BeautifulSoupBackend,
+}
+
+
+def get_html_parser(name: str = "auto") -> HtmlParserBackend:
+    """
+    获取解析后端
+    name 为 auto 时按 selectolax → lxml → html.parser 顺序选择第一个可用的后端；
+    指定的后端未安装时自动回退
+    """
+    candidates = list(_BACKENDS) if name == "auto" else [name] + [n for n in _BACKENDS if n != name]
+    if name != "auto" and name not in _BACKENDS:
+        logger.error(f"未知的HTML解析后端：{name}, 已切换为自动选择")
+
+    for candidate in candidates:
+        backend_cls = _BACKENDS.get(candidate)
+        if backend_cls is None:
+            continue
+        try:
+            backend = backend_cls()
+        except ImportError:
+            if candidate == name:
+                logger.warning(f"HTML解析后端 {name} 未安装，自动回退")
+            continue
+        logger.info(f"使用HTML解析后端: {backend.name}")
+        return backend
+    raise ImportError("没有可用的HTML解析后端（至少需要安装 beautifulsoup4）")
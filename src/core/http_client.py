@@ -0,0 +1,66 @@
+"""
+HTTP客户端模块
+插件内所有网络请求共用一个长连接的 aiohttp 会话
+统一管理连接池、keep-alive、DNS缓存、超时与User-Agent
+"""
+
+from typing import Optional
+
+import aiohttp
+from astrbot.api import logger
+
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class HttpClient:
+    """共享的HTTP客户端，生命周期与插件一致（initialize 启动，terminate 关闭）"""
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """创建带连接池的会话"""
+        connector = aiohttp.TCPConnector(
+            limit=self.config_manager.get_http_pool_size(),                 # 总连接数上限
+            limit_per_host=self.config_manager.get_http_pool_size_per_host(),  # 单个站点连接数上限
+            ttl_dns_cache=self.config_manager.get_dns_cache_ttl(),          # DNS缓存时间（秒）
+            keepalive_timeout=self.config_manager.get_keepalive_timeout(),  # 空闲连接保活时间（秒）
+        )
+        timeout = aiohttp.ClientTimeout(total=self.config_manager.get_timeout())
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"User-Agent": DEFAULT_USER_AGENT},
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """获取会话，未启动或已关闭时自动重建"""
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    async def start(self):
+        """启动客户端（预先创建会话）"""
+        _ = self.session
+        logger.info("HTTP客户端已启动")
+
+    async def close(self):
+        """关闭客户端，释放连接池"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP客户端已关闭")
+        self._session = None
+
+    def get(self, url: str, **kwargs):
+        """发送GET请求，用法：async with client.get(url) as resp"""
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        """发送POST请求，用法：async with client.post(url, data=...) as resp"""
+        return self.session.post(url, **kwargs)
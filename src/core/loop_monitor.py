@@ -0,0 +1,55 @@
+"""
+事件循环延迟监控模块
+周期性地休眠固定时间，实际唤醒时间与预期之差即为事件循环被阻塞的时长
+"""
+
+import asyncio
+from collections import deque
+from typing import Optional
+
+from astrbot.api import logger
+
+
+class LoopLagMonitor:
+    """事件循环延迟监控器"""
+
+    def __init__(self, interval: float = 0.5, warn_threshold: float = 0.2, window: int = 120):
+        self.interval = interval                    # 采样间隔（秒）
+        self.warn_threshold = warn_threshold        # 超过该延迟（秒）时输出警告
+        self._samples = deque(maxlen=window)        # 最近的采样（默认约1分钟）
+        self._max_lag = 0.0
+        self._total_samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _monitor_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self._samples.append(lag)
+            self._total_samples += 1
+            self._max_lag = max(self._max_lag, lag)
+            if lag > self.warn_threshold:
+                logger.warning(f"事件循环被阻塞 {lag * 1000:.0f} 毫秒")
+
+    def start(self):
+        """开始监控"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._monitor_loop())
+
+    def stop(self):
+        """停止监控"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def get_stats(self) -> dict:
+        """获取延迟统计（单位毫秒）"""
+        samples = list(self._samples)
+        return {
+            "samples": self._total_samples,
+            "recent_avg_ms": round(sum(samples) / len(samples) * 1000, 2) if samples else 0.0,
+            "recent_max_ms": round(max(samples) * 1000, 2) if samples else 0.0,
+            "max_ms": round(self._max_lag * 1000, 2),
+        }
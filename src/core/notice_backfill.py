@@ -0,0 +1,141 @@
+"""
+通知回填模块
+首次部署时把分页归档（如 https://bksy.csu.edu.cn/tztg/cxycyjybgs/xx.htm）中的历史通知全部爬取下来
+有限并发爬取、自动识别总页数、最后一次性批量写入，中途重启可以断点续爬
+进度按页追加写入进度文件，爬取失败的页下次启动时重试，取到但没有通知的页视为完成
+"""
+
+import os
+import re
+import json
+import asyncio
+import posixpath
+from urllib.parse import urlparse, urljoin
+
+from astrbot.api import logger
+
+
+class NoticeBackfiller:
+    """分页归档回填器"""
+
+    DEFAULT_PAGE_COUNT = 18     # 无法识别分页时使用的默认页数
+
+    def __init__(self, config_manager, data_handler):
+        self.data_handler = data_handler
+        self.list_url = config_manager.get_url()
+        self.concurrency = config_manager.get_backfill_concurrency()
+        self.state_path = os.path.join(config_manager.get_storage_root(), "notice_backfill_state.jsonl")
+        self._state_lock = asyncio.Lock()       # 进度记录逐行追加，并发的页不能交错写入
+
+        # 分页地址：https://bksy.csu.edu.cn/tztg/cxycyjybgs.htm → https://bksy.csu.edu.cn/tztg/cxycyjybgs/{page}.htm
+        self._list_name = posixpath.splitext(posixpath.basename(urlparse(self.list_url).path))[0]
+        self._page_pattern = re.compile(rf'href="[^"]*?{re.escape(self._list_name)}/(\d+)\.htm"')
+
+    ### 私有方法 ###
+    def _page_url(self, page: int) -> str:
+        """获取第page个归档页的地址"""
+        return urljoin(self.list_url, f"{self._list_name}/{page}.htm")
+
+    def _discover_page_count(self, html_content: str) -> int:
+        """从首页的分页栏中识别归档页数（分页链接中最大的页码）"""
+        pages = [int(page) for page in self._page_pattern.findall(html_content)]
+        if not pages:
+            logger.warning(f"未能从分页栏识别归档页数，使用默认值 {self.DEFAULT_PAGE_COUNT}")
+            return self.DEFAULT_PAGE_COUNT
+        return max(pages)
+
+    def _load_state(self) -> dict:
+        """
+        读取断点续爬的进度
+        进度文件每行一条记录：首行为 {"page_count": 页数}，之后每行为 {"page": 页码, "notices": [...]}
+        """
+        state = {"pages": {}}
+        if not os.path.exists(self.state_path):
+            return state
+        try:
+            with open(self.state_path, "r", encoding="UTF-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 写入中途退出留下的不完整行，对应页重新爬取
+                        continue
+                    if "page_count" in record:
+                        state["page_count"] = record["page_count"]
+                    else:
+                        state["pages"][str(record["page"])] = record["notices"]
+        except Exception as e:
+            logger.error(f"读取回填进度失败，重新开始: {str(e)}")
+            return {"pages": {}}
+        return state
+
+    def _write_state(self, records: list[dict], mode: str = "a"):
+        """写入进度记录（默认追加，每页只追加一行）"""
+        with open(self.state_path, mode, encoding="UTF-8") as f:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+
+    async def _append_state(self, *records: dict):
+        """在线程中追加进度记录，追加按顺序进行，避免并发写入交错"""
+        async with self._state_lock:
+            await asyncio.to_thread(self._write_state, list(records))
+
+    async def _crawl_page(self, page: int, state: dict, semaphore: asyncio.Semaphore):
+        """爬取并解析单个归档页，成功后记录进度"""
+        async with semaphore:
+            html_content = await self.data_handler.fetch_url_content(self._page_url(page))
+        if not html_content:
+            logger.warning(f"归档页 {page} 爬取失败，下次启动时重试")
+            return
+        # 页面取到但没有通知也算完成，不再重试
+        notices = await self.data_handler.parse_notices_async(html_content)
+        state["pages"][str(page)] = notices
+        await self._append_state({"page": page, "notices": notices})
+
+    ### 对外接口 ###
+    def has_pending(self) -> bool:
+        """是否存在未完成的回填任务"""
+        return os.path.exists(self.state_path)
+
+    async def run(self) -> int:
+        """
+        执行回填
+        返回新增的通知数量
+        """
+        state = await asyncio.to_thread(self._load_state)
+        if not state.get("page_count"):
+            # 首页同时用于识别页数
+            html_content = await self.data_handler.fetch_url_content(self.list_url)
+            if not html_content:
+                logger.error("获取通知首页失败，无法回填")
+                return 0
+            state = {
+                "page_count": self._discover_page_count(html_content),
+                "pages": {"0": await self.data_handler.parse_notices_async(html_content)},
+            }
+            await asyncio.to_thread(
+                self._write_state,
+                [{"page_count": state["page_count"]}, {"page": 0, "notices": state["pages"]["0"]}],
+                "w",
+            )
+        else:
+            logger.info(f"发现未完成的回填任务，已完成 {len(state['pages'])} 页，继续爬取")
+
+        page_count = state["page_count"]
+        pending = [page for page in range(1, page_count + 1) if str(page) not in state["pages"]]
+        logger.info(f"开始回填通知，共 {page_count} 个归档页，待爬取 {len(pending)} 页，并发数 {self.concurrency}")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._crawl_page(page, state, semaphore) for page in pending))
+
+        # 一次性批量写入（按页码顺序合并）
+        notices = []
+        for page in sorted(state["pages"], key=int):
+            notices += state["pages"][page]
+        new_notices = await self.data_handler.save_notices_async(notices)
+
+        if len(state["pages"]) == page_count + 1:
+            os.remove(self.state_path)
+            logger.info(f"回填完成，写入了{len(new_notices)}条新通知")
+        else:
+            logger.warning(f"回填部分完成，写入了{len(new_notices)}条新通知，剩余页将在下次启动时继续")
+        return len(new_notices)
@@ -0,0 +1,110 @@
+"""
+通知刷新协调模块
+“获取 → 解析 → 保存”与新增通知报告的渲染都经过这里：
+- 同一URL的刷新同时只执行一次，手动更新命令与定时推送并发时共享同一次结果，
+  不会重复请求网站，也不会并发写入本地存储
+- 同一批新增通知的报告只渲染一次
+- 完成的结果短暂缓存，短时间内重复执行的命令直接复用
+- 刷新得到新增通知时通知监听者（如群组推送队列）；回填等其他途径写入的通知不经过这里
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from astrbot.api import logger
+from .single_flight import SingleFlight
+
+
+class NoticeRefreshResult:
+    """一次刷新的结果"""
+
+    UPDATED = "updated"         # 有新增通知
+    UNCHANGED = "unchanged"     # 页面未变化或没有新增通知
+    FAILED = "failed"           # 获取或解析失败
+
+    def __init__(self, status: str, new_notices: Optional[list[dict]] = None):
+        self.status = status
+        self.new_notices = new_notices or []
+        self.finished_at = datetime.now()
+
+    @property
+    def ok(self) -> bool:
+        return self.status != self.FAILED
+
+
+class NoticeRefreshCoordinator:
+    """通知刷新协调器"""
+
+    def __init__(self, config_manager, data_handler, report_generator, html_render_func):
+        self.config_manager = config_manager
+        self.data_handler = data_handler
+        self.report_generator = report_generator
+        self.html_render_func = html_render_func
+        ttl = config_manager.get_notice_refresh_cache_ttl()
+        self._refresh_flight = SingleFlight(ttl=ttl)
+        self._render_flight = SingleFlight(ttl=ttl)
+        self._update_listeners = []     # 刷新得到新增通知时的回调
+
+    async def refresh(self, url: str = "", use_cache: bool = False) -> NoticeRefreshResult:
+        """
+        刷新通知（条件请求，页面未变化时不解析）
+        use_cache 为 True 时可直接返回短时间内完成的上一次结果，适合手动命令；
+        定时任务应传 False，但仍会与进行中的刷新合并
+        """
+        url = url or self.config_manager.get_url()
+        result = await self._refresh_flight.do(url, self._run_refresh, url, use_cache=use_cache)
+        if not result.ok:
+            # 失败的结果不缓存，下次调用重新请求
+            self._refresh_flight.forget(url)
+        return result
+
+    async def _run_refresh(self, url: str) -> NoticeRefreshResult:
+        # 1.从url获取内容（条件请求，页面未变化时直接跳过后续解析、保存、渲染）
+        html_content = await self.data_handler.fetch_url_content_if_changed(url)
+        if html_content is None:
+            logger.info("通知页面未变化")
+            return NoticeRefreshResult(NoticeRefreshResult.UNCHANGED)
+        if not html_content:
+            logger.error("获取HTML内容失败")
+            return NoticeRefreshResult(NoticeRefreshResult.FAILED)
+
+        # 2.解析，写入本地
+        notices = await self.data_handler.parse_notices_async(html_content)
+        if not notices:
+            logger.error("解析通知失败")
+            return NoticeRefreshResult(NoticeRefreshResult.FAILED)
+        new_notices = await self.data_handler.save_notices_async(notices)
+        await self.data_handler.commit_validators_async(url)
+        if not new_notices:
+            logger.info("没有新的通知")
+            return NoticeRefreshResult(NoticeRefreshResult.UNCHANGED)
+        await self._notify_update(new_notices)
+        return NoticeRefreshResult(NoticeRefreshResult.UPDATED, new_notices)
+
+    async def _notify_update(self, new_notices: list[dict]):
+        """在工作线程中依次执行新增通知的回调（回调可能写文件）"""
+        for listener in self._update_listeners:
+            try:
+                await asyncio.to_thread(listener, new_notices)
+            except Exception as e:
+                logger.error(f"新增通知回调执行失败: {str(e)}")
+
+    def add_update_listener(self, listener):
+        """注册刷新得到新增通知时的回调，参数为新增通知列表（在工作线程中调用）"""
+        self._update_listeners.append(listener)
+
+    async def render_new(self, new_notices: list[dict]) -> Optional[list[str]]:
+        """生成新增通知的报告图片（可能有多张），同一批通知只渲染一次；失败时返回 None（不缓存）"""
+        key = tuple(notice["链接"] for notice in new_notices)
+        images = await self._render_flight.do(key, self._run_render, new_notices)
+        if not images:
+            self._render_flight.forget(key)
+        return images
+
+    async def _run_render(self, new_notices: list[dict]) -> Optional[list[str]]:
+        return await self.report_generator.generate_new_image_report(self.html_render_func, new_notices)
+
+    def stats(self) -> dict:
+        """刷新与渲染的执行/合并/缓存次数"""
+        return {"refresh": self._refresh_flight.stats(), "render": self._render_flight.stats()}
@@ -0,0 +1,70 @@
+"""
+单飞（single-flight）去重模块
+同一个键同时只执行一次：执行期间到来的调用方直接等待同一个结果，
+执行完成后结果可短暂缓存，吸收短时间内的重复请求
+"""
+
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """按键合并并发调用"""
+
+    def __init__(self, ttl: float = 0):
+        self.ttl = ttl                                          # 结果缓存时间（秒），0 表示不缓存
+        self._tasks: dict[Hashable, asyncio.Task] = {}          # 正在执行的调用
+        self._results: dict[Hashable, tuple[float, Any]] = {}   # 键 → (完成时间, 结果)
+        self.executed = 0       # 实际执行次数
+        self.shared = 0         # 复用进行中调用的次数
+        self.cached = 0         # 命中结果缓存的次数
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable], *args, use_cache: bool = True) -> Any:
+        """
+        执行 func(*args)，同一键已有调用在执行时等待其结果
+        use_cache 为 False 时跳过结果缓存（但仍会复用进行中的调用）
+        执行放在独立的任务中，某个调用方被取消不会影响其他等待者
+        """
+        if use_cache and self.ttl > 0:
+            entry = self._results.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+                self.cached += 1
+                return entry[1]
+
+        task = self._tasks.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(func(*args))
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self.ttl > 0:
+            self._results[key] = (time.monotonic(), task.result())
+            self._expire()
+
+    def _expire(self):
+        now = time.monotonic()
+        for key in [key for key, (finished, _) in self._results.items() if now - finished > self.ttl]:
+            del self._results[key]
+
+    def forget(self, key: Hashable = None):
+        """丢弃缓存的结果（key 为 None 时全部丢弃）"""
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key, None)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def stats(self) -> dict:
+        return {"executed": self.executed, "shared": self.shared, "cached": self.cached}
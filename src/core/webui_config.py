@@ -31,6 +31,10 @@ class ConfigManager:
         """获取本地存储根目录"""
         return self.config.get("storage_root", "./data/plugins_data/CSU-Crawl-Contest-Notification/data/")
     
+    def get_storage_backend(self) -> str:
+        """获取通知存储后端（sqlite / csv）"""
+        return self.config.get("storage_backend", "sqlite")
+
     def get_base_url(self) -> str:
         """获取基础URL"""
         return self.base_url
@@ -54,7 +58,104 @@ class ConfigManager:
     def get_timeout(self) -> int:
         """获取超时时间（单位秒）"""
         return self.config.get("timeout", 10)
-    
+
+    def get_send_concurrency(self) -> int:
+        """获取同时投递的群聊数量"""
+        return self.config.get("send_concurrency", 4)
+
+    def get_send_rate(self) -> float:
+        """获取每秒最多发送的群消息数（令牌桶速率）"""
+        return self.config.get("send_rate", 1.0)
+
+    def get_send_burst(self) -> int:
+        """获取允许突发发送的群消息数（令牌桶容量）"""
+        return self.config.get("send_burst", 5)
+
+    def get_send_retries(self) -> int:
+        """获取群消息发送失败后的重试次数"""
+        return self.config.get("send_retries", 2)
+
+    def get_render_cache_size(self) -> int:
+        """获取报告图片渲染缓存的最大条目数（0 表示不缓存）"""
+        return self.config.get("render_cache_size", 32)
+
+    def get_render_cache_ttl(self) -> int:
+        """获取报告图片渲染缓存的存活时间（单位秒）"""
+        return self.config.get("render_cache_ttl", 600)
+
+    def get_notice_refresh_cache_ttl(self) -> int:
+        """获取通知刷新结果的缓存时间（单位秒），短时间内重复的更新命令直接复用"""
+        return self.config.get("notice_refresh_cache_ttl", 30)
+
+    def get_fragment_cache_size(self) -> int:
+        """获取单条通知HTML片段缓存的最大条目数（0 表示不缓存）"""
+        return self.config.get("fragment_cache_size", 2048)
+
+    def get_report_font_mode(self) -> str:
+        """获取报告字体的加载方式：inline（内联进模板）、file（引用本地文件）或 system（使用已安装字体）"""
+        return self.config.get("report_font_mode", "system")
+
+    def get_render_backend(self) -> str:
+        """获取报告图片的渲染后端：html（AstrBot的HTML渲染服务）或 native（Pillow直接绘制）"""
+        return self.config.get("render_backend", "html")
+
+    def get_render_font_path(self) -> str:
+        """获取原生渲染使用的中文字体文件（为空时自动查找）"""
+        return self.config.get("render_font_path", "")
+
+    def get_native_items_per_image(self) -> int:
+        """获取原生渲染时每张图片最多的通知条数，超出时分成多张图片"""
+        return self.config.get("native_items_per_image", 20)
+
+    def get_html_parser(self) -> str:
+        """获取HTML解析后端（auto / selectolax / lxml / html.parser）"""
+        return self.config.get("html_parser", "auto")
+
+    def get_worker_threads(self) -> int:
+        """获取解析与存储读写使用的工作线程数"""
+        return self.config.get("worker_threads", 2)
+
+    def get_backfill_concurrency(self) -> int:
+        """获取回填历史通知时的并发请求数"""
+        return self.config.get("backfill_concurrency", 4)
+
+    def get_contest_source_timeout(self) -> int:
+        """获取单个比赛平台爬取的截止时间（单位秒）"""
+        return self.config.get("contest_source_timeout", 15)
+
+    def get_contest_refresh_interval(self) -> int:
+        """获取比赛平台的最小刷新间隔（单位分钟）"""
+        return self.config.get("contest_refresh_interval", 30)
+
+    def get_contest_refresh_max_interval(self) -> int:
+        """获取比赛平台数据长期不变时的最大刷新间隔（单位分钟）"""
+        return self.config.get("contest_refresh_max_interval", 360)
+
+    def get_contest_refresh_jitter(self) -> float:
+        """获取比赛平台刷新时间的随机抖动比例"""
+        return self.config.get("contest_refresh_jitter", 0.1)
+
+    def get_contest_refresh_overrides(self) -> dict:
+        """获取按平台单独设置的最小刷新间隔（单位分钟，0 表示使用统一间隔），atcoder反爬严格，默认一天一次"""
+        overrides = {"atcoder": 1440, **self.config.get("contest_refresh_overrides", {})}
+        return {source: minutes for source, minutes in overrides.items() if minutes and minutes > 0}
+
+    def get_http_pool_size(self) -> int:
+        """获取HTTP连接池总连接数上限"""
+        return self.config.get("http_pool_size", 20)
+
+    def get_http_pool_size_per_host(self) -> int:
+        """获取HTTP连接池单站点连接数上限"""
+        return self.config.get("http_pool_size_per_host", 4)
+
+    def get_dns_cache_ttl(self) -> int:
+        """获取DNS缓存时间（单位秒）"""
+        return self.config.get("dns_cache_ttl", 300)
+
+    def get_keepalive_timeout(self) -> int:
+        """获取空闲连接保活时间（单位秒）"""
+        return self.config.get("keepalive_timeout", 75)
+
     def get_group_settings(self) -> dict:
         """获取指定群组的配置"""
         return self.config.get(f"group_settings", {})
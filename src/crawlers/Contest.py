@@ -7,6 +7,9 @@ import time
 
 # 比赛类
 class Contest:
+    # 使用 __slots__ 代替实例 __dict__，长期保存大量比赛时更省内存
+    __slots__ = ("oj", "name", "stime", "etime", "dtime", "link")
+
     def __init__(self, oj: str = '', name: str = '', stime: int = 0, dtime: int = 0, etime: int = 0,
                  link: str = ''):
         self.oj = oj
@@ -16,14 +19,24 @@ class Contest:
         self.dtime = dtime
         self.link = link
 
-        
+    def to_dict(self) -> dict:
+        """转换为字典（用于保存到本地文件）"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other):
+        if not isinstance(other, Contest):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __hash__(self):
+        # 相等的比赛链接必然相同，按链接散列即可
+        return hash(self.link)
 
     def __str__(self):
-        return json.dumps(self.__dict__, ensure_ascii=False, indent=4)
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=4)
 
     def __repr__(self):
-        return json.dumps(self.__dict__, ensure_ascii=False, indent=4)
-    
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=4)
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Contest':
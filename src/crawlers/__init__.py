@@ -1,7 +1,14 @@
 from .contests_crawler import ContestCrawler
 from .Contest import Contest
+from .contest_table import ContestTable
+from .contest_index import ContestTimeIndex
+from .contest_store import ContestStore, ContestChangeSet
 
-all = [
+__all__ = [
     "ContestCrawler",
     "Contest",
+    "ContestTable",
+    "ContestTimeIndex",
+    "ContestStore",
+    "ContestChangeSet",
 ]
\ No newline at end of file
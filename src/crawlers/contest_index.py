@@ -0,0 +1,148 @@
+"""
+比赛时间索引
+比赛按开始时间有序存放（ContestTable），另维护一份按结束时间有序的索引，
+“即将开始”“正在进行”“即将结束”等时间窗口查询用二分查找完成，复杂度 O(log n + k)
+数据更新时按 (平台, 链接) 比较差异，只插入/删除变化的比赛，不整体重建
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Optional
+
+from .Contest import Contest
+from .contest_table import ContestTable
+
+
+class ContestTimeIndex:
+    """比赛时间索引"""
+
+    def __init__(self, contests: Iterable[Contest] = ()):
+        self.table = ContestTable()             # 按开始时间有序
+        self._end_times = array("q")            # 按结束时间有序
+        self._end_keys: list[tuple] = []        # 与 _end_times 对应的比赛键
+        self._contests: dict[tuple, Contest] = {}   # 比赛键 → 比赛
+        self._max_duration = 0                  # 最长比赛时长的上界，用于限定“正在进行”的查找范围
+        self.sync(contests)
+
+    @staticmethod
+    def key(contest: Contest) -> tuple:
+        """比赛的唯一键"""
+        return (contest.oj, contest.link)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __contains__(self, contest: Contest) -> bool:
+        return self.key(contest) in self._contests
+
+    ###### 增量更新 ######
+
+    def _start_row(self, contest: Contest) -> int:
+        """在开始时间相同的行中定位该比赛所在的行"""
+        stime = int(contest.stime or 0)
+        row = bisect_left(self.table.stime, stime)
+        while row < len(self.table) and self.table.stime[row] == stime:
+            if self.table.links[row] == contest.link and self.table.oj_at(row) == contest.oj:
+                return row
+            row += 1
+        raise KeyError(self.key(contest))
+
+    def _end_row(self, contest: Contest) -> int:
+        """在结束时间相同的索引项中定位该比赛"""
+        etime = int(contest.etime or 0)
+        key = self.key(contest)
+        row = bisect_left(self._end_times, etime)
+        while row < len(self._end_times) and self._end_times[row] == etime:
+            if self._end_keys[row] == key:
+                return row
+            row += 1
+        raise KeyError(key)
+
+    def add(self, contest: Contest):
+        """插入一场比赛（同键比赛已存在时先删除）"""
+        key = self.key(contest)
+        if key in self._contests:
+            self.remove(self._contests[key])
+        stime, etime = int(contest.stime or 0), int(contest.etime or 0)
+        # 开始时间相同的比赛按插入顺序排列
+        self.table.insert(bisect_right(self.table.stime, stime), contest)
+        row = bisect_right(self._end_times, etime)
+        self._end_times.insert(row, etime)
+        self._end_keys.insert(row, key)
+        self._contests[key] = contest
+        self._max_duration = max(self._max_duration, etime - stime)
+
+    def remove(self, contest: Contest):
+        """删除一场比赛"""
+        stored = self._contests.pop(self.key(contest))
+        self.table.delete(self._start_row(stored))
+        row = self._end_row(stored)
+        del self._end_times[row]
+        del self._end_keys[row]
+
+    def sync(self, contests: Iterable[Contest]) -> dict:
+        """
+        使索引与最新的比赛列表一致，只改动有变化的比赛
+        返回变化数量 {"inserted", "updated", "removed"}
+        """
+        latest = {self.key(contest): contest for contest in contests}
+        stats = {"inserted": 0, "updated": 0, "removed": 0}
+
+        for key in [key for key in self._contests if key not in latest]:
+            self.remove(self._contests[key])
+            stats["removed"] += 1
+        for key, contest in latest.items():
+            stored = self._contests.get(key)
+            if stored is None:
+                stats["inserted"] += 1
+            elif stored == contest:
+                continue
+            else:
+                stats["updated"] += 1
+            self.add(contest)
+
+        if stats["removed"] or stats["updated"]:
+            # 删除比赛后时长上界可能变小，重新计算
+            self._max_duration = max(
+                (etime - stime for stime, etime in zip(self.table.stime, self.table.etime)), default=0
+            )
+        return stats
+
+    ###### 时间窗口查询 ######
+
+    def _rows(self, lo: int, hi: int) -> list[Contest]:
+        return [self.table[row] for row in range(lo, hi)]
+
+    def starting_within(self, start: Optional[int] = None, end: Optional[int] = None) -> list[Contest]:
+        """开始时间在 [start, end) 内的比赛（按开始时间排序），start/end 为 None 表示不限"""
+        lo = 0 if start is None else bisect_left(self.table.stime, start)
+        hi = len(self.table) if end is None else bisect_left(self.table.stime, end)
+        return self._rows(lo, hi)
+
+    def ending_within(self, start: Optional[int] = None, end: Optional[int] = None) -> list[Contest]:
+        """结束时间在 [start, end) 内的比赛（按结束时间排序），start/end 为 None 表示不限"""
+        lo = 0 if start is None else bisect_left(self._end_times, start)
+        hi = len(self._end_times) if end is None else bisect_left(self._end_times, end)
+        return [self._contests[key] for key in self._end_keys[lo:hi]]
+
+    def running_at(self, timestamp: int) -> list[Contest]:
+        """
+        在 timestamp 时刻正在进行的比赛（开始时间 <= timestamp < 结束时间，按开始时间排序）
+        候选范围取以下最小者再逐个检查：
+        - 开始时间在 [timestamp - 最长时长, timestamp] 内的比赛
+        - 未结束的比赛
+        """
+        started = bisect_right(self.table.stime, timestamp)                                 # [0, started) 已开始
+        recent = bisect_left(self.table.stime, timestamp - self._max_duration)              # [recent, started) 可能未结束
+        not_ended = bisect_right(self._end_times, timestamp)                                # [not_ended, n) 未结束
+        if started - recent <= len(self._end_times) - not_ended:
+            return [
+                self.table[row] for row in range(recent, started)
+                if self.table.etime[row] > timestamp
+            ]
+        running = [
+            self._contests[key] for key in self._end_keys[not_ended:]
+            if self._contests[key].stime <= timestamp
+        ]
+        running.sort(key=lambda contest: contest.stime)
+        return running
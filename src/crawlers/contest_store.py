@@ -0,0 +1,193 @@
+"""
+比赛增量存储
+以 (平台, 链接) 为键合并每次爬取的结果，识别新增、变更（如改期）与移除的比赛，
+只把变化追加写入日志，不再每次整体重写；日志积累到一定数量后压缩进快照
+
+文件：
+- 快照 json_innovation_contests.json：{"time": 时间戳, "data": [比赛, ...]}，与旧版本格式兼容（不再缩进）
+- 日志 json_innovation_contests.log.jsonl：每行一条变化 {"time", "op": "upsert"/"remove", ...}
+- 历史 json_innovation_contests_history.jsonl：被移除（已结束或取消）的比赛，只追加不压缩
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Iterable, Optional
+
+from astrbot.api import logger
+from .Contest import Contest
+
+
+class ContestChangeSet:
+    """一次合并产生的变化"""
+
+    def __init__(self):
+        self.inserted: list[Contest] = []
+        self.updated: list[tuple[Contest, Contest]] = []    # [(旧, 新)]
+        self.removed: list[Contest] = []
+
+    def __len__(self) -> int:
+        return len(self.inserted) + len(self.updated) + len(self.removed)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def summary(self) -> dict:
+        """各类变化的数量"""
+        return {"inserted": len(self.inserted), "updated": len(self.updated), "removed": len(self.removed)}
+
+
+class ContestStore:
+    """比赛增量存储"""
+
+    COMPACT_THRESHOLD = 500     # 日志超过该条数时压缩进快照
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+        base, _ = os.path.splitext(snapshot_path)
+        self.log_path = base + ".log.jsonl"
+        self.history_path = base + "_history.jsonl"
+        self._lock = threading.RLock()
+        self._contests: dict[tuple, Contest] = {}   # 比赛键 → 比赛
+        self._log_records = 0
+        self._load()
+
+    @staticmethod
+    def key(contest: Contest) -> tuple:
+        """比赛的唯一键"""
+        return (contest.oj, contest.link)
+
+    ###### 读取 ######
+
+    def _load(self):
+        """读取快照并重放日志"""
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    for data in json.load(f).get("data", []):
+                        contest = Contest.from_dict(data)
+                        self._contests[self.key(contest)] = contest
+            except Exception as e:
+                logger.error(f"读取比赛快照失败: {str(e)}")
+
+        corrupted = False
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 写入中断留下的不完整行，忽略
+                        corrupted = True
+                        continue
+                    self._apply(record)
+                    self._log_records += 1
+
+        if corrupted:
+            # 立即压缩，避免后续追加的记录接在不完整的行后面
+            logger.warning("比赛变更日志存在不完整的记录，已忽略并重新压缩")
+            self.compact()
+        elif self._log_records > self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def _apply(self, record: dict):
+        if record["op"] == "upsert":
+            contest = Contest.from_dict(record["contest"])
+            self._contests[self.key(contest)] = contest
+        elif record["op"] == "remove":
+            self._contests.pop(tuple(record["key"]), None)
+
+    def __len__(self) -> int:
+        return len(self._contests)
+
+    def read_all(self) -> list[Contest]:
+        """当前的所有比赛，按开始时间排序"""
+        with self._lock:
+            return sorted(self._contests.values(), key=lambda contest: contest.stime)
+
+    def history(self) -> list[Contest]:
+        """曾经出现过、后来被移除的比赛"""
+        if not os.path.exists(self.history_path):
+            return []
+        contests = []
+        with open(self.history_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    contests.append(Contest.from_dict(json.loads(line)["contest"]))
+                except (json.JSONDecodeError, KeyError):
+                    continue
+        return contests
+
+    ###### 写入 ######
+
+    def merge(self, contests: Iterable[Contest], sources: Optional[Iterable[str]] = None) -> ContestChangeSet:
+        """
+        合并最新爬取的比赛
+        sources 为本次成功爬取的平台，只有这些平台中不再出现的比赛才视为移除；
+        为 None 时视为所有平台都已爬取
+        返回变化集合
+        """
+        latest = {self.key(contest): contest for contest in contests}
+        sources = None if sources is None else set(sources)
+        changes = ContestChangeSet()
+
+        with self._lock:
+            for key, contest in latest.items():
+                stored = self._contests.get(key)
+                if stored is None:
+                    changes.inserted.append(contest)
+                elif stored != contest:
+                    changes.updated.append((stored, contest))
+            for key, stored in self._contests.items():
+                if key not in latest and (sources is None or stored.oj in sources):
+                    changes.removed.append(stored)
+
+            if changes:
+                self._write_changes(changes)
+                for contest in changes.inserted:
+                    self._contests[self.key(contest)] = contest
+                for _, contest in changes.updated:
+                    self._contests[self.key(contest)] = contest
+                for contest in changes.removed:
+                    self._contests.pop(self.key(contest), None)
+
+            if self._log_records > self.COMPACT_THRESHOLD:
+                self.compact()
+        return changes
+
+    def _write_changes(self, changes: ContestChangeSet):
+        """把变化追加写入日志，移除的比赛另外写入历史"""
+        now = int(datetime.now().timestamp())
+        lines = [
+            json.dumps({"time": now, "op": "upsert", "contest": contest.to_dict()}, ensure_ascii=False)
+            for contest in changes.inserted + [new for _, new in changes.updated]
+        ]
+        lines += [
+            json.dumps({"time": now, "op": "remove", "key": list(self.key(contest))}, ensure_ascii=False)
+            for contest in changes.removed
+        ]
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        self._log_records += len(lines)
+
+        if changes.removed:
+            with open(self.history_path, "a", encoding="utf-8") as f:
+                for contest in changes.removed:
+                    f.write(json.dumps({"time": now, "contest": contest.to_dict()}, ensure_ascii=False) + "\n")
+
+    def compact(self):
+        """把当前数据写成快照（先写临时文件再替换），并清空日志"""
+        with self._lock:
+            tmp_path = self.snapshot_path + ".tmp"
+            snapshot = {
+                "time": int(datetime.now().timestamp()),
+                "data": [contest.to_dict() for contest in self.read_all()],
+            }
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.snapshot_path)
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+            self._log_records = 0
+            logger.info(f"比赛数据已压缩为快照，共{len(self._contests)}个比赛")
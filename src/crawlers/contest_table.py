@@ -0,0 +1,153 @@
+"""
+比赛列式容器
+按列保存比赛：开始/结束/持续时间存放在紧凑的 array('q') 中，平台存为编号，
+按时间窗口、平台筛选时逐行遍历各列、一次判断全部条件，排序只对开始时间列排序，都不需要构造比赛对象
+"""
+
+from array import array
+from itertools import compress
+from typing import Iterable, Optional
+
+from .Contest import Contest
+
+
+class ContestTable:
+    """比赛列式容器"""
+
+    MIN_TIME = -(1 << 63)       # array('q') 的取值范围
+    MAX_TIME = (1 << 63) - 1
+
+    def __init__(self, contests: Iterable[Contest] = ()):
+        self.stime = array("q")     # 开始时间戳
+        self.etime = array("q")     # 结束时间戳
+        self.dtime = array("q")     # 持续时间（秒）
+        self.oj_code = array("B")   # 平台编号，对应 self.ojs 中的下标
+        self.ojs: list[str] = []    # 平台名称表
+        self.names: list[str] = []
+        self.links: list[str] = []
+        self.extend(contests)
+
+    ###### 构造与转换 ######
+
+    def _oj_code(self, oj: str) -> int:
+        try:
+            return self.ojs.index(oj)
+        except ValueError:
+            self.ojs.append(oj)
+            return len(self.ojs) - 1
+
+    def append(self, contest: Contest):
+        """追加一场比赛"""
+        self.stime.append(int(contest.stime or 0))
+        self.etime.append(int(contest.etime or 0))
+        self.dtime.append(int(contest.dtime or 0))
+        self.oj_code.append(self._oj_code(contest.oj))
+        self.names.append(contest.name)
+        self.links.append(contest.link)
+
+    def insert(self, i: int, contest: Contest):
+        """在第i行之前插入一场比赛"""
+        self.stime.insert(i, int(contest.stime or 0))
+        self.etime.insert(i, int(contest.etime or 0))
+        self.dtime.insert(i, int(contest.dtime or 0))
+        self.oj_code.insert(i, self._oj_code(contest.oj))
+        self.names.insert(i, contest.name)
+        self.links.insert(i, contest.link)
+
+    def delete(self, i: int):
+        """删除第i行"""
+        del self.stime[i], self.etime[i], self.dtime[i], self.oj_code[i], self.names[i], self.links[i]
+
+    def oj_at(self, i: int) -> str:
+        """第i行的平台名称"""
+        return self.ojs[self.oj_code[i]]
+
+    def extend(self, contests: Iterable[Contest]):
+        """批量追加比赛"""
+        for contest in contests:
+            self.append(contest)
+
+    def __len__(self) -> int:
+        return len(self.stime)
+
+    def __getitem__(self, i: int) -> Contest:
+        return Contest(
+            oj=self.oj_at(i), name=self.names[i], stime=self.stime[i],
+            dtime=self.dtime[i], etime=self.etime[i], link=self.links[i],
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def to_contests(self) -> list[Contest]:
+        """转换为比赛对象列表"""
+        return list(self)
+
+    def to_dict(self) -> dict:
+        """按列转换为字典（平台名称展开），可直接序列化为JSON"""
+        return {
+            "oj": [self.ojs[code] for code in self.oj_code],
+            "name": list(self.names),
+            "stime": self.stime.tolist(),
+            "etime": self.etime.tolist(),
+            "dtime": self.dtime.tolist(),
+            "link": list(self.links),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ContestTable":
+        """从 to_dict 的结果还原"""
+        table = cls()
+        for oj in data.get("oj", []):
+            table.oj_code.append(table._oj_code(oj))
+        table.names = list(data.get("name", []))
+        table.links = list(data.get("link", []))
+        table.stime = array("q", data.get("stime", []))
+        table.etime = array("q", data.get("etime", []))
+        table.dtime = array("q", data.get("dtime", []))
+        return table
+
+    ###### 批量操作 ######
+
+    def take(self, indices: Iterable[int]) -> "ContestTable":
+        """按下标取出若干场比赛，组成新的容器（下标顺序即新顺序）"""
+        indices = list(indices)
+        table = ContestTable()
+        table.ojs = list(self.ojs)
+        table.stime = array("q", [self.stime[i] for i in indices])
+        table.etime = array("q", [self.etime[i] for i in indices])
+        table.dtime = array("q", [self.dtime[i] for i in indices])
+        table.oj_code = array("B", [self.oj_code[i] for i in indices])
+        table.names = [self.names[i] for i in indices]
+        table.links = [self.links[i] for i in indices]
+        return table
+
+    def sorted_by_start(self) -> "ContestTable":
+        """按开始时间排序（稳定排序），返回新的容器"""
+        return self.take(sorted(range(len(self)), key=self.stime.__getitem__))
+
+    def mask(self, start_before: Optional[int] = None, start_after: Optional[int] = None,
+             end_after: Optional[int] = None, ojs: Optional[Iterable[str]] = None) -> list[bool]:
+        """
+        计算筛选掩码，各条件同时满足：
+        - start_before：开始时间 < start_before
+        - start_after：开始时间 >= start_after
+        - end_after：结束时间 > end_after
+        - ojs：平台属于其中之一
+        """
+        # 未指定的条件换成恒成立的边界，单次遍历同时判断全部条件
+        low = start_after if start_after is not None else self.MIN_TIME
+        high = start_before if start_before is not None else self.MAX_TIME
+        end_low = end_after if end_after is not None else self.MIN_TIME - 1
+        if ojs is None:
+            return [low <= s < high and e > end_low for s, e in zip(self.stime, self.etime)]
+        wanted = set(ojs)
+        codes = {i for i, oj in enumerate(self.ojs) if oj in wanted}
+        return [
+            low <= s < high and e > end_low and c in codes
+            for s, e, c in zip(self.stime, self.etime, self.oj_code)
+        ]
+
+    def filter(self, **conditions) -> "ContestTable":
+        """按条件筛选比赛（条件见 mask），返回新的容器，保持原有顺序"""
+        return self.take(compress(range(len(self)), self.mask(**conditions)))
@@ -10,18 +10,43 @@ import os
 import time
 from typing import Optional, List
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from html import unescape
 
 # 第三方库导入
 import asyncio
-import aiohttp
-import aiofiles
-from bs4 import BeautifulSoup
 
 # 本地模块导入
 from astrbot.api import logger
 from .Contest import Contest
-from ..core import ConfigManager
+from .contest_table import ContestTable
+from .contest_index import ContestTimeIndex
+from .contest_store import ContestStore
+from .refresh_policy import RefreshPolicy, RefreshScheduler
+from .json_stream import JsonArrayStream
+from ..core import ConfigManager, HttpClient
+from ..core.html_parsers import get_html_parser
+
+
+class ContestSourceError(Exception):
+    """比赛平台请求失败（状态码异常或接口返回错误）"""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after      # 服务器要求的等待秒数（Retry-After）
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 头（秒数或HTTP日期），无法解析时返回 None"""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 class ContestCrawler:
@@ -29,15 +54,30 @@ class ContestCrawler:
     爬取各种编程比赛通知的基类
     """
 
-    def __init__(self, config: ConfigManager):
+    # 各平台的请求地址
+    SOURCE_URLS = {
+        "cf": "https://codeforces.com/api/contest.list",
+        "lougu": "https://www.luogu.com.cn/contest/list?page=1&_contentOnly=1",
+        "atcoder": "https://atcoder.jp/contests/",
+        "nowcoder": "https://ac.nowcoder.com/acm/contest/vip-index?topCategoryFilter=13",
+        "leetcode": "https://leetcode.com/graphql",
+    }
+    CF_CONTEST_LIMIT = 100          # cf只看比赛列表的前n个（最新的比赛排在最前面）
+    CF_STREAM_CHUNK_SIZE = 16384    # 流式解析cf响应时每次读取的字节数
+
+    def __init__(self, config: ConfigManager, http_client: HttpClient, source_urls: Optional[dict] = None):
         self.config = config
+        self.http_client = http_client      # 共享的HTTP客户端
+        # 可按平台覆盖请求地址（如指向本地回放服务进行离线测试）
+        self.source_urls = {**self.SOURCE_URLS, **(source_urls or {})}
+        self.html_parser = get_html_parser(self.config.get_html_parser())   # HTML解析后端
         self.storage_path = os.path.join(
             self.config.get_storage_root(), "json_innovation_contests.json"
         )
-        self.storage_path_atcoder = os.path.join(
-            self.config.get_storage_root(), "json_innovation_contests_atcoder.json"
-        )
         self._init_storage()
+        self.store = ContestStore(self.storage_path)            # 比赛增量存储（快照 + 变更日志）
+        self.index = ContestTimeIndex(self.store.read_all())    # 比赛时间索引，update() 时增量更新
+        self.refresh = self._create_refresh_scheduler()         # 各平台的刷新时机
 
     def _init_storage(self):
         """初始化存储目录（如果不存在则创建）"""
@@ -46,6 +86,32 @@ class ContestCrawler:
             os.makedirs(dir_path, exist_ok=True)
             logger.info(f"创建存储目录: {dir_path}")
 
+    def _create_refresh_scheduler(self) -> RefreshScheduler:
+        """根据配置创建各平台的刷新策略（配置中的间隔单位为分钟）"""
+        jitter = self.config.get_contest_refresh_jitter()
+        max_interval = self.config.get_contest_refresh_max_interval() * 60
+
+        def policy(minutes: float) -> RefreshPolicy:
+            return RefreshPolicy(min_interval=minutes * 60, max_interval=max_interval, jitter=jitter)
+
+        return RefreshScheduler(
+            os.path.join(self.config.get_storage_root(), "contest_refresh_state.json"),
+            policies={
+                source: policy(minutes)
+                for source, minutes in self.config.get_contest_refresh_overrides().items()
+            },
+            default_policy=policy(self.config.get_contest_refresh_interval()),
+        )
+
+    @staticmethod
+    def _check_response(resp, label: str):
+        """状态码不是200时抛出 ContestSourceError（带上状态码与 Retry-After）"""
+        if resp.status != 200:
+            raise ContestSourceError(
+                f"{label} API返回状态码 {resp.status}", status=resp.status,
+                retry_after=_parse_retry_after(resp.headers.get("Retry-After")),
+            )
+
     ###### 工具函数 - 获取各个平台的比赛 ######
 
     async def _fetch_cf_contest(self) -> list[Contest]:
@@ -53,277 +119,101 @@ class ContestCrawler:
         获取cf比赛
         """
         os.environ['NO_PROXY'] = 'codeforces.com'
-        url = 'https://codeforces.com/api/contest.list'
+        url = self.source_urls['cf']
         user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:95.0) Gecko/20100101 Firefox/95.0'
         headers = {'User-Agent': user_agent}
-        res = []
-        n = 100     # 筛选前n个比赛
 
         # 开始爬取
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout = self.config.get_timeout()) as resp:
-
-                    if resp.status != 200:
-                        logger.error(f"Codeforces API返回状态码 {resp.status}")
-                        return res
-
-                    # 解析
-                    resp_text = await resp.text()
-                    url_get_par = json.loads(resp_text)
-
-                    if url_get_par['status'] != 'OK':
-                        logger.error(f"Codeforces API返回状态码 {url_get_par['status']}")
-                        return res
-                    
-                    contests = url_get_par['result'][:n]
-
-                    for info in contests:
+            async with self.http_client.get(url, headers=headers) as resp:
 
-                        if (info['phase'] != 'BEFORE'):
-                            continue
+                self._check_response(resp, "Codeforces")
 
-                        
-                        contest_id = info.get('id')
-                        name = info.get('name')
-                        start_time = info.get('startTimeSeconds')
-                        duration = info.get('durationSeconds')
-
-
-                        # 关键信息不全则跳过
-                        if not all([contest_id, name, start_time, duration]):
-                            continue
-
-                        end_time = start_time + duration
-
-                        res.append(Contest(oj='cf', name=name, stime=start_time, etime=end_time, dtime=duration, link=f"https://codeforces.com/contests/{contest_id}"))
-                    logger.info(f"爬取code force比赛完成，共{len(res)}个比赛")
-                    return res
+                # 边接收边解析，取够前n个比赛后不再读取剩余的历史比赛
+                return await self._parse_cf_contest_stream(resp.content.iter_chunked(self.CF_STREAM_CHUNK_SIZE))
         except Exception as e:
             logger.error(f"Codeforces API获取比赛列表失败: {str(e)}")
-            return res
+            raise
  
 
     async def _fetch_lougu_contest(self) -> list[Contest]:
         """
         获取lougu比赛
         """
-        url = 'https://www.luogu.com.cn/contest/list?page=1&_contentOnly=1'
+        url = self.source_urls['lougu']
         user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:95.0) Gecko/20100101 Firefox/95.0'
         headers = {'User-Agent': user_agent}
-        res = []
-        currentTime = time.time()
 
         # 开始爬取
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout = self.config.get_timeout()) as resp:
-
-                    if resp.status != 200:
-                        logger.error(f"Luogu API返回状态码 {resp.status}")
-                        return res
-
-                    # 解析
-                    resp_text = await resp.text()
-                    url_get_par = json.loads(resp_text)
-                    contests = url_get_par['currentData']['contests']['result']
-
-                    for info in contests:
-
-                        if (currentTime > info.get('startTime')):
-                            continue
-                            
-                        
-                        name = info.get('name')
-                        start_time = info.get('startTime')
-                        end_time = info.get('endTime')
-                        dtime = end_time - start_time
-                        link = f'https://www.luogu.com.cn/contest/{info["id"]}'
-
-                        # 关键信息不全则跳过
-                        if not all([name, start_time, end_time, link]):
-                            continue
-
-
-                        res.append(Contest(oj='lougu', name=name, stime=start_time, etime=end_time, dtime=dtime, link=link))
-                    logger.info(f"爬取luogu比赛完成，共{len(res)}个比赛")
-                    return res
+            async with self.http_client.get(url, headers=headers) as resp:
+
+                self._check_response(resp, "Luogu")
+
+                # 解析
+                resp_text = await resp.text()
+                return self._parse_lougu_contest(resp_text)
         except Exception as e:
             logger.error(f"Luogu API获取比赛列表失败: {str(e)}")
-            return res
+            raise
         
 
     async def _fetch_atcoder_contest(self) -> list[Contest]:
         """
         获取atcoder比赛
         """
-        url = 'https://atcoder.jp/contests/'
+        url = self.source_urls['atcoder']
         user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:95.0) Gecko/20100101 Firefox/95.0'
         headers = {'User-Agent': user_agent}
-        res = []
-        currentTime = datetime.now()
 
-        # 这个比赛反爬虫比较严格，需要设置爬取间隔，一天爬取一次，通过读取本地文件判断是否需要刷新
+        # 这个比赛反爬虫比较严格，刷新间隔由刷新策略控制（默认一天一次）
+        # 开始爬取
         try:
-            async with aiofiles.open(self.storage_path_atcoder, 'r', encoding='utf-8') as f:
-                atcoder_contests = json.loads(await f.read())
-                last_refresh_time = datetime.fromtimestamp(atcoder_contests['time'])
-
-                if (currentTime - last_refresh_time).days < 1:
-                    logger.info(f"Atcoder距离上一次刷新时间{currentTime - last_refresh_time}，小于1天，不进行刷新")
-                    return res
-        except FileNotFoundError:
-            logger.warning(f"Atcoder比赛文件{self.storage_path_atcoder}不存在，正在正常爬取进行更新")
+            async with self.http_client.get(url, headers=headers) as resp:
 
+                self._check_response(resp, "Atcoder")
 
-
-        # 开始爬取
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout = self.config.get_timeout()) as resp:
-
-                    if resp.status != 200:
-                        logger.error(f"Atcoder API返回状态码 {resp.status}")
-                        return res
-
-                    # 解析
-                    resp_text = await resp.text()
-                    soup = BeautifulSoup(resp_text, 'html.parser')
-
-
-                    # 获取即将到来的比赛表格
-                    contest_table = soup.find('div', id='contest-table-upcoming')
-                    if not contest_table:
-                        logger.warning("未找到AtCoder比赛表格")
-                        return res
-
-                    check = True  # 用于跳过表头行
-                    for row in contest_table.find_all('tr'):
-                        if check:
-                            check = False
-                            continue
-                            
-                        contest = Contest(oj='atcoder')
-                        cells = row.find_all('td')
-                        
-                        for i, cell in enumerate(cells):
-                            if i == 0:
-                                # 处理开始时间
-                                time_tag = cell.find('time')
-                                if not time_tag:
-                                    continue
-                                    
-                                datetime_str = time_tag.text
-                                # 解析带时区的时间字符串
-                                dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S%z")
-                                # 转换为UTC时间
-                                dt_utc = dt.astimezone(timezone.utc)
-                                # 转换为时间戳（UTC+8）
-                                timestamp = int(dt_utc.timestamp())
-                                contest.stime = timestamp  # 转为东八区时间戳
-                                
-                            elif i == 1:
-                                # 处理比赛链接和名称
-                                a_tag = cell.find('a')
-                                if not a_tag:
-                                    continue
-                                
-                                contest.link = 'https://atcoder.jp' + a_tag.get('href', '') # type: ignore
-                                contest.name = a_tag.text.strip()
-                                
-                            elif i == 2:
-                                # 处理比赛时长
-                                time_text = cell.text.strip()
-                                nums = [int(num) for num in time_text.split(':') if num.isdigit()]
-                                if len(nums) >= 2:
-                                    contest.dtime = nums[0] * 3600 + nums[1] * 60
-                                    contest.etime = contest.stime + contest.dtime
-                        
-                        res.append(contest)
-
-                    # 按开始时间排序
-                    res.sort(key=lambda x: x.stime)
-                    logger.info(f"爬取atcoder比赛完成，共{len(res)}个比赛")
-                    return res
+                # 解析
+                resp_text = await resp.text()
+                return self._parse_atcoder_contest(resp_text)
         except Exception as e:
             logger.error(f"Atcoder API获取比赛列表失败: {str(e)}")
-            return res
+            raise
 
 
     async def _fetch_nowcoder_contest(self) -> list[Contest]:
         """
         获取nowcoder比赛
         """
-        url = 'https://ac.nowcoder.com/acm/contest/vip-index?topCategoryFilter=13'
+        url = self.source_urls['nowcoder']
         user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:95.0) Gecko/20100101 Firefox/95.0'
         headers = {'User-Agent': user_agent}
-        res = []
-        currentTime = time.time()
 
         # 开始爬取
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout = self.config.get_timeout()) as resp:
-
-                    if resp.status != 200:
-                        logger.error(f"Atcoder API返回状态码 {resp.status}")
-                        return res
-
-        #           # 解析
-                    resp_text = await resp.text()
-                    soup = BeautifulSoup(resp_text, 'html.parser')
-
-
-                    # 获取即将到来的比赛表格
-                    contest_container = soup.find('div', class_='platform-mod js-current')
-                    if not contest_container:
-                        logger.warning("未找到nowcoder比赛表格")
-                        return res
-
-                    # 解析每个比赛项
-                    for item in contest_container.find_all('div', class_='platform-item js-item'):
-                        data_json = item.get('data-json')
-                        if not data_json:
-                            continue
-                            
-                        try:
-                            # 解析JSON数据
-                            info = json.loads(unescape(str(data_json)))
-                            contest = Contest(oj='nowcoder')
-                            contest.dtime = int(info.get('contestDuration', 0) / 1000)
-                            contest.stime = int(info.get('contestStartTime', 0) / 1000)
-                            contest.etime = int(info.get('contestEndTime', 0) / 1000)
-                            contest.name = info.get('contestName', '未知比赛')
-                            contest_id = info.get('contestId')
-                            contest.link = f'https://ac.nowcoder.com/acm/contest/{contest_id}' if contest_id else ''
-                            
-                            res.append(contest)
-                        except (json.JSONDecodeError, KeyError, ValueError) as e:
-                            logger.warning(f"解析NowCoder比赛数据失败: {str(e)}")
-                            continue
-
-                    # 按开始时间排序
-                    res.sort(key=lambda x: x.stime)
-
-                    logger.info(f"爬取nowcoder比赛完成，共{len(res)}个比赛")
-                    return res
+            async with self.http_client.get(url, headers=headers) as resp:
+
+                self._check_response(resp, "NowCoder")
+
+                # 解析
+                resp_text = await resp.text()
+                return self._parse_nowcoder_contest(resp_text)
         except Exception as e:
             logger.error(f"NowCoder API获取比赛列表失败: {str(e)}")
-            return res
+            raise
 
 
     async def _fetch_leetcode_contest(self) -> list[Contest]:
         """
         获取LeetCode比赛信息
         """
-        url = 'https://leetcode.com/graphql'
+        url = self.source_urls['leetcode']
         user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:95.0) Gecko/20100101 Firefox/95.0'
         headers = {
             'Referer': 'https://leetcode.cn/',
             'Content-Type': 'application/json',
             'User-Agent': user_agent
         }
-        res = []
 
         # GraphQL查询数据
         data = {
@@ -343,97 +233,327 @@ class ContestCrawler:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, data=json.dumps(data), timeout=self.config.get_timeout()) as resp:
-                    if resp.status != 200:
-                        logger.error(f"LeetCode API返回状态码 {resp.status}")
-                        return res
-
-                    resp_text = await resp.text()
-                    try:
-                        resp_json = json.loads(resp_text)
-                        contests = resp_json.get("data", {}).get("allContests", [])
-                    except json.JSONDecodeError as e:
-                        logger.error(f"解析LeetCode响应失败: {str(e)}")
-                        return res
-
-                    current_time = time.time()
-                    for info in contests:
-                        # 过滤虚拟比赛和已结束比赛
-                        if info.get("isVirtual", False):
-                            continue
-                            
-                        end_time = info.get("startTime", 0) + info.get("duration", 0)
-                        if end_time < current_time:
-                            continue
-
-                        # 构造比赛信息
-                        contest = Contest(oj='leetcode')
-                        contest.dtime = info.get("duration", 0)
-                        contest.stime = info.get("startTime", 0)
-                        contest.etime = contest.stime + contest.dtime
-                        contest.name = info.get("title", "未知比赛")
-                        title_slug = info.get("titleSlug")
-                        contest.link = f'https://leetcode.cn/contest/{title_slug}' if title_slug else ''
-                        
-                        res.append(contest)
-
-                    # 按开始时间排序
-                    res.sort(key=lambda x: x.stime)
-
-                    logger.info(f"爬取leetcode比赛完成，共{len(res)}个比赛")
-                    return res
+            async with self.http_client.post(url, headers=headers, data=json.dumps(data)) as resp:
+                self._check_response(resp, "LeetCode")
+
+                resp_text = await resp.text()
+                return self._parse_leetcode_contest(resp_text)
 
         except Exception as e:
             logger.error(f"LeetCode API获取比赛列表失败: {str(e)}")
-            return res
+            raise
         
 
-    async def _save_contest(self, contests: list[Contest], path: str):
+    ###### 工具函数 - 解析各个平台的页面 ######
+
+    async def _parse_cf_contest_stream(self, chunks) -> list[Contest]:
         """
-        保存比赛信息到本地文件
+        流式解析cf比赛列表接口的JSON（chunks 为字节块的异步迭代器）
+        接口返回上千场历史比赛，只增量解析 result 数组的前n个元素，结果与一次性解析整个响应一致
+        提前停止时剩余的响应不再读取，该连接不会被复用
         """
-        if (contests != []):
-            atcoder_contests = {
-                "time": int(datetime.now().timestamp()),
-                "data": [contest.__dict__ for contest in contests]
-            }
-            async with aiofiles.open(path, mode='w', encoding='utf-8') as f:
-                await f.write(json.dumps(atcoder_contests, ensure_ascii=False, indent=4))
+        stream = JsonArrayStream("result")
+        contests = []
+        async for chunk in chunks:
+            contests += stream.feed(chunk)
+            if len(contests) >= self.CF_CONTEST_LIMIT or stream.finished:
+                break
+        else:
+            contests += stream.close()
+
+        if stream.header is None or stream.header.get('status') != 'OK':
+            status = stream.header.get('status') if stream.header else None
+            raise ContestSourceError(f"Codeforces API返回状态码 {status}")
+
+        logger.debug(f"cf比赛列表流式解析读取了 {stream.consumed_bytes} 字节")
+        return self._filter_cf_contest(contests[:self.CF_CONTEST_LIMIT])
+
+    def _filter_cf_contest(self, contests: list[dict]) -> list[Contest]:
+        """
+        从cf比赛列表中筛选尚未开始的比赛
+        """
+        res = []
+        for info in contests:
+
+            if (info['phase'] != 'BEFORE'):
+                continue
+
+            contest_id = info.get('id')
+            name = info.get('name')
+            start_time = info.get('startTimeSeconds')
+            duration = info.get('durationSeconds')
+
+            # 关键信息不全则跳过
+            if not all([contest_id, name, start_time, duration]):
+                continue
 
-    async def _read_contest(self, path: str) -> list[Contest]:
+            end_time = start_time + duration
+
+            res.append(Contest(oj='cf', name=name, stime=start_time, etime=end_time, dtime=duration, link=f"https://codeforces.com/contests/{contest_id}"))
+        logger.info(f"爬取code force比赛完成，共{len(res)}个比赛")
+        return res
+
+    def _parse_lougu_contest(self, resp_text: str) -> list[Contest]:
         """
-        从本地文件读取比赛信息
+        解析lougu比赛列表接口的JSON
         """
-        async with aiofiles.open(path, mode='r', encoding='utf-8') as f:
-            contests = await f.read()
-            contests = json.loads(contests)
-            contests = [Contest.from_dict(contest) for contest in contests['data']]
-            return contests
+        res = []
+        currentTime = time.time()
+
+        url_get_par = json.loads(resp_text)
+        contests = url_get_par['currentData']['contests']['result']
+
+        for info in contests:
+
+            if (currentTime > info.get('startTime')):
+                continue
+
+            name = info.get('name')
+            start_time = info.get('startTime')
+            end_time = info.get('endTime')
+            dtime = end_time - start_time
+            link = f'https://www.luogu.com.cn/contest/{info["id"]}'
+
+            # 关键信息不全则跳过
+            if not all([name, start_time, end_time, link]):
+                continue
+
+            res.append(Contest(oj='lougu', name=name, stime=start_time, etime=end_time, dtime=dtime, link=link))
+        logger.info(f"爬取luogu比赛完成，共{len(res)}个比赛")
+        return res
+
+    def _parse_leetcode_contest(self, resp_text: str) -> list[Contest]:
+        """
+        解析LeetCode GraphQL接口的JSON
+        """
+        res = []
+        try:
+            resp_json = json.loads(resp_text)
+            contests = resp_json.get("data", {}).get("allContests", [])
+        except json.JSONDecodeError as e:
+            logger.error(f"解析LeetCode响应失败: {str(e)}")
+            return res
+
+        current_time = time.time()
+        for info in contests:
+            # 过滤虚拟比赛和已结束比赛
+            if info.get("isVirtual", False):
+                continue
+
+            end_time = info.get("startTime", 0) + info.get("duration", 0)
+            if end_time < current_time:
+                continue
+
+            # 构造比赛信息
+            contest = Contest(oj='leetcode')
+            contest.dtime = info.get("duration", 0)
+            contest.stime = info.get("startTime", 0)
+            contest.etime = contest.stime + contest.dtime
+            contest.name = info.get("title", "未知比赛")
+            title_slug = info.get("titleSlug")
+            contest.link = f'https://leetcode.cn/contest/{title_slug}' if title_slug else ''
+
+            res.append(contest)
+
+        # 按开始时间排序
+        res.sort(key=lambda x: x.stime)
+
+        logger.info(f"爬取leetcode比赛完成，共{len(res)}个比赛")
+        return res
+
+    def _parse_atcoder_contest(self, resp_text: str) -> list[Contest]:
+        """
+        解析atcoder比赛页面
+        """
+        res = []
+
+        # 获取即将到来的比赛表格
+        rows = self.html_parser.atcoder_rows(resp_text)
+        if rows is None:
+            logger.warning("未找到AtCoder比赛表格")
+            return res
+
+        for datetime_str, href, name, time_text in rows:
+            contest = Contest(oj='atcoder')
+
+            # 处理开始时间
+            if datetime_str is not None:
+                # 解析带时区的时间字符串
+                dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S%z")
+                # 转换为UTC时间
+                dt_utc = dt.astimezone(timezone.utc)
+                # 转换为时间戳（UTC+8）
+                contest.stime = int(dt_utc.timestamp())  # 转为东八区时间戳
+
+            # 处理比赛链接和名称
+            if href is not None:
+                contest.link = 'https://atcoder.jp' + href
+                contest.name = name
+
+            # 处理比赛时长
+            if time_text is not None:
+                nums = [int(num) for num in time_text.split(':') if num.isdigit()]
+                if len(nums) >= 2:
+                    contest.dtime = nums[0] * 3600 + nums[1] * 60
+                    contest.etime = contest.stime + contest.dtime
+
+            res.append(contest)
+
+        # 按开始时间排序
+        res.sort(key=lambda x: x.stime)
+        logger.info(f"爬取atcoder比赛完成，共{len(res)}个比赛")
+        return res
+
+    def _parse_nowcoder_contest(self, resp_text: str) -> list[Contest]:
+        """
+        解析nowcoder比赛页面
+        """
+        res = []
+
+        # 获取即将到来的比赛
+        items = self.html_parser.nowcoder_items(resp_text)
+        if items is None:
+            logger.warning("未找到nowcoder比赛表格")
+            return res
+
+        # 解析每个比赛项
+        for data_json in items:
+            try:
+                # 解析JSON数据
+                info = json.loads(unescape(data_json))
+                contest = Contest(oj='nowcoder')
+                contest.dtime = int(info.get('contestDuration', 0) / 1000)
+                contest.stime = int(info.get('contestStartTime', 0) / 1000)
+                contest.etime = int(info.get('contestEndTime', 0) / 1000)
+                contest.name = info.get('contestName', '未知比赛')
+                contest_id = info.get('contestId')
+                contest.link = f'https://ac.nowcoder.com/acm/contest/{contest_id}' if contest_id else ''
+
+                res.append(contest)
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                logger.warning(f"解析NowCoder比赛数据失败: {str(e)}")
+                continue
+
+        # 按开始时间排序
+        res.sort(key=lambda x: x.stime)
+
+        logger.info(f"爬取nowcoder比赛完成，共{len(res)}个比赛")
+        return res
+
+    async def _run_source(self, name: str, fetcher, deadline: float) -> dict:
+        """
+        在截止时间内执行单个平台的爬取，记录耗时与状态
+        失败或超时不会抛出异常，而是体现在返回的状态中
+        """
+        start = time.perf_counter()
+        result = {"status": "ok", "count": 0, "elapsed": 0.0, "error": "", "http_status": None, "contests": []}
+        try:
+            result["contests"] = await asyncio.wait_for(fetcher(), timeout=deadline)
+            result["count"] = len(result["contests"])
+        except asyncio.TimeoutError:
+            result["status"] = "timeout"
+            result["error"] = f"超过{deadline}秒未完成"
+            logger.warning(f"{name}比赛爬取超时（{deadline}秒）")
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+            result["http_status"] = getattr(e, "status", None)
+            result["retry_after"] = getattr(e, "retry_after", None)
+            logger.error(f"{name}比赛爬取失败: {str(e)}")
+        result["elapsed"] = round(time.perf_counter() - start, 3)
+        return result
 
     ###### 对外接口 ######
-    async def update(self):
+    async def update(self, force: bool = False) -> dict:
         """
-        从网络获取比赛信息并保存到本地文件
-        其中对于atcoder，每天只会更新一次，降低被墙的概率
+        从网络获取比赛信息并增量合并到本地存储
+        各平台并发爬取，每个平台有独立的截止时间，互不阻塞
+        每个平台由刷新策略决定是否到期（atcoder默认每天只更新一次，降低被墙的概率），
+        未到期的平台本次跳过，沿用已保存的数据；force 为 True 时忽略刷新策略
+
+        返回：
+        {
+            "contests": 合并后的比赛列表,
+            "changes": 本次的变化（ContestChangeSet：inserted / updated / removed）,
+            "sources": {平台名: {"status": "ok"/"timeout"/"error"/"skipped", "count": 数量, "elapsed": 耗时秒数, "error": 错误信息}},
+            "elapsed": 总耗时秒数,
+        }
         """
-        
-        # 由于atcoder_contests是单独限制爬取的，需要单独保存
-        atcoder_contests = await self._fetch_atcoder_contest()
-        await self._save_contest(atcoder_contests, self.storage_path_atcoder)
-
-        # 所有比赛
-        contests = await self._fetch_cf_contest() + \
-            await self._fetch_lougu_contest() + \
-            await self._fetch_nowcoder_contest() + \
-            await self._fetch_leetcode_contest() + \
-            await self._read_contest(self.storage_path_atcoder)
-        contests.sort(key=lambda x: x.stime)
-        await self._save_contest(contests, self.storage_path)
-    
+        start = time.perf_counter()
+        deadline = self.config.get_contest_source_timeout()
+        sources = {
+            "atcoder": self._fetch_atcoder_contest,
+            "cf": self._fetch_cf_contest,
+            "lougu": self._fetch_lougu_contest,
+            "nowcoder": self._fetch_nowcoder_contest,
+            "leetcode": self._fetch_leetcode_contest,
+        }
+
+        # 所有到期的平台同时爬取
+        now = time.time()
+        due = {name: fetcher for name, fetcher in sources.items() if force or self.refresh.is_due(name, now)}
+        fetched = await asyncio.gather(
+            *(self._run_source(name, fetcher, deadline) for name, fetcher in due.items())
+        )
+        fetched = dict(zip(due.keys(), fetched))
+        results = {
+            name: fetched.get(name) or {
+                "status": "skipped", "count": 0, "elapsed": 0.0, "http_status": None, "contests": [],
+                "error": f"未到刷新时间（{Contest.timestamp_to_time(int(self.refresh.next_due(name)))}）",
+            }
+            for name in sources
+        }
+
+        # 增量合并，只有成功爬取的平台才会移除不再出现的比赛，失败的平台沿用已保存的数据
+        succeeded = {name for name, result in results.items() if result["status"] == "ok"}
+        latest = [contest for result in results.values() for contest in result.pop("contests")]
+        changes = await asyncio.to_thread(self.store.merge, latest, succeeded)
+        contests = self.store.read_all()
+        if changes:
+            self.index.sync(contests)
+
+        # 根据结果调整各平台的刷新时机
+        changed_sources = {contest.oj for contest in changes.inserted + changes.removed}
+        changed_sources |= {new.oj for _, new in changes.updated}
+        for name, result in fetched.items():
+            if result["status"] == "ok":
+                self.refresh.record_success(name, changed=name in changed_sources)
+            else:
+                self.refresh.record_failure(name, result["http_status"], result.pop("retry_after", None))
+        if fetched:
+            await asyncio.to_thread(self.refresh.save)
+
+        elapsed = round(time.perf_counter() - start, 3)
+        timing = ", ".join(f"{name}={result['elapsed']}s({result['status']})" for name, result in results.items())
+        summary = changes.summary()
+        logger.info(f"比赛信息更新完成，共{len(contests)}个比赛（新增{summary['inserted']}，变更{summary['updated']}，移除{summary['removed']}），总耗时{elapsed}s，各平台耗时: {timing}")
+        return {
+            "contests": contests,
+            "changes": changes,
+            "sources": results,
+            "elapsed": elapsed,
+        }
+
     async def read(self) -> list[Contest]:
         """
-        从本地文件读取比赛信息
+        读取本地保存的比赛信息（按开始时间排序）
+        """
+        return self.store.read_all()
+
+    async def read_table(self) -> ContestTable:
+        """
+        从本地文件读取比赛信息，以列式容器返回，便于按时间窗口、平台批量筛选
+        """
+        return ContestTable(await self.read())
+
+    async def read_index(self) -> ContestTimeIndex:
+        """
+        获取比赛时间索引
+        """
+        return self.index
+
+    async def read_history(self) -> list[Contest]:
+        """
+        读取曾经出现过、后来被移除（已结束或取消）的比赛
         """
-        contests = await self._read_contest(self.storage_path)
-        return contests
+        return await asyncio.to_thread(self.store.history)
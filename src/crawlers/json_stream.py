@@ -0,0 +1,94 @@
+"""
+JSON数组流式解析
+接口响应形如 {"status": "OK", "result": [{...}, {...}, ...]}，数组往往很长而我们只需要前面一部分，
+边接收边解析数组元素，取够之后即可停止，不必把整个响应读入内存再构造完整的对象树
+"""
+
+import re
+import json
+import codecs
+from typing import Optional
+
+
+class JsonArrayStream:
+    """
+    增量解析JSON对象中指定键的数组元素
+    用法：
+        stream = JsonArrayStream("result")
+        for chunk in chunks:
+            for item in stream.feed(chunk):
+                ...
+        stream.close()
+    数组之前的字段（如 status）在找到数组后可通过 header 获取
+    """
+
+    def __init__(self, key: str):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._in_array = False
+        self.header: Optional[dict] = None   # 数组之前的字段
+        self.finished = False                # 数组已结束
+        self.consumed_bytes = 0              # 已接收的字节数
+
+    def feed(self, chunk: bytes) -> list:
+        """接收一段响应数据，返回其中新解析出的完整数组元素"""
+        self.consumed_bytes += len(chunk)
+        self._buffer += self._utf8.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> list:
+        """响应接收完毕，返回剩余的数组元素；数据不完整时抛出 json.JSONDecodeError"""
+        self._buffer += self._utf8.decode(b"", final=True)
+        items = self._drain(final=True)
+        if not self._in_array:
+            # 响应中没有该数组（如接口返回错误），整体按普通JSON解析，供调用方检查其他字段
+            self.header = json.loads(self._buffer)
+            self._buffer = ""
+        elif not self.finished:
+            raise json.JSONDecodeError("数组未结束", self._buffer, len(self._buffer))
+        return items
+
+    def _find_array(self) -> bool:
+        match = self._key_pattern.search(self._buffer)
+        if not match:
+            return False
+        # 数组之前的部分补上右括号即为完整的JSON对象
+        prefix = self._buffer[:match.start()].rstrip().rstrip(",")
+        self.header = json.loads(prefix + "}")
+        self._buffer = self._buffer[match.end():]
+        self._in_array = True
+        return True
+
+    def _drain(self, final: bool) -> list:
+        if self.finished or (not self._in_array and not self._find_array()):
+            return []
+
+        items = []
+        buffer = self._buffer
+        pos = 0
+        length = len(buffer)
+        while True:
+            # 跳过空白与分隔符
+            while pos < length and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= length:
+                break
+            if buffer[pos] == "]":
+                self.finished = True
+                pos += 1
+                break
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break   # 元素不完整，等待更多数据
+            if end >= length and not final:
+                break   # 数字等标量可能被截断，等下一段数据确认
+            items.append(item)
+            pos = end
+
+        self._buffer = buffer[pos:]
+        return items
@@ -0,0 +1,140 @@
+"""
+比赛平台刷新策略
+每个平台独立决定是否需要刷新：
+- 最小刷新间隔 + 随机抖动，避免所有平台同时请求
+- 数据经常变化时缩短间隔（不低于最小间隔），长期不变时逐步拉长（不超过最大间隔）
+- 请求失败时指数退避，HTTP 429 时优先遵循 Retry-After
+状态持久化到本地文件，重启后继续生效（记录结果只更新内存，由调用方在工作线程中调用 save 写入）
+"""
+
+import os
+import json
+import time
+import random
+import threading
+from typing import Optional
+
+from astrbot.api import logger
+
+
+class RefreshPolicy:
+    """单个平台的刷新参数（单位秒）"""
+
+    def __init__(self, min_interval: float, max_interval: float, jitter: float = 0.1,
+                 backoff_base: float = 60, backoff_max: float = 6 * 3600,
+                 speedup: float = 0.5, slowdown: float = 1.5):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.jitter = jitter            # 抖动比例，如 0.1 表示 ±10%
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.speedup = speedup          # 数据有变化时间隔乘以该系数
+        self.slowdown = slowdown        # 数据无变化时间隔乘以该系数
+
+
+class RefreshScheduler:
+    """按平台管理刷新时机"""
+
+    def __init__(self, state_path: str, policies: dict[str, RefreshPolicy], default_policy: RefreshPolicy):
+        self.state_path = state_path
+        self.policies = policies
+        self.default_policy = default_policy
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()     # 保存可能在不同线程中并发执行，写文件之间不能交错
+        self._rng = random.Random()
+        # {平台: {"interval", "next_due", "errors", "last_attempt", "last_success", "last_status"}}
+        self._state: dict[str, dict] = self._load()
+
+    def policy(self, source: str) -> RefreshPolicy:
+        return self.policies.get(source, self.default_policy)
+
+    ###### 状态读写 ######
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"读取比赛刷新状态失败: {str(e)}")
+            return {}
+
+    def save(self):
+        """保存各平台的刷新状态（会阻塞，应在工作线程中调用）"""
+        with self._lock:
+            snapshot = {source: dict(state) for source, state in self._state.items()}
+        with self._save_lock:
+            try:
+                tmp_path = self.state_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp_path, self.state_path)
+            except Exception as e:
+                logger.error(f"保存比赛刷新状态失败: {str(e)}")
+
+    def _source_state(self, source: str) -> dict:
+        return self._state.setdefault(source, {
+            "interval": self.policy(source).min_interval,
+            "next_due": 0,
+            "errors": 0,
+            "last_attempt": 0,
+            "last_success": 0,
+            "last_status": "",
+        })
+
+    def _jittered(self, seconds: float, jitter: float) -> float:
+        return seconds * (1 + self._rng.uniform(-jitter, jitter))
+
+    ###### 对外接口 ######
+
+    def is_due(self, source: str, now: Optional[float] = None) -> bool:
+        """该平台现在是否需要刷新"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return now >= self._source_state(source)["next_due"]
+
+    def next_due(self, source: str) -> float:
+        """该平台下一次需要刷新的时间戳"""
+        with self._lock:
+            return self._source_state(source)["next_due"]
+
+    def record_success(self, source: str, changed: bool, now: Optional[float] = None):
+        """
+        记录一次成功的刷新
+        changed 表示本次数据是否有变化，据此调整刷新间隔
+        """
+        now = time.time() if now is None else now
+        policy = self.policy(source)
+        with self._lock:
+            state = self._source_state(source)
+            factor = policy.speedup if changed else policy.slowdown
+            state["interval"] = min(policy.max_interval, max(policy.min_interval, state["interval"] * factor))
+            state["next_due"] = now + self._jittered(state["interval"], policy.jitter)
+            state["errors"] = 0
+            state["last_attempt"] = state["last_success"] = now
+            state["last_status"] = "changed" if changed else "unchanged"
+
+    def record_failure(self, source: str, status: Optional[int] = None, retry_after: Optional[float] = None,
+                       now: Optional[float] = None):
+        """
+        记录一次失败的刷新，按连续失败次数指数退避
+        HTTP 429 且带有 Retry-After 时按其等待，否则退避时间加倍
+        """
+        now = time.time() if now is None else now
+        policy = self.policy(source)
+        with self._lock:
+            state = self._source_state(source)
+            state["errors"] += 1
+            delay = min(policy.backoff_max, policy.backoff_base * 2 ** (state["errors"] - 1))
+            if status == 429:
+                delay = retry_after if retry_after else min(policy.backoff_max, delay * 2)
+            state["next_due"] = now + self._jittered(delay, policy.jitter)
+            state["last_attempt"] = now
+            state["last_status"] = f"error({status})" if status else "error"
+            logger.warning(f"{source}比赛刷新失败（连续{state['errors']}次），{int(delay)}秒后重试")
+
+    def stats(self) -> dict:
+        """各平台的刷新状态"""
+        with self._lock:
+            return {source: dict(state) for source, state in self._state.items()}
@@ -4,6 +4,6 @@
 
 from .generators import ReportGenerator
 
-all = [
+__all__ = [
     "ReportGenerator",
 ]
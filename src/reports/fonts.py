@@ -0,0 +1,94 @@
+"""
+报告字体模块
+报告模板不从网络加载字体，渲染过程不访问外部地址（插件不附带字体文件）：
+- assets/fonts 下有用户自行生成的子集字体（由 scripts/subset_fonts.py 生成，文件名 NotoSansSC-<字重>.woff2）时，
+  以 @font-face 声明，inline 模式内联为 data URI（本地浏览器与远程渲染服务都可用），
+  file 模式引用本地文件（仅适用于与插件在同一台机器上的浏览器，样式表更小）
+- system 模式（默认）只声明 local() 来源，使用渲染环境已安装的中文字体；inline / file 模式找不到字体文件时给出警告并同样退回 local()
+子集之外的字符由浏览器按 font-family 顺序回退到系统字体
+"""
+
+import os
+import re
+import base64
+from functools import lru_cache
+from pathlib import Path
+
+from astrbot.api import logger
+
+
+FONT_FAMILY = "CSU Sans SC"
+FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "assets", "fonts")
+FONT_MODES = ("inline", "file", "system")
+
+# 渲染环境可能已安装的中文字体
+LOCAL_FONTS = ("Noto Sans SC", "Noto Sans CJK SC", "Source Han Sans SC", "PingFang SC", "Microsoft YaHei", "WenQuanYi Micro Hei")
+FONT_STACK = ", ".join(
+    [f"'{FONT_FAMILY}'"] + [f"'{name}'" for name in LOCAL_FONTS]
+    + ["-apple-system", "BlinkMacSystemFont", "'Segoe UI'", "sans-serif"]
+)
+
+_FONT_FILE = re.compile(r"^NotoSansSC-(\d{3})\.(woff2|woff|otf|ttf)$")
+_FORMATS = {"woff2": ("font/woff2", "woff2"), "woff": ("font/woff", "woff"),
+            "otf": ("font/otf", "opentype"), "ttf": ("font/ttf", "truetype")}
+_PREFERENCE = ("woff2", "woff", "otf", "ttf")
+
+
+def find_font_files(font_dir: str = FONT_DIR) -> dict[int, str]:
+    """字重 → 字体文件路径（同一字重有多种格式时优先 woff2）"""
+    found: dict[int, tuple[int, str]] = {}
+    try:
+        names = os.listdir(font_dir)
+    except OSError:
+        return {}
+    for name in names:
+        match = _FONT_FILE.match(name)
+        if not match:
+            continue
+        weight, rank = int(match.group(1)), _PREFERENCE.index(match.group(2))
+        if weight not in found or rank < found[weight][0]:
+            found[weight] = (rank, os.path.join(font_dir, name))
+    return {weight: path for weight, (_, path) in sorted(found.items())}
+
+
+def _local_sources() -> str:
+    return ", ".join(f"local('{name}')" for name in LOCAL_FONTS)
+
+
+def _font_url(path: str, mode: str) -> str:
+    mime, font_format = _FORMATS[path.rsplit(".", 1)[1]]
+    if mode == "file":
+        url = Path(path).as_uri()
+    else:
+        with open(path, "rb") as f:
+            url = f"data:{mime};base64,{base64.b64encode(f.read()).decode('ascii')}"
+    return f"url({url}) format('{font_format}')"
+
+
+@lru_cache(maxsize=None)
+def font_face_css(mode: str = "system", font_dir: str = FONT_DIR) -> str:
+    """生成 @font-face 样式（结果缓存，字体文件只读取一次）"""
+    if mode not in FONT_MODES:
+        logger.warning(f"未知的报告字体模式 {mode}，使用 system")
+        mode = "system"
+    files = find_font_files(font_dir) if mode != "system" else {}
+    if not files:
+        if mode != "system":
+            logger.warning(
+                f"报告字体模式为 {mode}，但 {font_dir} 下没有字体文件，报告只能使用渲染环境已安装的中文字体，"
+                f"渲染环境没有中文字体时中文会显示为方框（可用 scripts/subset_fonts.py 生成子集字体）"
+            )
+        return f"@font-face {{ font-family: '{FONT_FAMILY}'; src: {_local_sources()}; }}\n"
+
+    rules = []
+    for weight, path in files.items():
+        try:
+            source = _font_url(path, mode)
+        except OSError as e:
+            logger.error(f"读取字体文件 {path} 失败: {str(e)}")
+            continue
+        rules.append(
+            f"@font-face {{ font-family: '{FONT_FAMILY}'; font-weight: {weight}; font-display: block; "
+            f"src: {source}, {_local_sources()}; }}\n"
+        )
+    return "".join(rules)
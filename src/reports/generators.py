@@ -2,52 +2,127 @@
 报告生成器模块
 """
 
+import os
+import html
 import asyncio
 from datetime import datetime, timedelta
 from astrbot.api import logger
 from typing import Dict, Optional
 from .templates import HTMLTemplates
-import csv
-from pathlib import Path
+from .template_engine import FragmentTemplate, FragmentCache
+from .render_cache import RenderCache
+from .native_renderer import NativeReportRenderer
 from typing import List
 
 class ReportGenerator:
     """报告生成器"""
 
 
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, data_handler):
         self.config_manager = config_manager
+        self.data_handler = data_handler
+
+        # 查询报告的渲染缓存，通知存储新增数据时整体失效
+        self.render_cache = RenderCache(
+            max_entries=config_manager.get_render_cache_size(),
+            ttl=config_manager.get_render_cache_ttl(),
+        )
+        self.data_handler.add_change_listener(self.render_cache.clear)
+        self.font_mode = config_manager.get_report_font_mode()
+        self.native_renderer = self._create_native_renderer()
+        self._template_version = "native" if self.native_renderer else HTMLTemplates.version(self.font_mode)
+        # 单条通知的HTML片段按 (时间, 标题, 链接) 缓存，生成列表时只拼接序号与缓存的片段
+        self.notice_fragments = FragmentCache(
+            FragmentTemplate(HTMLTemplates.NOTICE_ITEM),
+            ("时间", "标题", "链接"),
+            max_entries=config_manager.get_fragment_cache_size(),
+        )
+
+    def _create_native_renderer(self) -> Optional[NativeReportRenderer]:
+        """render_backend 为 native 时创建原生渲染器，未安装 Pillow 时回退到HTML渲染"""
+        if self.config_manager.get_render_backend() != "native":
+            return None
+        try:
+            return NativeReportRenderer(
+                os.path.join(self.config_manager.get_storage_root(), "reports"),
+                font_path=self.config_manager.get_render_font_path(),
+                items_per_image=self.config_manager.get_native_items_per_image(),
+            )
+        except ImportError:
+            logger.warning("原生渲染需要安装 Pillow，已回退到HTML渲染")
+            return None
+
+    def _get_cached(self, cache_key) -> Optional[List[str]]:
+        """取缓存的图片；原生渲染的图片文件可能已被输出目录清理，缺失时视为未命中"""
+        images = self.render_cache.get(cache_key)
+        if images and self.native_renderer and not all(os.path.exists(path) for path in images):
+            self.render_cache.discard(cache_key)
+            return None
+        return images
+
+    async def _render_html(self, html_render_func, template: str, render_payload: Dict) -> List[str]:
+        """使用AstrBot内置的HTML渲染服务（直接传递模板和数据）"""
+        # 使用兼容的图片生成选项（基于NetworkRenderStrategy的默认设置）
+        image_options = {
+            "full_page": True,
+            "type": "jpeg",  # 使用默认的jpeg格式提高兼容性
+            "quality": 95,  # 设置合理的质量
+        }
+        image_url = await html_render_func(
+            template,
+            render_payload,
+            True,  # return_url=True，返回URL而不是下载文件
+            image_options,
+        )
+        return [image_url] if image_url else []
+
+    async def _render_native(self, section_title: str, notices: List[Dict], start: int = 1,
+                             stats: Optional[List[tuple]] = None, message: str = "") -> List[str]:
+        """使用原生渲染器绘制（在线程中执行，不阻塞事件循环），通知较多时返回多张图片"""
+        report_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if stats is not None:
+            stats = stats + [(report_time.split(" ")[0], "报告生成日期")]
+        return await asyncio.to_thread(
+            self.native_renderer.render, report_time, section_title, notices, start, stats, message
+        )
 
-    
     async def generate_image_report(
         self, html_render_func, page: Optional[int] = None, list_len: Optional[int] = None
-    ) -> Optional[str]:
-        """生成活动分析报告图片"""
+    ) -> Optional[List[str]]:
+        """生成活动分析报告图片，返回图片URL/文件路径列表"""
         try:
             if page is None or list_len is None:
                 page = 1
                 list_len = 15
                 logger.warning(f"page和list_len参数未指定，使用默认值 page={page}, list_len={list_len}")
+
+            # 相同模板、页码、每页数量且存储未变化时，直接返回之前渲染的图片
+            cache_key = (self._template_version, page, list_len, self.data_handler.store_version)
+            cached_images = self._get_cached(cache_key)
+            if cached_images:
+                logger.info(f"命中报告图片渲染缓存，URL: {cached_images}")
+                return cached_images
             
-            # 准备渲染数据
-            render_payload = await self._prepare_render_data(page, list_len)
-
-            # 使用AstrBot内置的HTML渲染服务（直接传递模板和数据）
-            # 使用兼容的图片生成选项（基于NetworkRenderStrategy的默认设置）
-            image_options = {
-                "full_page": True,
-                "type": "jpeg",  # 使用默认的jpeg格式提高兼容性
-                "quality": 95,  # 设置合理的质量
-            }
-            image_url = await html_render_func(
-                HTMLTemplates.get_image_template(),
-                render_payload,
-                True,  # return_url=True，返回URL而不是下载文件
-                image_options,
-            )
+            if self.native_renderer:
+                page_data = await self._load_page(page, list_len)
+                images = await self._render_native(
+                    f"通知列表（第 {page} 页，每页 {list_len} 条）",
+                    page_data["notices"],
+                    start=(page - 1) * list_len + 1,
+                    stats=[(page_data["notice_count"], "通知总数"), (page_data["latest_update"], "最新通知日期")],
+                    message=page_data["error"],
+                )
+            else:
+                # 准备渲染数据
+                render_payload = await self._prepare_render_data(page, list_len)
+                images = await self._render_html(
+                    html_render_func, HTMLTemplates.get_image_template(self.font_mode), render_payload
+                )
 
-            logger.info(f"生成活动分析报告图片成功，URL: {image_url}")
-            return image_url
+            logger.info(f"生成活动分析报告图片成功，URL: {images}")
+            if images:
+                self.render_cache.put(cache_key, images)
+            return images
         
         except Exception as e:
             logger.error(f"生成活动分析报告图片失败: {str(e)}", exc_info=True)
@@ -56,6 +131,26 @@ class ReportGenerator:
     
     
 
+    async def _load_page(self, page, list_len) -> Dict:
+        """读取一页通知与概览数据，读取失败时 error 为错误提示"""
+        notice_count = 0
+        latest_update = None
+        notices = []
+        error = ""
+        try:
+            # 只读取当前页的通知（存储后端已按时间倒序排列）
+            notice_count = await self.data_handler.count_notices_async()
+            latest_update = await self.data_handler.latest_notice_date_async()
+            notices = await self.data_handler.read_notices_async(list_len, page)
+        except Exception as e:
+            error = f"无法加载通知数据：{str(e)}"
+        return {
+            "notice_count": notice_count,
+            "latest_update": latest_update or "无数据",
+            "notices": notices,
+            "error": error,
+        }
+
     async def _prepare_render_data(self, page, list_len) -> Dict:
         """
         准备渲染数据
@@ -63,64 +158,75 @@ class ReportGenerator:
         page: 页码（从1开始）
         list_len: 列表长度（最大不超过15）
         """
-        
-
-        # 初始化通知列表HTML
-        notices_html = ""
-        notice_file = Path(self.config_manager.get_storage_file())
-        
-        try:
-            # 读取CSV文件内容
-            with open(notice_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)  # 使用标题行作为键
-                notices = list(reader)  # 转换为列表以便倒序排序
-            
-            # 按时间倒序排列（最新的在前）
-            notices.sort(key=lambda x: x['时间'], reverse=True)
-            
+        page_data = await self._load_page(page, list_len)
+        if page_data["error"]:
+            # 处理读取错误
+            notices_html = f'<div class="error-message">{html.escape(page_data["error"])}</div>'
+        else:
             # 构建通知列表HTML
-            for i, notice in enumerate(notices, 1):
-                if i < (page - 1) * list_len + 1 or i >= page * list_len + 1:
-                    continue  # 跳过不在范围内的索引
-                
-                # 格式化时间显示（可根据需要调整）
-                formatted_date = notice['时间']
-                
-                # 拼接单个通知的HTML
-                notices_html += f"""
-                <div class="notice-item">
-                    <div class="notice-header">
-                        <!-- 序号：左对齐 -->
-                        <span class="notice-number">{i}</span>
-                        <!-- 标题：中间填充，左对齐 -->
-                        <div class="notice-title-wrapper">
-                            <a href="{notice['链接']}" target="_blank">{notice['标题']}</a>
-                        </div>
-                        <!-- 日期：右对齐 -->
-                        <span class="notice-date">{formatted_date}</span>
-                    </div>
-                </div>
-                """
+            notices_html = self._build_notices_html(page_data["notices"], (page - 1) * list_len + 1)
 
-    
-        except Exception as e:
-            # 处理文件读取错误（如文件不存在、格式错误等）
-            notices_html = f"""
-            <div class="error-message">
-                无法加载通知数据：{str(e)}
-            </div>
-            """
-        
         # 返回渲染所需的完整数据字典
         return {
             "report_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "notice_count": len(notices) if 'notices' in locals() else 0,
+            "notice_count": page_data["notice_count"],
             "page": page,
             "list_len": list_len,
-            "latest_update": notices[0]['时间'] if 'notices' in locals() and notices else "无数据",
+            "latest_update": page_data["latest_update"],
             "notices_html": notices_html
         }
     
+    async def generate_search_report(
+        self, html_render_func, keyword: str, total: int, notices: List[Dict]
+    ) -> Optional[List[str]]:
+        """
+        生成搜索结果报告图片，返回图片URL/文件路径列表
+        参数：
+        html_render_func: 异步HTML渲染函数
+        keyword: 搜索关键词
+        total: 匹配总数
+        notices: 排名靠前的通知（已按相关度排序）
+        """
+        try:
+            cache_key = (self._template_version, "search", keyword, len(notices), self.data_handler.store_version)
+            cached_images = self._get_cached(cache_key)
+            if cached_images:
+                logger.info(f"命中报告图片渲染缓存，URL: {cached_images}")
+                return cached_images
+
+            latest_update = max((notice["时间"] for notice in notices), default="无数据")
+            if self.native_renderer:
+                images = await self._render_native(
+                    f"搜索“{keyword}”（按相关度排序，显示前 {len(notices)} 条）",
+                    notices,
+                    stats=[(total, "匹配通知数"), (latest_update, "最新匹配日期")],
+                )
+            else:
+                render_payload = {
+                    "report_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "notice_count": total,
+                    "keyword": keyword,
+                    "list_len": len(notices),
+                    "latest_update": latest_update,
+                    "notices_html": self._build_notices_html(notices),
+                }
+                images = await self._render_html(
+                    html_render_func, HTMLTemplates.get_search_image_template(self.font_mode), render_payload
+                )
+
+            logger.info(f"生成搜索结果报告图片成功，URL: {images}")
+            if images:
+                self.render_cache.put(cache_key, images)
+            return images
+
+        except Exception as e:
+            logger.error(f"生成搜索结果报告图片失败: {str(e)}", exc_info=True)
+            return None
+
+    def _build_notices_html(self, notices: List[Dict], start: int = 1) -> str:
+        """构建通知列表HTML（序号从start开始），标题与链接经过转义"""
+        return self.notice_fragments.render_list(notices, start)
+
     async def _prepare_render_data_new(self, new_notices: List[Dict]) -> Optional[Dict]:
         """
         准备新通知报告图片
@@ -134,47 +240,13 @@ class ReportGenerator:
         
         # 初始化通知列表HTML
         notices_html = ""
-        notice_file = Path(self.config_manager.get_storage_file())
         
         try:
-            # 读取CSV文件内容
-            with open(notice_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)  # 使用标题行作为键
-                notices = list(reader)  # 转换为列表以便倒序排序
-            
-            # 按时间倒序排列（最新的在前）
-            notices.sort(key=lambda x: x['时间'], reverse=True)
-            
             # 构建通知列表HTML
-            i = 1
-            for notice in new_notices:
-                # 格式化时间显示（可根据需要调整）
-                formatted_date = notice['时间']
-                
-                # 拼接单个通知的HTML
-                notices_html += f"""
-                <div class="notice-item">
-                    <div class="notice-header">
-                        <!-- 序号：左对齐 -->
-                        <span class="notice-number">{i}</span>
-                        <!-- 标题：中间填充，左对齐 -->
-                        <div class="notice-title-wrapper">
-                            <a href="{notice['链接']}" target="_blank">{notice['标题']}</a>
-                        </div>
-                        <!-- 日期：右对齐 -->
-                        <span class="notice-date">{formatted_date}</span>
-                    </div>
-                </div>
-                """
-                i += 1
+            notices_html = self._build_notices_html(new_notices)
 
         except Exception as e:
-            # 处理文件读取错误（如文件不存在、格式错误等）
-            notices_html = f"""
-            <div class="error-message">
-                无法加载通知数据：{str(e)}
-            </div>
-            """
+            logger.error(f"构建新增通知列表失败: {str(e)}")
             return None
         
         # 返回渲染所需的完整数据字典
@@ -186,9 +258,9 @@ class ReportGenerator:
 
     async def generate_new_image_report(
         self, html_render_func, new_notices: List[Dict]
-    ) -> Optional[str]:
+    ) -> Optional[List[str]]:
         """
-        准备新通知报告图片
+        准备新通知报告图片，返回图片URL/文件路径列表
         参数：
         html_render_func: 异步HTML渲染函数
         new_notices: 新通知列表（字典格式）
@@ -200,29 +272,21 @@ class ReportGenerator:
             return None
         
         try:
-            # 准备渲染数据
-            render_payload = await self._prepare_render_data_new(new_notices)
-            if not render_payload:
-                logger.error("无法准备渲染数据")
-                return None
-
-            # 使用AstrBot内置的HTML渲染服务（直接传递模板和数据）
-            # 使用兼容的图片生成选项（基于NetworkRenderStrategy的默认设置）
-            image_options = {
-                "full_page": True,
-                "type": "jpeg",  # 使用默认的jpeg格式提高兼容性
-                "quality": 95,  # 设置合理的质量
-            }
-            image_url = await html_render_func(
-                HTMLTemplates.get_new_image_template(),
-                render_payload,
-                True,  # return_url=True，返回URL而不是下载文件
-                image_options,
-            )
+            if self.native_renderer:
+                images = await self._render_native("今日新增", new_notices)
+            else:
+                # 准备渲染数据
+                render_payload = await self._prepare_render_data_new(new_notices)
+                if not render_payload:
+                    logger.error("无法准备渲染数据")
+                    return None
+                images = await self._render_html(
+                    html_render_func, HTMLTemplates.get_new_image_template(self.font_mode), render_payload
+                )
 
-            logger.info(f"生成新增通知报告图片成功，URL: {image_url}")
-            return image_url
+            logger.info(f"生成新增通知报告图片成功，URL: {images}")
+            return images
         
         except Exception as e:
             logger.error(f"生成新增通知报告图片失败: {str(e)}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,333 @@
+"""
+原生图片渲染模块
+不经过浏览器，用 Pillow 直接绘制与HTML模板相同版式的报告（标题栏、概览卡片、通知列表、页脚）：
+- 中文字体依次使用配置的字体文件、assets/fonts 下的字体、常见的系统中文字体
+- 字体对象与每个字符的宽度都有缓存，排版（截断标题、居中、右对齐）不重复测量
+- 通知较多时按每张图片的条数分页，输出多张图片
+- 图片保存到本地目录，文件名由报告内容计算，相同内容的报告直接复用已有文件
+
+依赖 Pillow：pip install pillow，未安装时 ReportGenerator 回退到HTML渲染
+"""
+
+import os
+import hashlib
+import threading
+from typing import Optional
+
+from astrbot.api import logger
+from .fonts import find_font_files
+
+
+# 常见的系统中文字体
+SYSTEM_FONTS = (
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/wqy-microhei/wqy-microhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/simhei.ttf",
+)
+
+# 配色（与HTML模板一致）
+BACKGROUND = (241, 245, 249)
+WHITE = (255, 255, 255)
+PRIMARY = (59, 130, 246)        # #3b82f6
+PRIMARY_DARK = (30, 64, 175)    # #1e40af
+HEADER_START = (37, 99, 235)    # #2563eb
+CARD = (239, 246, 255)          # #eff6ff
+CARD_BORDER = (191, 219, 254)   # #bfdbfe
+DIVIDER = (219, 234, 254)       # #dbeafe
+MUTED = (100, 116, 139)         # #64748b
+
+
+class GlyphCache:
+    """
+    字形缓存：每个 (字号, 粗体, 字符) 只由 FreeType 光栅化一次，保存为灰度蒙版与度量，
+    之后绘制文字只是把缓存的蒙版逐个贴到画布上；排版所需的宽度也直接取自缓存
+    """
+
+    def __init__(self, image_module, image_font, image_draw, regular_path: Optional[str], bold_path: Optional[str]):
+        self._image, self._image_font, self._image_draw = image_module, image_font, image_draw
+        self._paths = {False: regular_path, True: bold_path or regular_path}
+        self._glyphs: dict[tuple, tuple] = {}     # (字号, 粗体, 字符) → (蒙版, 左偏移, 上偏移, 宽度)
+        self._fonts: dict[tuple, object] = {}     # (字号, 粗体) → 字体对象
+        self._metrics: dict[tuple, tuple] = {}    # (字号, 粗体) → (上伸高度, 下伸高度)
+
+    def font(self, size: int, bold: bool = False):
+        key = (size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            path = self._paths[bold]
+            if path is None:
+                font = self._image_font.load_default(size)
+            else:
+                font = self._image_font.truetype(path, size)
+            self._fonts[key] = font
+        return font
+
+    def metrics(self, size: int, bold: bool = False) -> tuple[int, int]:
+        """(上伸高度, 下伸高度)"""
+        key = (size, bold)
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = self._metrics[key] = self.font(size, bold).getmetrics()
+        return metrics
+
+    def glyph(self, size: int, bold: bool, char: str) -> tuple:
+        key = (size, bold, char)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            font = self.font(size, bold)
+            # 以基线上的原点为锚点测量，蒙版只覆盖字形实际占用的区域
+            left, top, right, bottom = font.getbbox(char, anchor="ls")
+            mask = None
+            if right > left and bottom > top:
+                mask = self._image.new("L", (right - left, bottom - top))
+                self._image_draw.Draw(mask).text((-left, -top), char, font=font, fill=255, anchor="ls")
+            glyph = self._glyphs[key] = (mask, left, top, font.getlength(char))
+        return glyph
+
+    def width(self, text: str, size: int, bold: bool = False) -> float:
+        """按字符宽度累加（中文排版不涉及字距调整）"""
+        return sum(self.glyph(size, bold, char)[3] for char in text)
+
+    def truncate(self, text: str, size: int, max_width: float, bold: bool = False) -> str:
+        """超出宽度时截断并加省略号"""
+        if self.width(text, size, bold) <= max_width:
+            return text
+        limit = max_width - self.width("…", size, bold)
+        used = 0.0
+        for i, char in enumerate(text):
+            used += self.glyph(size, bold, char)[3]
+            if used > limit:
+                return text[:i] + "…"
+        return text
+
+    def draw(self, image, xy: tuple, text: str, size: int, fill: tuple, bold: bool = False, anchor: str = "la"):
+        """
+        绘制一行文字，anchor 与 Pillow 相同的两个字母：
+        水平 l/m/r（左/中/右），垂直 a/m/s（上伸线/上下伸线中点/基线）
+        """
+        x, y = xy
+        if anchor[0] != "l":
+            width = self.width(text, size, bold)
+            x -= width / 2 if anchor[0] == "m" else width
+        ascent, descent = self.metrics(size, bold)
+        if anchor[1] == "a":
+            y += ascent
+        elif anchor[1] == "m":
+            y += (ascent - descent) / 2
+        for char in text:
+            mask, left, top, advance = self.glyph(size, bold, char)
+            if mask is not None:
+                image.paste(fill, (round(x + left), round(y + top)), mask)
+            x += advance
+
+
+class NativeReportRenderer:
+    """用 Pillow 绘制报告图片"""
+
+    WIDTH = 1200
+    MARGIN = 30             # 图片边缘到卡片
+    PADDING = 50            # 卡片内边距
+    HEADER_HEIGHT = 190
+    STATS_HEIGHT = 240       # 概览（含标题）
+    SECTION_TITLE_HEIGHT = 80
+    ITEM_HEIGHT = 56
+    ITEM_GAP = 18
+    FOOTER_HEIGHT = 64
+    MAX_FILES = 200         # 输出目录最多保留的图片数量（渲染缓存命中时会检查文件是否仍存在）
+    JPEG_QUALITY = 90
+
+    def __init__(self, output_dir: str, font_path: str = "", items_per_image: int = 20):
+        # 未安装 Pillow 时抛出 ImportError，由调用方回退
+        from PIL import Image, ImageDraw, ImageFont
+
+        self._image, self._draw = Image, ImageDraw
+        self.output_dir = output_dir
+        self.items_per_image = max(1, items_per_image)
+        os.makedirs(output_dir, exist_ok=True)
+
+        regular, bold = self._find_fonts(font_path)
+        if regular is None:
+            logger.warning("没有找到中文字体，原生渲染的报告中文可能无法显示；可把字体放到 assets/fonts 或配置 render_font_path")
+        else:
+            logger.info(f"原生渲染使用字体: {regular}" + (f"，粗体: {bold}" if bold and bold != regular else ""))
+        self.glyphs = GlyphCache(Image, ImageFont, ImageDraw, regular, bold)
+        self._gradients: dict[tuple, object] = {}     # (宽, 高, 起始色, 结束色) → 渐变条
+        self._lock = threading.Lock()     # FreeType 字体对象不在多个线程间同时使用
+
+    @staticmethod
+    def _find_fonts(font_path: str) -> tuple[Optional[str], Optional[str]]:
+        """
+        返回 (常规字体, 粗体字体)：依次使用配置的字体、assets/fonts 下的字体、系统中文字体
+        woff2 需要 FreeType 支持 brotli，不使用
+        """
+        if font_path and os.path.exists(font_path):
+            return font_path, font_path
+        files = {
+            weight: path for weight, path in find_font_files().items()
+            if not path.endswith(".woff2")
+        }
+        if files:
+            regular_weight = min(files, key=lambda weight: abs(weight - 400))
+            bold_weight = min(files, key=lambda weight: abs(weight - 700))
+            return files[regular_weight], files[bold_weight]
+        for path in SYSTEM_FONTS:
+            if os.path.exists(path):
+                return path, path
+        return None, None
+
+    ###### 输出 ######
+
+    def render(
+        self,
+        report_time: str,
+        section_title: str,
+        notices: list[dict],
+        start: int = 1,
+        stats: Optional[list[tuple[str, str]]] = None,
+        message: str = "",
+    ) -> list[str]:
+        """
+        绘制报告，返回图片文件路径列表（每张最多 items_per_image 条通知）
+        参数：
+        report_time: 报告生成时间
+        section_title: 列表标题
+        notices: 通知列表（字典格式），序号从 start 开始
+        stats: 概览卡片 [(数值, 说明)]，为 None 时不绘制概览
+        message: 列表为空时显示的提示
+        """
+        chunks = [
+            notices[i:i + self.items_per_image] for i in range(0, len(notices), self.items_per_image)
+        ] or [[]]
+        paths = []
+        for index, chunk in enumerate(chunks):
+            title = section_title if len(chunks) == 1 else f"{section_title}（{index + 1}/{len(chunks)}）"
+            key = repr((report_time, title, stats if index == 0 else None, message, start,
+                        [(notice["时间"], notice["标题"]) for notice in chunk]))
+            path = os.path.join(self.output_dir, f"report_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.jpg")
+            if not os.path.exists(path):
+                with self._lock:
+                    image = self._draw_page(
+                        report_time, title, chunk, start + index * self.items_per_image,
+                        stats if index == 0 else None, message, last=index == len(chunks) - 1,
+                    )
+                tmp_path = path + ".tmp"
+                image.save(tmp_path, "JPEG", quality=self.JPEG_QUALITY, subsampling=0)
+                os.replace(tmp_path, path)
+            paths.append(os.path.abspath(path))
+        self._prune()
+        return paths
+
+    def _prune(self):
+        """输出目录超过上限时删除最早生成的图片"""
+        try:
+            files = [entry for entry in os.scandir(self.output_dir) if entry.name.endswith(".jpg")]
+            if len(files) <= self.MAX_FILES:
+                return
+            files.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in files[:len(files) - self.MAX_FILES]:
+                os.remove(entry.path)
+        except OSError as e:
+            logger.warning(f"清理报告图片目录失败: {str(e)}")
+
+    ###### 绘制 ######
+
+    def _page_height(self, items: int, stats: bool, message: bool) -> int:
+        list_height = items * (self.ITEM_HEIGHT + self.ITEM_GAP) - (self.ITEM_GAP if items else 0)
+        if message:
+            list_height = max(list_height, self.ITEM_HEIGHT)
+        return (
+            self.MARGIN * 2 + self.HEADER_HEIGHT + self.PADDING * 2
+            + (self.STATS_HEIGHT if stats else 0) + self.SECTION_TITLE_HEIGHT + list_height
+            + self.FOOTER_HEIGHT
+        )
+
+    def _gradient(self, width: int, height: int, start: tuple, end: tuple):
+        """水平渐变条（结果缓存，每种尺寸只生成一次）"""
+        key = (width, height, start, end)
+        gradient = self._gradients.get(key)
+        if gradient is None:
+            strip = self._image.new("RGB", (width, 1))
+            strip.putdata([
+                tuple(int(start[c] + (end[c] - start[c]) * x / max(width - 1, 1)) for c in range(3))
+                for x in range(width)
+            ])
+            gradient = self._gradients[key] = strip.resize((width, height))
+        return gradient
+
+    def _text(self, image, xy, text, size, fill, bold=False, anchor="la"):
+        self.glyphs.draw(image, xy, text, size, fill, bold, anchor)
+
+    def _draw_page(self, report_time, section_title, notices, start, stats, message, last):
+        glyphs = self.glyphs
+        height = self._page_height(len(notices), stats is not None, not notices)
+        image = self._image.new("RGB", (self.WIDTH, height), BACKGROUND)
+        draw = self._draw.Draw(image)
+
+        left, right = self.MARGIN, self.WIDTH - self.MARGIN
+        draw.rounded_rectangle((left, self.MARGIN, right, height - self.MARGIN), radius=20, fill=WHITE)
+
+        # 标题栏
+        image.paste(self._gradient(right - left, self.HEADER_HEIGHT, HEADER_START, PRIMARY), (left, self.MARGIN))
+        center = self.WIDTH // 2
+        self._text(image, (center, self.MARGIN + 85), "中南大学创新竞赛通知报告", 44, WHITE, bold=True, anchor="mm")
+        self._text(image, (center, self.MARGIN + 140), f"报告生成时间：{report_time}", 22, WHITE, anchor="mm")
+
+        x0, x1 = left + self.PADDING, right - self.PADDING
+        y = self.MARGIN + self.HEADER_HEIGHT + self.PADDING
+
+        # 概览卡片
+        if stats is not None:
+            y = self._draw_section_title(image, draw, x0, x1, y, "报告概览")
+            gap = 25
+            card_width = (x1 - x0 - gap * (len(stats) - 1)) / len(stats)
+            for i, (value, label) in enumerate(stats):
+                cx = x0 + i * (card_width + gap)
+                draw.rounded_rectangle((cx, y, cx + card_width, y + 130), radius=15, fill=CARD, outline=CARD_BORDER)
+                value = glyphs.truncate(str(value), 40, card_width - 20, bold=True)
+                self._text(image, (cx + card_width / 2, y + 52), value, 40, PRIMARY_DARK, bold=True, anchor="mm")
+                self._text(image, (cx + card_width / 2, y + 100), label, 18, PRIMARY, anchor="mm")
+            y += self.STATS_HEIGHT - self.SECTION_TITLE_HEIGHT
+
+        # 通知列表
+        y = self._draw_section_title(image, draw, x0, x1, y, section_title)
+        if not notices:
+            self._text(image, (x0, y + self.ITEM_HEIGHT / 2), message or "暂无通知", 20, MUTED, anchor="lm")
+        for i, notice in enumerate(notices, start):
+            self._draw_item(image, draw, x0, x1, y, i, notice)
+            y += self.ITEM_HEIGHT + self.ITEM_GAP
+
+        # 页脚
+        footer_top = height - self.MARGIN - self.FOOTER_HEIGHT
+        image.paste(self._gradient(right - left, self.FOOTER_HEIGHT, PRIMARY_DARK, PRIMARY), (left, footer_top))
+        footer = "数据来源：中南大学创新创业学院" if last else "（续下一张）"
+        self._text(image, (center, footer_top + self.FOOTER_HEIGHT / 2), footer, 18, WHITE, anchor="mm")
+        return image
+
+    def _draw_section_title(self, image, draw, x0, x1, y, title) -> int:
+        draw.ellipse((x0, y, x0 + 40, y + 40), fill=PRIMARY)
+        title = self.glyphs.truncate(title, 30, x1 - x0 - 60, bold=True)
+        self._text(image, (x0 + 56, y + 20), title, 30, PRIMARY_DARK, bold=True, anchor="lm")
+        draw.line((x0, y + 55, x1, y + 55), fill=DIVIDER, width=3)
+        return y + self.SECTION_TITLE_HEIGHT
+
+    def _draw_item(self, image, draw, x0, x1, y, number, notice):
+        glyphs = self.glyphs
+        draw.rounded_rectangle((x0, y, x1, y + self.ITEM_HEIGHT), radius=12, fill=WHITE, outline=DIVIDER)
+        draw.rectangle((x0, y, x0 + 4, y + self.ITEM_HEIGHT), fill=PRIMARY)
+        middle = y + self.ITEM_HEIGHT / 2
+
+        draw.ellipse((x0 + 22, middle - 14, x0 + 50, middle + 14), fill=PRIMARY)
+        self._text(image, (x0 + 36, middle), str(number), 15 if number < 100 else 12, WHITE, anchor="mm")
+
+        date = notice["时间"]
+        date_width = glyphs.width(date, 17)
+        self._text(image, (x1 - 22, middle), date, 17, MUTED, anchor="rm")
+
+        title_left = x0 + 62
+        title = glyphs.truncate(notice["标题"], 18, x1 - 22 - date_width - 12 - title_left, bold=True)
+        self._text(image, (title_left, middle), title, 18, PRIMARY_DARK, bold=True, anchor="lm")
@@ -0,0 +1,57 @@
+"""
+报告图片渲染缓存模块
+浏览器渲染是查询链路中最耗时的一步，相同内容的报告直接复用之前生成的图片
+缓存按容量（LRU）和存活时间淘汰，通知存储发生变化时整体失效
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class RenderCache:
+    """渲染结果缓存（键 → 图片URL/文件路径列表）"""
+
+    def __init__(self, max_entries: int = 32, ttl: float = 600):
+        self.max_entries = max_entries      # 最多缓存的图片数量
+        self.ttl = ttl                      # 缓存存活时间（秒）
+        self._entries: OrderedDict = OrderedDict()   # key → (生成时间, 图片)
+        self._lock = threading.Lock()       # 失效回调可能来自工作线程
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[list[str]]:
+        """获取缓存的图片，不存在或已过期时返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, images: list[str]):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), images)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        """移除一个条目（如缓存的图片文件已被清理）"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, *_):
+        """清空缓存（可直接作为存储变更回调使用）"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
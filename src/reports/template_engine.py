@@ -0,0 +1,145 @@
+"""
+模板引擎模块
+- 页面模板由公共样式表与若干片段（头部、概览、列表、页脚）拼装，首次使用时压缩一次并缓存，
+  其中的 {{ }} 占位符仍交给 AstrBot 的渲染服务填充
+- 片段模板（如单条通知）在本地渲染：编译为字面量与字段交替的列表，渲染时只做转义与拼接
+- 片段缓存按行内容缓存已代入的片段，生成列表时只需拼接，重复出现的通知不再重新生成
+"""
+
+import re
+import html
+from operator import itemgetter
+from collections import OrderedDict
+from typing import Iterable, Mapping
+
+
+_FIELD = re.compile(r"\{\{\s*(\w+)\s*(\|\s*safe\s*)?\}\}")
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.S)
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+
+def compile_page(*parts: str) -> str:
+    """拼接页面片段，去掉注释、缩进与空行（保留换行，不影响行内元素间的空白）"""
+    source = _CSS_COMMENT.sub("", _HTML_COMMENT.sub("", "".join(parts)))
+    return "\n".join(line.strip() for line in source.splitlines() if line.strip())
+
+
+class FragmentTemplate:
+    """
+    本地渲染的片段模板
+    支持 {{ 字段 }}（HTML转义）与 {{ 字段 | safe }}（原样输出）
+    """
+
+    def __init__(self, source: str):
+        # 偶数位置为字面量，奇数位置为 (字段名, 是否转义)
+        parts = []
+        pos = 0
+        for match in _FIELD.finditer(source):
+            parts.append(source[pos:match.start()])
+            parts.append((match.group(1), not match.group(2)))
+            pos = match.end()
+        parts.append(source[pos:])
+        self.parts = parts
+
+    @classmethod
+    def _from_parts(cls, parts: list) -> "FragmentTemplate":
+        template = cls.__new__(cls)
+        template.parts = parts
+        return template
+
+    @property
+    def fields(self) -> set[str]:
+        return {name for name, _ in self.parts[1::2]}
+
+    @staticmethod
+    def _format(value, escape: bool) -> str:
+        if isinstance(value, int):
+            return str(value)
+        return html.escape(str(value)) if escape else str(value)
+
+    def bind(self, values: Mapping) -> "FragmentTemplate":
+        """代入部分字段，返回只剩其余字段的模板（相邻字面量合并）"""
+        parts = [self.parts[0]]
+        for i in range(1, len(self.parts), 2):
+            name, escape = self.parts[i]
+            if name in values:
+                parts[-1] += self._format(values[name], escape) + self.parts[i + 1]
+            else:
+                parts.append(self.parts[i])
+                parts.append(self.parts[i + 1])
+        return self._from_parts(parts)
+
+    def render(self, values: Mapping) -> str:
+        """代入全部字段"""
+        parts = self.parts
+        if len(parts) == 3:
+            # 只剩一个字段（如片段缓存中只剩序号）时直接拼接
+            name, escape = parts[1]
+            return parts[0] + self._format(values[name], escape) + parts[2]
+        chunks = [parts[0]]
+        for i in range(1, len(parts), 2):
+            name, escape = parts[i]
+            chunks.append(self._format(values[name], escape))
+            chunks.append(parts[i + 1])
+        return "".join(chunks)
+
+
+class FragmentCache:
+    """
+    片段缓存：按 key_fields 的值缓存已代入这些字段的片段（LRU）
+    其余字段（如序号）在每次渲染时代入
+    """
+
+    def __init__(self, template: FragmentTemplate, key_fields: tuple[str, ...], max_entries: int = 2048):
+        self.template = template
+        self.key_fields = key_fields
+        self._key = itemgetter(*key_fields)
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()     # 行内容 → 已代入的片段模板
+        self.hits = 0
+        self.misses = 0
+
+    def _bound(self, row: Mapping) -> FragmentTemplate:
+        """取已代入该行内容的片段，未缓存时代入并写入缓存"""
+        key = self._key(row)
+        bound = self._entries.get(key)
+        if bound is None:
+            self.misses += 1
+            bound = self.template.bind({field: row[field] for field in self.key_fields})
+            if self.max_entries > 0:
+                self._entries[key] = bound
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return bound
+
+    def render(self, row: Mapping, **extra) -> str:
+        """渲染一行，extra 为不参与缓存的字段"""
+        return self._bound(row).render(extra)
+
+    def render_list(self, rows: Iterable[Mapping], start: int = 1) -> str:
+        """渲染多行并拼接，序号（number）从 start 开始"""
+        entries, key_of = self._entries, self._key
+        chunks = []
+        for i, row in enumerate(rows, start):
+            key = key_of(row)
+            bound = entries.get(key)
+            if bound is None:
+                bound = self._bound(row)
+            else:
+                self.hits += 1
+                entries.move_to_end(key)
+            if len(bound.parts) == 3 and bound.parts[1][0] == "number":
+                # 常见情况：缓存的片段只剩序号，直接拼接前后两段
+                chunks += (bound.parts[0], str(i), bound.parts[2])
+            else:
+                chunks.append(bound.render({"number": i}))
+        return "".join(chunks)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
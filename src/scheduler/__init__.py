@@ -4,5 +4,17 @@
 """
 
 from .auto_scheduler import AutoScheduler
+from .delivery import GroupMessageDispatcher, TokenBucket
+from .job_scheduler import JobScheduler, Job, CronTrigger, IntervalTrigger
+from .group_tasks import GroupTaskExecutor
 
-__all__ = ["AutoScheduler"]
\ No newline at end of file
+__all__ = [
+    "AutoScheduler",
+    "GroupMessageDispatcher",
+    "TokenBucket",
+    "JobScheduler",
+    "Job",
+    "CronTrigger",
+    "IntervalTrigger",
+    "GroupTaskExecutor",
+]
@@ -1,61 +0,0 @@
-"""
-命令调度器
-正在重构中...
-目标：支持多群独立配置调用
-
-目前弃用
-准备重构为crop来调用
-"""
-
-# 标准库
-from functools import wraps
-import traceback
-from typing import List, Tuple
-from datetime import datetime
-
-# 三方库
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
-
-
-
-# 本地模块
-from astrbot.api import logger
-from ..config import Config
-
-def scheduler_error_handler(func):
-    """
-    调度器错误处理装饰器
-    用于捕获调度器执行过程中的异常并进行处理
-    """
-
-    @wraps
-    async def wrapper(self, *args, **kwargs):
-        try:
-            return await func(self, *args, **kwargs)
-        except Exception as e:
-            logger.error(f"调度器{func.__name__}执行出错: {str(e)}")
-            # 这里可以添加更详细的错误处理逻辑，比如通知管理员等
-            logger.error(traceback.format_exc())
-            return None
-    
-    return wrapper
-
-class Scheduler:
-    """
-    命令调度器
-    正在重构中...
-    目标：支持多群独立配置调用
-    """
-
-    def __init__(self, config: Config):
-        self.task_queue: List[Tuple[datetime, str]] = []
-        self.config = config
-
-    def update_task_queue(self) -> None:
-        """
-        更新任务队列
-        """
-
-        # 清空当前队列
-        self.task_queue = []
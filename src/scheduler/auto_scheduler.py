@@ -4,17 +4,27 @@
 两种模式：
 一种是每日固定时候执行
 另一种是固定时间间隔执行
+推送任务注册在 JobScheduler 中，执行后若配置有变化则自动改期
+各群组独立的推送任务由 GroupTaskExecutor 注册到同一个调度器
+已配置独立通知推送任务的群只按自己的任务推送，全局推送跳过这些群，同一批通知不会收到两次
 """
 
 
+import os
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime
 from astrbot.api import logger
+from .delivery import GroupMessageDispatcher, image_segment
+from .job_scheduler import JobScheduler, CronTrigger, IntervalTrigger
+from .group_tasks import GroupTaskExecutor
 
 
 class AutoScheduler:
     """自动调度器"""
 
+    PUSH_JOB_ID = "notice_push"     # 全局通知推送任务
+    NOTICE_TASK = "notice"          # 群组推送任务中表示通知推送的任务名
+
     def __init__(
         self,
         config_manager,
@@ -22,14 +32,34 @@ class AutoScheduler:
         ReportGenerator,
         html_render_func,
         bot_manager,
+        notice_refresh,
+        group_config=None,
         ):
         self.bot_manager = bot_manager
         self.config_manager = config_manager
         self.NoticeDataHandler = NoticeDataHandler
         self.ReportGenerator = ReportGenerator
         self.html_render_func = html_render_func
-
-        self.target_time = None
+        # 通知刷新与渲染经由协调器，与手动更新命令共享进行中的结果
+        self.notice_refresh = notice_refresh
+        self.dispatcher = GroupMessageDispatcher(bot_manager, config_manager)
+        # 所有定时任务共用一个调度器（由单个协程驱动）
+        self.jobs = JobScheduler()
+
+        # 群组独立的推送任务（group_config.json 中的 push_tasks）
+        self.group_tasks = None
+        if group_config is not None:
+            self.group_tasks = GroupTaskExecutor(
+                group_config, self.jobs, os.path.join(config_manager.get_storage_root(), "group_push_state.json")
+            )
+            self.group_tasks.register_handler(self.NOTICE_TASK, self._push_group_notices)
+            # 刷新（定时推送或更新命令）得到的新增通知进入各会话的待推送队列，回填的历史通知不进入
+            notice_refresh.add_update_listener(
+                lambda notices: self.group_tasks.enqueue(self.NOTICE_TASK, notices)
+            )
+
+        self.mode = config_manager.get_mode()
+        self._settings = None
     
     def _get_platform_id(self):
         """获取平台ID"""
@@ -55,15 +85,17 @@ class AutoScheduler:
 
         await asyncio.sleep(1)  # 等待1秒，确保配置加载完成
 
-
-
-        self.scheduler_task = asyncio.create_task(self._scheduler_loop())
+        self.mode = self.config_manager.get_mode()
+        self.jobs.start()
+        self._schedule_push_job()
+        if self.group_tasks is not None:
+            self.group_tasks.start()
         logger.info("定时任务调度器已启动")
 
     async def stop_scheduler(self):
         """停止自动调度器"""
-        if self.scheduler_task:
-            self.scheduler_task.cancel()
+        if self.jobs.running:
+            await self.jobs.stop()
             logger.info("定时任务调度器已停止")
 
     async def restart_scheduler(self):
@@ -72,53 +104,45 @@ class AutoScheduler:
         await self.start_scheduler()
         logger.info("定时任务调度器已重启")
 
-    async def _scheduler_loop(self):
-        """定时任务循环"""
-        while True:
-
-            try:
-                self.mode = self.config_manager.get_mode()
-                now = datetime.now()
-
-                
-                if self.mode == "daily":
-                    target_time = datetime.strptime(
-                        self.config_manager.get_push_time(),
-                        "%H:%M"
-                    ).replace(year=now.year, month=now.month, day=now.day)
-
-                elif self.mode == "interval":
-                    target_time = now + timedelta(
-                        seconds=self.config_manager.get_push_interval()
-                    )
-
-                else:
-                    logger.error(f"未知的调度模式：{self.mode}, 已切换为默认模式：daily")
-                    self.mode = "daily"
-                    continue
-
-                # 若今天目标时间已过，设置为下一个周期
-                if now > target_time:
-                    if self.mode == "daily":
-                        target_time += timedelta(days=1)
-                    elif self.mode == "interval":
-                        target_time += timedelta(
-                            minutes=self.config_manager.get_push_interval()
-                        )
-
-                wait_time = (target_time - now).total_seconds()
-                self.target_time = target_time
-                logger.info(
-                    f"推送任务将在 {wait_time:.2f} 秒后，直到 {target_time.strftime('%Y-%m-%d %H:%M:%S')}"
-                )
-                await asyncio.sleep(wait_time)
-
-                # 开始推送
-                await self._push_notices()
-            
-            except Exception as e:
-                logger.error(f"推送通知时出错: {str(e)}")
-                continue
+    def _build_trigger(self, mode: str):
+        """根据调度模式构造推送任务的触发器"""
+        if mode == "interval":
+            return IntervalTrigger(seconds=self.config_manager.get_push_interval())
+        push_time = datetime.strptime(self.config_manager.get_push_time(), "%H:%M")
+        return CronTrigger(f"{push_time.minute} {push_time.hour} * * *")
+
+    def _push_settings(self) -> tuple:
+        """影响推送时间的配置项"""
+        return (
+            self.mode,
+            self.config_manager.get_push_time(),
+            self.config_manager.get_push_interval(),
+        )
+
+    def _schedule_push_job(self):
+        """按当前配置注册（或改期）全局推送任务"""
+        try:
+            if self.mode not in ("daily", "interval"):
+                logger.error(f"未知的调度模式：{self.mode}, 已切换为默认模式：daily")
+                self.mode = "daily"
+            trigger = self._build_trigger(self.mode)
+        except ValueError as e:
+            logger.error(f"推送时间配置无效: {str(e)}")
+            return
+
+        if self.PUSH_JOB_ID in self.jobs:
+            job = self.jobs.reschedule(self.PUSH_JOB_ID, trigger)
+        else:
+            job = self.jobs.add_job(self.PUSH_JOB_ID, trigger, self._run_push_job)
+        self._settings = self._push_settings()
+        logger.info(f"推送任务（{trigger}）将在 {job.next_run.strftime('%Y-%m-%d %H:%M:%S')} 执行")
+
+    async def _run_push_job(self):
+        """全局推送任务：推送后检查配置是否变化，变化时改期"""
+        await self._push_notices()
+        self.mode = self.config_manager.get_mode()
+        if self._push_settings() != self._settings:
+            self._schedule_push_job()
 
     async def _push_notices(self):
         """推送通知 - 通知所有群聊"""
@@ -126,70 +150,57 @@ class AutoScheduler:
             logger.info("开始推送通知")
 
             enabled_groups = self.config_manager.get_enabled_groups()
+            if self.group_tasks is not None:
+                # 有独立通知推送任务的群由各自的任务推送（新增通知已进入其队列）
+                own_task = self.group_tasks.sessions_of(self.NOTICE_TASK)
+                enabled_groups = [group_id for group_id in enabled_groups if str(group_id) not in own_task]
             if not enabled_groups:
-                logger.warning("没有启用的群聊，跳过推送")
+                logger.warning("没有需要全局推送的群聊，跳过推送")
                 return
             
             logger.info(f"将通知 {len(enabled_groups)} 个群聊: {enabled_groups}")
 
-            # 1.从url获取内容
-            html_content = await self.NoticeDataHandler.fetch_url_content(self.config_manager.get_url())
-            if not html_content:
-                logger.error("获取HTML内容失败，跳过推送")
-                return
-            
-            # 2.解析，写入本地
-            notices = self.NoticeDataHandler.parse_notices(html_content)
-            if not notices:
-                logger.error("解析通知失败，跳过推送")
-                return
-            new_notices = self.NoticeDataHandler.save_notices(notices)
+            new_notices = await self._refresh_notices()
             if not new_notices:
-                logger.info("没有新的通知，跳过推送")
                 return
-            
-            # 3.生成新增通知的报告
-            image_url = await self.ReportGenerator.generate_new_image_report(self.html_render_func, new_notices)
-            if not image_url:
-                logger.error("生成报告失败，跳过推送")
-                return
-
-            for group_id in enabled_groups:
-                try:
-                    bot_instance = self.bot_manager.get_bot_instance()
-                    if not bot_instance:
-                        logger.error("获取机器人实例失败，跳过推送")
-                        return
-                    
-
-                    await bot_instance.api.call_action(
-                        action="send_group_msg",
-                        group_id=group_id,
-                        message=[
-                            {"type": "image", "data": {"url": image_url}}
-                            ]
-                        )
-                    
-                    notice_link = ""
-                    for notice in new_notices:
-                        notice_link += notice["标题"] + ": " + notice["链接"] + "\n"
-
-                    await bot_instance.api.call_action(
-                        action="send_group_msg",
-                        group_id=group_id,
-                        message=[
-                            {"type": "text", "data": {"text": f"新增通知链接：\n{notice_link}"}}
-                            ]
-                        )
-
-                except Exception as e:
-                    logger.error(f"发送通知到群聊 {group_id} 失败: {str(e)}")
-                    continue
+            await self._deliver_notices(enabled_groups, new_notices)
 
         except Exception as e:
             logger.error(f"推送通知时出错: {str(e)}")
             return
 
+    async def _push_group_notices(self, session_ids: list[str]):
+        """群组推送任务 notice：刷新一次通知，再把各会话排队的新增通知发出（内容相同的会话共用一份报告）"""
+        try:
+            await self._refresh_notices()
+            for notices, sessions in self.group_tasks.take_pending(self.NOTICE_TASK, session_ids, key="链接"):
+                await self._deliver_notices(sessions, notices)
+        except Exception as e:
+            logger.error(f"执行群组通知推送任务时出错: {str(e)}")
+
+    async def _refresh_notices(self) -> list[dict]:
+        """获取并保存最新通知（与更新命令共享进行中的刷新），返回新增通知"""
+        result = await self.notice_refresh.refresh()
+        if not result.new_notices:
+            logger.info("没有新的通知，跳过推送")
+        return result.new_notices
+
+    async def _deliver_notices(self, group_ids: list, new_notices: list[dict]):
+        """生成新增通知的报告并投递到这些群聊"""
+        # 3.生成新增通知的报告（同一批通知只渲染一次，原生渲染时可能有多张图片）
+        images = await self.notice_refresh.render_new(new_notices)
+        if not images:
+            logger.error("生成报告失败，跳过推送")
+            return
+
+        # 4.消息只构建一次，并发投递到所有群聊
+        notice_link = ""
+        for notice in new_notices:
+            notice_link += notice["标题"] + ": " + notice["链接"] + "\n"
+        messages = [[image_segment(image)] for image in images]
+        messages.append([{"type": "text", "data": {"text": f"新增通知链接：\n{notice_link}"}}])
+        await self.dispatcher.dispatch(group_ids, messages)
+
 
 
     # 接口
@@ -201,6 +212,8 @@ class AutoScheduler:
         """
         self.mode = mode
         logger.info(f"设置调度模式为：{mode}")
+        if self.jobs.running:
+            self._schedule_push_job()
 
     def get_next_execution_time(self):
         """
@@ -208,7 +221,8 @@ class AutoScheduler:
         返回：
         str: 下一次执行时间的字符串表示，格式为 "YYYY-MM-DD HH:MM:SS"
         """
-        if self.target_time:
-            return self.target_time.strftime("%Y-%m-%d %H:%M:%S")
+        job = self.jobs.get_job(self.PUSH_JOB_ID)
+        if job and job.next_run:
+            return job.next_run.strftime("%Y-%m-%d %H:%M:%S")
         else:
             return "未设置"
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+群消息投递模块
+并发向多个群聊发送同一份消息，令牌桶限制整体发送速率，失败时按群重试
+"""
+
+import time
+import base64
+import asyncio
+
+from astrbot.api import logger
+
+
+def image_segment(image: str) -> dict:
+    """图片消息段：网络图片直接传URL，本地文件（原生渲染的报告）以base64传输，协议端不必与插件在同一台机器上"""
+    if image.startswith(("http://", "https://")):
+        return {"type": "image", "data": {"url": image}}
+    with open(image, "rb") as f:
+        return {"type": "image", "data": {"file": "base64://" + base64.b64encode(f.read()).decode("ascii")}}
+
+
+class TokenBucket:
+    """令牌桶限速器：平均每秒 rate 个令牌，最多积攒 capacity 个"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """获取一个令牌，令牌不足时等待"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class GroupMessageDispatcher:
+    """群消息投递器"""
+
+    def __init__(self, bot_manager, config_manager):
+        self.bot_manager = bot_manager
+        self.concurrency = config_manager.get_send_concurrency()    # 同时投递的群数量
+        self.retries = config_manager.get_send_retries()            # 单条消息失败后的重试次数
+        self.retry_delay = 1.0                                      # 首次重试等待（秒），之后翻倍
+        self.bucket = TokenBucket(
+            rate=config_manager.get_send_rate(),                    # 每秒最多发送的消息数
+            capacity=config_manager.get_send_burst(),               # 允许的突发消息数
+        )
+        # 各群累计投递统计：{group_id: {"deliveries", "failures", "last_latency"}}
+        self.stats = {}
+
+    async def _send_with_retry(self, bot_instance, group_id, message: list[dict]):
+        """发送单条消息，失败后指数退避重试"""
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            try:
+                await bot_instance.api.call_action(
+                    action="send_group_msg",
+                    group_id=group_id,
+                    message=message,
+                )
+                return
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"发送消息到群聊 {group_id} 失败（第{attempt + 1}次）: {str(e)}，{delay:.0f}秒后重试")
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def _deliver_group(self, bot_instance, group_id, messages: list[list[dict]], semaphore) -> dict:
+        """按顺序向单个群发送所有消息"""
+        async with semaphore:
+            start = time.perf_counter()
+            result = {"ok": True, "latency": 0.0, "error": ""}
+            try:
+                for message in messages:
+                    await self._send_with_retry(bot_instance, group_id, message)
+            except Exception as e:
+                result["ok"] = False
+                result["error"] = str(e)
+                logger.error(f"发送通知到群聊 {group_id} 失败: {str(e)}")
+            result["latency"] = round(time.perf_counter() - start, 3)
+
+        stats = self.stats.setdefault(str(group_id), {"deliveries": 0, "failures": 0, "last_latency": 0.0})
+        stats["deliveries"] += 1
+        stats["failures"] += 0 if result["ok"] else 1
+        stats["last_latency"] = result["latency"]
+        return result
+
+    async def dispatch(self, group_ids: list, messages: list[list[dict]]) -> dict:
+        """
+        向所有群发送同一组消息（每个元素是一条消息的消息段列表）
+        返回：{"sent": 成功群数, "failed": 失败群数, "groups": {group_id: {"ok", "latency", "error"}}}
+        """
+        bot_instance = self.bot_manager.get_bot_instance()
+        if not bot_instance:
+            logger.error("获取机器人实例失败，跳过推送")
+            return {"sent": 0, "failed": len(group_ids), "groups": {}}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._deliver_group(bot_instance, group_id, messages, semaphore) for group_id in group_ids)
+        )
+        groups = dict(zip(group_ids, results))
+        sent = sum(1 for result in results if result["ok"])
+        latencies = ", ".join(f"{group_id}={result['latency']}s" for group_id, result in groups.items())
+        logger.info(f"通知投递完成，成功 {sent} 个群，失败 {len(group_ids) - sent} 个群，各群耗时: {latencies}")
+        return {"sent": sent, "failed": len(group_ids) - sent, "groups": groups}
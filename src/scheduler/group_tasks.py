@@ -0,0 +1,228 @@
+"""
+群组推送任务执行器
+把 group_config.json 中各会话的推送任务（push_tasks）注册到 JobScheduler：
+- 任务名（script_path）与 cron 表达式都相同的会话共用一个调度任务
+- 同一时刻触发的任务（即使 cron 表达式不同）在一个很短的窗口内合并成一批，
+  由任务处理函数一次性完成爬取、渲染，再分发给这一批的所有会话
+- 配置通过 GroupConfigManager 写入时立即重新加载，手动修改文件时由定期检查发现
+- 每个会话待推送的内容（如新增通知）单独排队并持久化，到各自的推送时间再发送
+"""
+
+import os
+import json
+import asyncio
+import threading
+from typing import Awaitable, Callable, Iterable
+
+from astrbot.api import logger
+from .job_scheduler import JobScheduler, CronTrigger, IntervalTrigger
+
+
+class GroupTaskExecutor:
+    """群组推送任务执行器"""
+
+    JOB_PREFIX = "group_task"
+    RELOAD_JOB_ID = "group_task_reload"
+    BATCH_WINDOW = 1.0          # 合并同一时刻触发任务的等待窗口（秒）
+    RELOAD_INTERVAL = 30        # 检查配置文件是否被手动修改的间隔（秒）
+    MAX_PENDING = 100           # 每个会话每种任务最多排队的条目数
+
+    def __init__(self, group_config, jobs: JobScheduler, state_path: str):
+        self.group_config = group_config
+        self.jobs = jobs
+        self.state_path = state_path
+        # 任务名 → 处理函数 handler(会话ID列表)
+        self._handlers: dict[str, Callable[[list[str]], Awaitable]] = {}
+        # 调度任务ID → 共用该任务的会话ID列表
+        self._job_sessions: dict[str, list[str]] = {}
+        # 任务名 → 当前窗口内已触发、尚未执行的会话
+        self._batches: dict[str, set[str]] = {}
+        self._disabled_sessions: set[str] = set()
+        self._config_mtime = None
+        # 待推送内容 {会话ID: {任务名: [条目, ...]}}，可能在工作线程中写入
+        self._pending_lock = threading.Lock()
+        self._pending: dict[str, dict[str, list]] = self._load_pending()
+
+        group_config.add_change_listener(self.reload)
+
+    def register_handler(self, task_name: str, handler: Callable[[list[str]], Awaitable]):
+        """注册任务处理函数，参数为本批需要推送的会话ID列表"""
+        self._handlers[task_name] = handler
+
+    ###### 加载配置 ######
+
+    def start(self):
+        """加载配置并开始定期检查配置文件"""
+        self.reload()
+        self.jobs.add_job(self.RELOAD_JOB_ID, IntervalTrigger(self.RELOAD_INTERVAL), self._check_config_file)
+
+    def _job_id(self, task_name: str, cron_expr: str) -> str:
+        return f"{self.JOB_PREFIX}:{task_name}:{cron_expr}"
+
+    def reload(self):
+        """按当前群组配置同步调度任务，只增删有变化的部分"""
+        settings = self.group_config.load_all()
+        self._config_mtime = self._stat_config()
+
+        wanted: dict[str, tuple[str, str, list[str]]] = {}    # 调度任务ID → (任务名, cron, 会话列表)
+        disabled = set()
+        for session_id, group_settings in settings.items():
+            if group_settings.get("pushing") is False:
+                disabled.add(session_id)
+            for task in group_settings.get("push_tasks", []):
+                if not task.get("enabled", True):
+                    continue
+                task_name, cron_expr = task.get("script_path", ""), task.get("cron_expr", "")
+                if task_name not in self._handlers:
+                    logger.warning(f"群组 {session_id} 的推送任务 {task_name} 没有对应的处理函数，已忽略")
+                    continue
+                job_id = self._job_id(task_name, cron_expr)
+                wanted.setdefault(job_id, (task_name, cron_expr, []))[2].append(session_id)
+        self._disabled_sessions = disabled
+
+        job_sessions = {}
+        for job_id, (task_name, cron_expr, sessions) in wanted.items():
+            if job_id not in self._job_sessions:
+                try:
+                    trigger = CronTrigger(cron_expr)
+                except ValueError as e:
+                    logger.error(f"推送任务 {task_name} 的cron表达式无效，已忽略: {str(e)}")
+                    continue
+                self.jobs.add_job(job_id, trigger, self._on_fire, task_name, job_id)
+            # 已存在的调度任务只更新会话列表
+            job_sessions[job_id] = sorted(sessions)
+        for job_id in self._job_sessions:
+            if job_id not in job_sessions:
+                self.jobs.remove_job(job_id)
+        # 整体替换，工作线程中的 enqueue 不会读到修改了一半的字典
+        self._job_sessions = job_sessions
+
+        self._prune_pending()
+        logger.info(f"已加载群组推送任务：{len(self._job_sessions)} 个调度任务，"
+                    f"{sum(len(sessions) for sessions in self._job_sessions.values())} 个会话")
+
+    def _stat_config(self):
+        try:
+            return os.stat(self.group_config.storage_group_config).st_mtime_ns
+        except OSError:
+            return None
+
+    async def _check_config_file(self):
+        if self._stat_config() != self._config_mtime:
+            logger.info("群组配置文件已变化，重新加载推送任务")
+            self.reload()
+
+    ###### 执行 ######
+
+    async def _on_fire(self, task_name: str, job_id: str):
+        """
+        调度任务触发：把会话加入该任务名的当前批次
+        窗口内第一个触发的任务负责等待窗口结束并执行整批
+        """
+        sessions = self._job_sessions.get(job_id, [])
+        batch = self._batches.get(task_name)
+        if batch is not None:
+            batch.update(sessions)
+            return
+        batch = self._batches[task_name] = set(sessions)
+        try:
+            await asyncio.sleep(self.BATCH_WINDOW)
+        finally:
+            del self._batches[task_name]
+
+        # 窗口内配置可能被修改，只保留仍然启用该任务的会话
+        active = self.sessions_of(task_name) - self._disabled_sessions
+        session_ids = sorted(batch & active)
+        if not session_ids:
+            return
+        logger.info(f"执行推送任务 {task_name}，共 {len(session_ids)} 个会话")
+        await self._handlers[task_name](session_ids)
+
+    ###### 待推送内容 ######
+
+    def _load_pending(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"读取群组推送队列失败: {str(e)}")
+            return {}
+
+    def _save_pending(self):
+        try:
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._pending, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logger.error(f"保存群组推送队列失败: {str(e)}")
+
+    def sessions_of(self, task_name: str) -> set[str]:
+        """启用了该任务的所有会话"""
+        prefix = f"{self.JOB_PREFIX}:{task_name}:"
+        return {
+            session for job_id, sessions in self._job_sessions.items()
+            if job_id.startswith(prefix) for session in sessions
+        }
+
+    def _prune_pending(self):
+        """丢弃已不再有对应任务的会话的队列"""
+        with self._pending_lock:
+            sessions_of = {}
+            changed = False
+            for session_id in list(self._pending):
+                queues = self._pending[session_id]
+                for task_name in list(queues):
+                    if task_name not in sessions_of:
+                        sessions_of[task_name] = self.sessions_of(task_name)
+                    if session_id not in sessions_of[task_name]:
+                        del queues[task_name]
+                        changed = True
+                if not queues:
+                    del self._pending[session_id]
+                    changed = True
+            if changed:
+                self._save_pending()
+
+    def enqueue(self, task_name: str, items: Iterable[dict]):
+        """把新内容加入所有启用了该任务的会话的队列（可在工作线程中调用）"""
+        items = list(items)
+        sessions = self.sessions_of(task_name)
+        if not items or not sessions:
+            return
+        with self._pending_lock:
+            for session_id in sessions:
+                queue = self._pending.setdefault(session_id, {}).setdefault(task_name, [])
+                queue.extend(items)
+                del queue[:-self.MAX_PENDING]
+            self._save_pending()
+
+    def take_pending(self, task_name: str, session_ids: Iterable[str], key: str) -> list[tuple[list, list[str]]]:
+        """
+        取出这些会话的待推送内容并清空队列
+        队列内容相同（按 key 字段比较）的会话分为一组，返回 [(内容列表, 会话ID列表)]，
+        每组只需要生成一次报告
+        """
+        groups: dict[tuple, tuple[list, list[str]]] = {}
+        with self._pending_lock:
+            for session_id in session_ids:
+                items = self._pending.get(session_id, {}).pop(task_name, [])
+                if items:
+                    signature = tuple(item.get(key) for item in items)
+                    groups.setdefault(signature, (items, []))[1].append(session_id)
+            if groups:
+                self._save_pending()
+        return list(groups.values())
+
+    def stats(self) -> dict:
+        """各调度任务的会话数与下次执行时间"""
+        result = {}
+        for job_id, sessions in self._job_sessions.items():
+            job = self.jobs.get_job(job_id)
+            result[job_id] = {
+                "sessions": len(sessions),
+                "next_run": job.next_run.strftime("%Y-%m-%d %H:%M:%S") if job and job.next_run else "未设置",
+            }
+        return result
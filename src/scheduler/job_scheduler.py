@@ -0,0 +1,347 @@
+"""
+任务调度核心
+所有定时任务放在同一个按下一次执行时间排序的最小堆中，由单个协程负责等待与触发：
+- 触发器：cron 表达式（5段：分 时 日 月 周；6段：秒 分 时 日 月 周）与固定间隔
+- 添加、改期为 O(log n)；取消为惰性删除（只做标记，出堆时丢弃），失效项过多时整体重建堆
+- 错过多次执行（如系统休眠、事件循环阻塞）时默认合并为一次，再从当前时间计算下一次
+- 同一任务上一次尚未执行完时跳过本次，避免堆积
+任务数量增加不会增加协程数量，适合大量按群配置的定时推送
+"""
+
+import time
+import heapq
+import asyncio
+import itertools
+import traceback
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+from astrbot.api import logger
+
+
+###### 触发器 ######
+
+class CronTrigger:
+    """
+    cron 表达式触发器
+    每段支持 *、数字、范围 a-b、步长 */n 或 a-b/n、逗号列表；周字段 0 和 7 都表示周日
+    日与周同时被限定时，满足其一即可（与标准 cron 一致）
+    """
+
+    # (名称, 最小值, 最大值)，按6段表达式的顺序
+    FIELDS = (
+        ("秒", 0, 59),
+        ("分", 0, 59),
+        ("时", 0, 23),
+        ("日", 1, 31),
+        ("月", 1, 12),
+        ("周", 0, 7),
+    )
+    MAX_SEARCH_YEARS = 5    # 查找下一次执行时间的最大跨度，超过则认为表达式无法触发
+
+    def __init__(self, expr: str):
+        parts = expr.split()
+        if len(parts) == 5:
+            parts = ["0"] + parts
+        elif len(parts) != 6:
+            raise ValueError(f"无效的cron表达式: {expr}（应为5段或6段）")
+        self.expr = expr
+
+        values = [self._parse_field(part, name, lo, hi) for part, (name, lo, hi) in zip(parts, self.FIELDS)]
+        self.seconds, self.minutes, self.hours, self.days, self.months = (sorted(v) for v in values[:5])
+        self.weekdays = {weekday % 7 for weekday in values[5]}
+        self._any_day = parts[3] in ("*", "?")
+        self._any_weekday = parts[5] in ("*", "?")
+
+    @staticmethod
+    def _parse_field(field: str, name: str, lo: int, hi: int) -> set[int]:
+        """把一段表达式解析为取值集合"""
+        values = set()
+        for item in field.split(","):
+            base, _, step = item.partition("/")
+            try:
+                step = int(step) if step else 1
+                if base in ("*", "?"):
+                    start, end = lo, hi
+                elif "-" in base:
+                    start, end = (int(x) for x in base.split("-", 1))
+                else:
+                    start = int(base)
+                    end = hi if step > 1 or "/" in item else start
+            except ValueError:
+                raise ValueError(f"无效的cron字段（{name}）: {field}")
+            if step < 1 or start < lo or end > hi or start > end:
+                raise ValueError(f"cron字段（{name}）超出范围 {lo}-{hi}: {field}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _match_day(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = dt.isoweekday() % 7 in self.weekdays
+        if self._any_day and self._any_weekday:
+            return True
+        if self._any_day:
+            return weekday_ok
+        if self._any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_fire(self, after: datetime) -> datetime:
+        """严格晚于 after 的下一次执行时间"""
+        dt = after.replace(microsecond=0) + timedelta(seconds=1)
+        last_year = dt.year + self.MAX_SEARCH_YEARS
+        while dt.year <= last_year:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0, second=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._match_day(dt):
+                dt = dt.replace(hour=0, minute=0, second=0) + timedelta(days=1)
+                continue
+            # 时、分、秒在当前单位内直接二分定位下一个取值，定位不到再进位
+            i = bisect_left(self.hours, dt.hour)
+            if i == len(self.hours):
+                dt = dt.replace(hour=0, minute=0, second=0) + timedelta(days=1)
+                continue
+            if self.hours[i] != dt.hour:
+                dt = dt.replace(hour=self.hours[i], minute=0, second=0)
+            i = bisect_left(self.minutes, dt.minute)
+            if i == len(self.minutes):
+                dt = dt.replace(minute=0, second=0) + timedelta(hours=1)
+                continue
+            if self.minutes[i] != dt.minute:
+                dt = dt.replace(minute=self.minutes[i], second=0)
+            i = bisect_left(self.seconds, dt.second)
+            if i == len(self.seconds):
+                dt = dt.replace(second=0) + timedelta(minutes=1)
+                continue
+            return dt.replace(second=self.seconds[i])
+        raise ValueError(f"cron表达式 {self.expr} 在{self.MAX_SEARCH_YEARS}年内没有可执行的时间")
+
+    def __str__(self):
+        return f"cron[{self.expr}]"
+
+
+class IntervalTrigger:
+    """
+    固定间隔触发器
+    执行时间固定为 start + k * seconds，不随执行耗时漂移；start 默认为创建时间
+    """
+
+    def __init__(self, seconds: float, start: Optional[datetime] = None):
+        if seconds <= 0:
+            raise ValueError(f"无效的时间间隔: {seconds}")
+        self.seconds = seconds
+        self.start = start or datetime.now()
+
+    def next_fire(self, after: datetime) -> datetime:
+        """严格晚于 after 的下一次执行时间"""
+        if after < self.start:
+            return self.start
+        periods = int((after - self.start).total_seconds() // self.seconds) + 1
+        fire = self.start + timedelta(seconds=periods * self.seconds)
+        if fire <= after:
+            # 浮点误差可能导致恰好落在 after 上
+            fire += timedelta(seconds=self.seconds)
+        return fire
+
+    def __str__(self):
+        return f"interval[{self.seconds}s]"
+
+
+###### 任务 ######
+
+class Job:
+    """调度器中的一个任务"""
+
+    def __init__(self, job_id: str, trigger, func: Callable[..., Awaitable], args: tuple = (),
+                 coalesce: bool = True):
+        self.id = job_id
+        self.trigger = trigger
+        self.func = func
+        self.args = args
+        self.coalesce = coalesce        # 错过多次时是否合并为一次
+        self.next_run: Optional[datetime] = None
+        self.cancelled = False
+        self.runs = 0                   # 已执行次数
+        self.missed = 0                 # 因合并而少执行的次数
+        self.skipped = 0                # 因上一次未结束而跳过的次数
+        self.last_run: Optional[datetime] = None
+        self.last_error = ""
+        self._seq = 0                   # 当前有效的堆项序号，旧的堆项出堆时被丢弃
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def __repr__(self):
+        next_run = self.next_run.strftime("%Y-%m-%d %H:%M:%S") if self.next_run else "无"
+        return f"Job({self.id}, {self.trigger}, 下次执行: {next_run})"
+
+
+###### 调度器 ######
+
+class JobScheduler:
+    """基于最小堆的任务调度器"""
+
+    MAX_SLEEP = 60          # 单次最长等待（秒），定期醒来以适应系统时间跳变
+    REBUILD_RATIO = 2       # 堆中项数超过有效任务数的该倍数时重建堆
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, Job]] = []
+        self._jobs: dict[str, Job] = {}
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    @property
+    def running(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    ###### 任务管理 ######
+
+    def add_job(self, job_id: str, trigger, func: Callable[..., Awaitable], *args, coalesce: bool = True) -> Job:
+        """添加任务，同名任务已存在时替换"""
+        self.remove_job(job_id)
+        job = Job(job_id, trigger, func, args, coalesce)
+        self._jobs[job_id] = job
+        self._push(job, trigger.next_fire(datetime.now()))
+        return job
+
+    def reschedule(self, job_id: str, trigger) -> Job:
+        """更换任务的触发器（保留执行统计），并按新触发器计算下一次执行时间"""
+        job = self._jobs[job_id]
+        job.trigger = trigger
+        self._push(job, trigger.next_fire(datetime.now()))
+        return job
+
+    def remove_job(self, job_id: str) -> bool:
+        """取消任务（惰性删除），正在执行的本次不受影响"""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        job.cancelled = True
+        job.next_run = None
+        if len(self._heap) > self.REBUILD_RATIO * len(self._jobs) + 16:
+            self._rebuild()
+        return True
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        """所有任务，按下一次执行时间排序"""
+        return sorted(self._jobs.values(), key=lambda job: job.next_run or datetime.max)
+
+    def next_run_time(self) -> Optional[datetime]:
+        """最近一个任务的执行时间"""
+        job = self._peek()
+        return job.next_run if job else None
+
+    ###### 堆操作 ######
+
+    def _push(self, job: Job, next_run: datetime):
+        job.next_run = next_run
+        job._seq = next(self._counter)
+        heapq.heappush(self._heap, (next_run.timestamp(), job._seq, job))
+        # 新任务可能比当前等待的更早，唤醒调度协程重新计算等待时间
+        if self._wakeup is not None and self._heap[0][2] is job:
+            self._wakeup.set()
+
+    def _is_stale(self, entry: tuple) -> bool:
+        _, seq, job = entry
+        return job.cancelled or seq != job._seq
+
+    def _peek(self) -> Optional[Job]:
+        """堆顶的有效任务，顺带丢弃失效项"""
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][2] if self._heap else None
+
+    def _rebuild(self):
+        self._heap = [entry for entry in self._heap if not self._is_stale(entry)]
+        heapq.heapify(self._heap)
+
+    ###### 运行 ######
+
+    def start(self):
+        """启动调度协程（需在事件循环中调用）"""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._run_loop())
+
+    async def stop(self):
+        """停止调度协程，并取消正在执行的任务"""
+        tasks = [job._task for job in self._jobs.values() if job.running]
+        if self._loop_task:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_loop(self):
+        while True:
+            self._wakeup.clear()
+            job = self._peek()
+            if job is None:
+                await self._wakeup.wait()
+                continue
+            delay = job.next_run.timestamp() - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(delay, self.MAX_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._heap)
+            try:
+                self._fire(job)
+            except Exception as e:
+                # 触发器异常时移除该任务，不影响其他任务
+                logger.error(f"调度任务 {job.id} 计算下一次执行时间失败，已移除: {str(e)}")
+                self._jobs.pop(job.id, None)
+                job.cancelled = True
+
+    def _fire(self, job: Job):
+        """执行到期的任务，并放回堆中等待下一次"""
+        now = datetime.now()
+        next_run = job.trigger.next_fire(job.next_run)
+        if next_run <= now and job.coalesce:
+            # 错过了多次执行，合并为本次一次
+            missed = 0
+            while next_run <= now and missed < 1000:
+                next_run = job.trigger.next_fire(next_run)
+                missed += 1
+            job.missed += missed
+            logger.warning(f"调度任务 {job.id} 错过了{missed}次执行，已合并为一次")
+            next_run = job.trigger.next_fire(now)
+
+        if job.running:
+            job.skipped += 1
+            logger.warning(f"调度任务 {job.id} 上一次执行尚未结束，跳过本次")
+        else:
+            job._task = asyncio.create_task(self._execute(job))
+        self._push(job, next_run)
+
+    @staticmethod
+    async def _execute(job: Job):
+        job.last_run = datetime.now()
+        job.runs += 1
+        try:
+            await job.func(*job.args)
+            job.last_error = ""
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.last_error = str(e)
+            logger.error(f"调度任务 {job.id} 执行出错: {str(e)}")
+            logger.error(traceback.format_exc())
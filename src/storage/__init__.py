@@ -0,0 +1,41 @@
+"""
+存储模块
+"""
+
+import os
+
+from astrbot.api import logger
+from .base import NoticeStore, NOTICE_FIELDNAMES
+from .link_index import LinkIndex
+from .offset_index import CsvOffsetIndex
+from .csv_store import CsvNoticeStore
+from .sqlite_store import SqliteNoticeStore
+from .search_index import NoticeSearchIndex
+
+
+def create_notice_store(config_manager) -> NoticeStore:
+    """根据配置创建通知存储后端（sqlite / csv）"""
+    storage_root = config_manager.get_storage_root()
+    csv_path = os.path.join(storage_root, "csu_innovation_notices.csv")
+    backend = config_manager.get_storage_backend()
+
+    if backend == "csv":
+        return CsvNoticeStore(csv_path)
+    if backend != "sqlite":
+        logger.error(f"未知的存储后端：{backend}, 已切换为默认后端：sqlite")
+    return SqliteNoticeStore(
+        os.path.join(storage_root, "csu_innovation_notices.db"),
+        legacy_csv_path=csv_path,
+    )
+
+
+__all__ = [
+    "NoticeStore",
+    "NOTICE_FIELDNAMES",
+    "LinkIndex",
+    "CsvOffsetIndex",
+    "CsvNoticeStore",
+    "SqliteNoticeStore",
+    "NoticeSearchIndex",
+    "create_notice_store",
+]
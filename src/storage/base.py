@@ -0,0 +1,72 @@
+"""
+通知存储接口
+定义通知存储后端需要实现的方法，具体实现见 csv_store / sqlite_store
+"""
+
+import threading
+from functools import wraps
+from typing import Optional
+
+
+# 通知字段（与CSV表头保持一致）
+NOTICE_FIELDNAMES = ["时间", "标题", "链接"]
+
+
+def synchronized(func):
+    """存储方法加锁装饰器：读写可能来自不同的工作线程，同一时刻只允许一个线程访问存储"""
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+class NoticeStore:
+    """通知存储后端基类，所有读取结果均按时间倒序（新的在前）"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def add_notices(self, notices: list[dict]) -> list[dict]:
+        """
+        写入通知（按链接去重）
+        返回实际新增的通知列表
+        """
+        raise NotImplementedError
+
+    def existing_links(self) -> set:
+        """获取已存储的所有通知链接"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """获取已存储的通知数量"""
+        raise NotImplementedError
+
+    def read_page(self, n: int, page: int) -> list[dict]:
+        """读取第page页（从1开始）的n条通知"""
+        raise NotImplementedError
+
+    def latest_date(self) -> Optional[str]:
+        """获取最新一条通知的日期"""
+        top = self.read_page(1, 1)
+        return top[0]["时间"] if top else None
+
+    def sort(self):
+        """按时间重新排序（需要时由后端实现）"""
+
+    def close(self):
+        """释放存储资源"""
+
+    @staticmethod
+    def _dedup_batch(notices: list[dict], existing_links: set) -> list[dict]:
+        """筛选未存储过的通知，同时去除同一批次内的重复链接"""
+        seen = set(existing_links)
+        filtered = []
+        for notice in notices:
+            if notice["链接"] in seen:
+                continue
+            seen.add(notice["链接"])
+            filtered.append(notice)
+        return filtered
@@ -0,0 +1,203 @@
+"""
+CSV通知存储
+插件最初的存储方式：文件按时间倒序保存
+新批次可以整段放入时按字节拼接写入（在末尾时直接追加），不再解析与排序整个文件，
+与已存储通知的日期交错时才追加后整体排序重写
+分页读取经由行偏移索引直接定位，只解码所需的行
+"""
+
+import io
+import os
+import csv
+import shutil
+from array import array
+from datetime import datetime
+
+from astrbot.api import logger
+from .base import NoticeStore, NOTICE_FIELDNAMES, synchronized
+from .link_index import LinkIndex
+from .offset_index import CsvOffsetIndex
+
+
+class CsvNoticeStore(NoticeStore):
+    """基于CSV文件的通知存储"""
+
+    def __init__(self, storage_path: str):
+        super().__init__()
+        self.storage_path = storage_path
+        self.link_index = LinkIndex(storage_path)   # 常驻内存的链接索引，去重与计数不再扫描CSV
+        self.offset_index = CsvOffsetIndex(storage_path)    # 行偏移索引，分页读取不再逐行解析CSV
+
+    def _is_empty(self) -> bool:
+        return not os.path.exists(self.storage_path) or os.path.getsize(self.storage_path) == 0
+
+    @synchronized
+    def add_notices(self, notices: list[dict]) -> list[dict]:
+        # 筛选未存储过的通知
+        filtered_notices = self._dedup_batch(notices, self.link_index.links)
+        if not filtered_notices:
+            return []
+
+        # 批次可以按顺序放到文件首尾时直接写入，否则追加后整体排序
+        if not self._insert_ordered(filtered_notices):
+            self._append_and_sort(filtered_notices)
+
+        # CSV写入完成后再更新链接索引
+        self.link_index.add([notice["链接"] for notice in filtered_notices])
+        return filtered_notices
+
+    @staticmethod
+    def _date_key(notice: dict) -> datetime:
+        return datetime.strptime(notice["时间"], "%Y-%m-%d")
+
+    @staticmethod
+    def _encode_rows(rows: list[dict]) -> tuple[bytes, array]:
+        """把rows编码为CSV数据行，返回 (字节内容, 每行相对于开头的偏移)"""
+        offsets = array("Q")
+        chunks = []
+        position = 0
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=NOTICE_FIELDNAMES)
+        for row in rows:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(row)
+            data = buffer.getvalue().encode("UTF-8")
+            offsets.append(position)
+            chunks.append(data)
+            position += len(data)
+        return b"".join(chunks), offsets
+
+    def _insert_ordered(self, notices: list[dict]) -> bool:
+        """
+        把一批通知整段写入按时间倒序保存的文件，不重新解析与排序整个文件
+        二分查找批次中最早日期的插入位置，该位置之前的已存储通知都不早于批次中最新的日期时，批次可以整段放在这里，
+        结果与追加后整体排序一致（日期相同的通知保持先存储的在前）
+        插入位置在末尾（如回填历史归档）时直接追加，否则按字节复制前后两段数据重写文件
+        返回 False 表示批次与已存储通知的日期交错，需要整体排序
+        """
+        if self._is_empty():
+            return False
+        index = self.offset_index
+        index.ensure_fresh()
+        if not len(index) or index.fieldnames != NOTICE_FIELDNAMES:
+            return False    # 没有数据行，或表头顺序不同（手动修改过的文件）
+
+        def row_date(i: int) -> datetime:
+            return self._date_key(index.read_rows(i, i + 1)[0])
+
+        try:
+            batch = sorted(notices, key=self._date_key, reverse=True)
+            newest, oldest = self._date_key(batch[0]), self._date_key(batch[-1])
+            # 第一条早于批次最早日期的已存储通知
+            lo, hi = 0, len(index)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if row_date(mid) >= oldest:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo > 0 and row_date(lo - 1) < newest:
+                return False
+        except (ValueError, KeyError, IndexError):
+            return False    # 日期格式异常时交给整体排序处理
+
+        data, offsets = self._encode_rows(batch)
+        if lo == len(index):
+            with open(self.storage_path, "r+b") as f:
+                base = f.seek(0, os.SEEK_END)
+                f.seek(base - 1)
+                if f.read(1) != b"\n":
+                    base += f.write(b"\r\n")   # 手动修改过的文件最后一行可能缺少换行符
+                f.write(data)
+            index.append(array("Q", (base + offset for offset in offsets)))
+        else:
+            split = index.offsets[lo]
+            tmp_path = self.storage_path + ".tmp"
+            with open(self.storage_path, "rb") as src, open(tmp_path, "wb") as dst:
+                dst.write(src.read(split))
+                dst.write(data)
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp_path, self.storage_path)
+            new_offsets = index.offsets[:lo]
+            new_offsets.extend(split + offset for offset in offsets)
+            new_offsets.extend(offset + len(data) for offset in index.offsets[lo:])
+            index.update(new_offsets, index.fieldnames)
+        logger.info(f"已按时间顺序写入 {len(batch)} 条通知（第 {lo + 1} 行起）")
+        return True
+
+    def _append_and_sort(self, notices: list[dict]):
+        """追加写入后整体按时间排序重写"""
+        write_header = self._is_empty()
+        with open(self.storage_path, "a", encoding="UTF-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=NOTICE_FIELDNAMES)
+            # 如果文件为空，先写表头
+            if write_header:
+                writer.writeheader()
+            # 写入新通知
+            writer.writerows(notices)
+
+        # 对Csv文件进行排序
+        self.sort()
+
+    @synchronized
+    def existing_links(self) -> set:
+        return set(self.link_index.links)
+
+    @synchronized
+    def count(self) -> int:
+        return len(self.link_index)
+
+    # 重构本地的csv文件， 按时间排序
+    @synchronized
+    def sort(self):
+        """根据时间字段对本地CSV文件进行排序"""
+        if self._is_empty():
+            logger.info("本地存储文件为空或不存在，无需排序")
+            return
+
+        try:
+            # 读取所有行
+            with open(self.storage_path, "r", encoding="UTF-8") as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+
+            # 按时间字段排序，新的在前面
+            rows.sort(key=lambda x: datetime.strptime(x["时间"], "%Y-%m-%d"), reverse=True)
+
+            # 写回文件，同时记录每行的起始位置
+            self.offset_index.update(self._write_rows(rows), NOTICE_FIELDNAMES)
+
+            logger.info(f"已按时间排序 {len(rows)} 条通知")
+        except Exception as e:
+            logger.error(f"排序本地通知失败: {str(e)}")
+
+    def _write_rows(self, rows: list[dict]) -> array:
+        """重写CSV（表头+rows），返回每行数据的起始字节位置"""
+        offsets = array("Q")
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=NOTICE_FIELDNAMES)
+        writer.writeheader()
+        with open(self.storage_path, "wb") as f:
+            position = f.write(buffer.getvalue().encode("UTF-8"))
+            for row in rows:
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerow(row)
+                offsets.append(position)
+                position += f.write(buffer.getvalue().encode("UTF-8"))
+        return offsets
+
+    @synchronized
+    def read_page(self, n: int, page: int) -> list[dict]:
+        if self._is_empty():
+            logger.info("本地存储文件为空或不存在")
+            return []
+
+        try:
+            # 计算跳过的条数，按偏移索引直接读取这一页
+            skip = (page - 1) * n
+            return self.offset_index.read_rows(skip, skip + n)
+        except Exception as e:
+            logger.error(f"读取本地通知失败: {str(e)}")
+            return []
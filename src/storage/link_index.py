@@ -0,0 +1,62 @@
+"""
+通知链接索引
+常驻内存的链接集合，用于CSV存储的去重与计数
+持久化为一个只追加的旁路文件（每行一个链接），避免每次保存都重新解析整个CSV
+"""
+
+import os
+import csv
+
+from astrbot.api import logger
+
+
+class LinkIndex:
+    """常驻内存的链接索引，启动时加载一次，之后随每次保存增量更新"""
+
+    def __init__(self, csv_path: str):
+        self.csv_path = csv_path
+        self.log_path = csv_path + ".links"
+        self.links: set = set()
+        self._load()
+
+    def _is_log_fresh(self) -> bool:
+        """旁路文件是否与CSV一致（CSV在旁路文件之后被修改过则视为过期）"""
+        if not os.path.exists(self.log_path):
+            return False
+        if not os.path.exists(self.csv_path):
+            return True
+        return os.stat(self.log_path).st_mtime_ns >= os.stat(self.csv_path).st_mtime_ns
+
+    def _load(self):
+        """加载索引：旁路文件有效时直接读取，否则扫描一次CSV重建"""
+        if self._is_log_fresh():
+            with open(self.log_path, "r", encoding="UTF-8") as f:
+                self.links = {line.rstrip("\n") for line in f if line.strip()}
+            logger.info(f"已从 {self.log_path} 加载 {len(self.links)} 条链接索引")
+            return
+        self.rebuild()
+
+    def rebuild(self):
+        """扫描CSV重建索引，并重写旁路文件"""
+        self.links = set()
+        if os.path.exists(self.csv_path) and os.path.getsize(self.csv_path) > 0:
+            try:
+                with open(self.csv_path, "r", encoding="UTF-8") as f:
+                    self.links = {row["链接"] for row in csv.DictReader(f)}
+            except Exception as e:
+                logger.error(f"读取已存储链接失败: {str(e)}")
+        with open(self.log_path, "w", encoding="UTF-8") as f:
+            f.writelines(f"{link}\n" for link in self.links)
+        logger.info(f"已重建链接索引，共 {len(self.links)} 条")
+
+    def add(self, links: list[str]):
+        """追加新链接（需在CSV写入之后调用，保证旁路文件不早于CSV）"""
+        self.links.update(links)
+        with open(self.log_path, "a", encoding="UTF-8") as f:
+            f.writelines(f"{link}\n" for link in links)
+
+    def __contains__(self, link: str) -> bool:
+        return link in self.links
+
+    def __len__(self) -> int:
+        return len(self.links)
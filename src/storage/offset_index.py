@@ -0,0 +1,148 @@
+"""
+CSV行偏移索引
+记录已排序CSV中每一行数据的起始字节位置，持久化为旁路文件 csu_innovation_notices.csv.offsets，
+分页读取时通过内存映射直接定位到所需的行，只解码这些行，不再逐行解析整个文件
+
+旁路文件格式：文件头（标识、CSV大小、CSV修改时间）+ array('Q') 行起始偏移
+CSV大小或修改时间与记录不一致（被重写、手动修改）时自动重建
+"""
+
+import io
+import os
+import csv
+import mmap
+import struct
+from array import array
+from typing import Optional
+
+from astrbot.api import logger
+
+
+class CsvOffsetIndex:
+    """CSV数据行的字节偏移索引"""
+
+    MAGIC = b"CSUOFF01"
+    HEADER = struct.Struct("<8sQQ")     # 标识, CSV大小, CSV修改时间(ns)
+
+    def __init__(self, csv_path: str):
+        self.csv_path = csv_path
+        self.index_path = csv_path + ".offsets"
+        self.offsets = array("Q")       # 第i行数据的起始位置
+        self.fieldnames: list[str] = []
+        self._stamp: Optional[tuple[int, int]] = None    # 索引对应的 (CSV大小, 修改时间)
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @staticmethod
+    def _csv_stamp(path: str) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    ###### 加载与重建 ######
+
+    def _load(self):
+        """旁路文件与CSV一致时直接读取，否则扫描CSV重建"""
+        stamp = self._csv_stamp(self.csv_path)
+        if stamp is None:
+            return
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, size, mtime_ns = self.HEADER.unpack(f.read(self.HEADER.size))
+                if magic == self.MAGIC and (size, mtime_ns) == stamp:
+                    offsets = array("Q")
+                    offsets.frombytes(f.read())
+                    self.offsets = offsets
+                    self._stamp = stamp
+                    self.fieldnames = self._read_fieldnames()
+                    return
+        except (OSError, struct.error, ValueError):
+            pass
+        self.rebuild()
+
+    def _read_fieldnames(self) -> list[str]:
+        with open(self.csv_path, "r", encoding="UTF-8", newline="") as f:
+            return next(csv.reader(f), [])
+
+    def rebuild(self):
+        """扫描CSV，按引号配对识别行边界（字段内的换行不会被当作行尾）"""
+        stamp = self._csv_stamp(self.csv_path)
+        offsets = array("Q")
+        if stamp is not None and stamp[0] > 0:
+            with open(self.csv_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                row_start, pos, quotes = 0, 0, 0
+                first = True
+                while pos < size:
+                    end = mm.find(b"\n", pos)
+                    end = size if end == -1 else end + 1
+                    quotes += mm[pos:end].count(b'"')
+                    pos = end
+                    if quotes % 2 == 0:
+                        # 第一行是表头
+                        if not first and mm[row_start:end].strip():
+                            offsets.append(row_start)
+                        first = False
+                        row_start, quotes = end, 0
+        self.offsets = offsets
+        self.fieldnames = self._read_fieldnames() if offsets or (stamp and stamp[0] > 0) else []
+        self._save(stamp)
+        logger.info(f"已重建CSV行偏移索引，共 {len(offsets)} 行")
+
+    def update(self, offsets: array, fieldnames: list[str]):
+        """CSV刚被整体重写时，直接使用写入过程中记录的偏移"""
+        self.offsets = offsets
+        self.fieldnames = fieldnames
+        self._save(self._csv_stamp(self.csv_path))
+
+    def append(self, offsets: array):
+        """
+        CSV末尾刚追加了若干行时，直接追加这些行的偏移
+        先追加偏移、后更新文件头，中途失败时文件头与CSV不一致，下次加载自动重建
+        """
+        self.offsets.extend(offsets)
+        stamp = self._csv_stamp(self.csv_path)
+        try:
+            with open(self.index_path, "r+b") as f:
+                f.seek(0, os.SEEK_END)
+                f.write(offsets.tobytes())
+                f.seek(0)
+                f.write(self.HEADER.pack(self.MAGIC, *stamp))
+            self._stamp = stamp
+        except (OSError, TypeError):
+            self._save(stamp)
+
+    def _save(self, stamp: Optional[tuple[int, int]]):
+        self._stamp = stamp
+        if stamp is None:
+            return
+        try:
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, *stamp))
+                f.write(self.offsets.tobytes())
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.error(f"保存CSV行偏移索引失败: {str(e)}")
+
+    def ensure_fresh(self):
+        """CSV在索引之后被修改过则重建"""
+        if self._csv_stamp(self.csv_path) != self._stamp:
+            self.rebuild()
+
+    ###### 读取 ######
+
+    def read_rows(self, start: int, stop: int) -> list[dict]:
+        """读取第 [start, stop) 行数据（从0开始），只解码这些行"""
+        self.ensure_fresh()
+        start, stop = max(start, 0), min(stop, len(self.offsets))
+        if start >= stop:
+            return []
+        with open(self.csv_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = self.offsets[stop] if stop < len(self.offsets) else len(mm)
+            chunk = mm[self.offsets[start]:end].decode("UTF-8")
+        return list(csv.DictReader(io.StringIO(chunk, newline=""), fieldnames=self.fieldnames))
@@ -0,0 +1,275 @@
+"""
+通知标题全文索引
+中文标题没有分词边界，按字符 n-gram 建立倒排索引：每个标题按非文字字符切段，
+段内的单字与相邻二字都作为索引项，倒排表为按文档编号递增的 array('I')
+查询时取查询词的二字（单字段取单字），从最短的倒排表出发求交集，不扫描存储；
+命中大部分标题的宽泛查询按时间顺序取够条数即停止，不对全部结果排序
+
+文件：
+- 快照 csu_innovation_notices_search.json：{"docs": [[时间, 标题, 链接], ...], "postings": {索引项: base64(倒排表)}}
+- 日志 csu_innovation_notices_search.log.jsonl：快照之后新增的通知，每行一条
+日志积累到一定数量后压缩进快照
+"""
+
+import os
+import re
+import json
+import heapq
+import base64
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Iterable
+
+from astrbot.api import logger
+
+
+_SEPARATOR = re.compile(r"[\W_]+")
+
+
+class NoticeSearchIndex:
+    """通知标题的 n-gram 倒排索引"""
+
+    COMPACT_THRESHOLD = 2000    # 日志超过该条数时压缩进快照
+    MIN_FALLBACK_RATIO = 0.5    # 没有完全匹配时，至少命中该比例的索引项才作为结果
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+        base, _ = os.path.splitext(snapshot_path)
+        self.log_path = base + ".log.jsonl"
+        self._lock = threading.RLock()
+        self._docs: list[tuple[str, str, str]] = []     # 文档编号 → (时间, 标题, 链接)
+        self._normalized: list[str] = []                # 文档编号 → 规范化后的标题
+        self._doc_ids: dict[str, int] = {}              # 链接 → 文档编号
+        self._postings: dict[str, array] = {}           # 索引项 → 文档编号（递增）
+        self._recent = None                             # 按时间升序排列的文档编号（首次宽泛查询时计算）
+        self._log_records = 0
+        self._load()
+
+    ###### 分词 ######
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """全角转半角、英文转小写"""
+        return unicodedata.normalize("NFKC", text).lower()
+
+    @classmethod
+    def segments(cls, text: str) -> list[str]:
+        """按标点、空白等非文字字符切段"""
+        return [segment for segment in _SEPARATOR.split(cls.normalize(text)) if segment]
+
+    @classmethod
+    def index_terms(cls, text: str) -> set[str]:
+        """标题的索引项：每段的单字与相邻二字"""
+        terms = set()
+        for segment in cls.segments(text):
+            terms.update(segment)
+            terms.update(segment[i:i + 2] for i in range(len(segment) - 1))
+        return terms
+
+    @classmethod
+    def query_terms(cls, text: str) -> set[str]:
+        """查询的索引项：每段的相邻二字，单字段取单字"""
+        terms = set()
+        for segment in cls.segments(text):
+            if len(segment) == 1:
+                terms.add(segment)
+            else:
+                terms.update(segment[i:i + 2] for i in range(len(segment) - 1))
+        return terms
+
+    ###### 读取 ######
+
+    def _load(self):
+        """读取快照并重放日志"""
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                self._docs = [tuple(doc) for doc in snapshot.get("docs", [])]
+                self._normalized = [self.normalize(title) for _, title, _ in self._docs]
+                self._doc_ids = {link: doc_id for doc_id, (_, _, link) in enumerate(self._docs)}
+                for term, encoded in snapshot.get("postings", {}).items():
+                    postings = array("I")
+                    postings.frombytes(base64.b64decode(encoded))
+                    self._postings[term] = postings
+            except Exception as e:
+                logger.error(f"读取通知搜索索引失败，将重建: {str(e)}")
+                self._clear()
+
+        corrupted = False
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        notice = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 写入中断留下的不完整行，忽略
+                        corrupted = True
+                        continue
+                    self._add_doc(notice)
+                    self._log_records += 1
+
+        if corrupted or self._log_records > self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def _clear(self):
+        self._docs, self._normalized, self._doc_ids, self._postings = [], [], {}, {}
+        self._recent = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, link: str) -> bool:
+        return link in self._doc_ids
+
+    ###### 写入 ######
+
+    def _add_doc(self, notice: dict) -> bool:
+        link = notice["链接"]
+        if link in self._doc_ids:
+            return False
+        doc_id = len(self._docs)
+        self._docs.append((notice["时间"], notice["标题"], link))
+        self._normalized.append(self.normalize(notice["标题"]))
+        self._doc_ids[link] = doc_id
+        if self._recent is not None:
+            insort(self._recent, doc_id, key=self._recency_key)
+        for term in self.index_terms(notice["标题"]):
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = array("I")
+            postings.append(doc_id)
+        return True
+
+    def add(self, notices: Iterable[dict]) -> int:
+        """
+        增量加入新通知（已存在的链接忽略），可直接作为 NoticeDataHandler 的变更回调
+        返回实际加入的数量
+        """
+        with self._lock:
+            added = [notice for notice in notices if self._add_doc(notice)]
+            if not added:
+                return 0
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.writelines(
+                    json.dumps({key: notice[key] for key in ("时间", "标题", "链接")}, ensure_ascii=False) + "\n"
+                    for notice in added
+                )
+            self._log_records += len(added)
+            if self._log_records > self.COMPACT_THRESHOLD:
+                self.compact()
+            return len(added)
+
+    def rebuild(self, notices: Iterable[dict]):
+        """按给定的全部通知重建索引"""
+        with self._lock:
+            self._clear()
+            for notice in notices:
+                self._add_doc(notice)
+            self.compact()
+            logger.info(f"已重建通知搜索索引，共 {len(self._docs)} 条")
+
+    def compact(self):
+        """把当前索引写成快照（先写临时文件再替换），并清空日志"""
+        with self._lock:
+            tmp_path = self.snapshot_path + ".tmp"
+            snapshot = {
+                "docs": [list(doc) for doc in self._docs],
+                "postings": {
+                    term: base64.b64encode(postings.tobytes()).decode("ascii")
+                    for term, postings in self._postings.items()
+                },
+            }
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.snapshot_path)
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+            self._log_records = 0
+
+    ###### 查询 ######
+
+    @staticmethod
+    def _intersect(candidates: set, postings: array) -> set:
+        """候选集合与倒排表求交：候选很少时逐个二分查找，否则整表交给 set 在C层完成"""
+        if len(candidates) * 16 < len(postings):
+            result = set()
+            for doc_id in candidates:
+                i = bisect_left(postings, doc_id)
+                if i < len(postings) and postings[i] == doc_id:
+                    result.add(doc_id)
+            return result
+        return candidates.intersection(postings)
+
+    def _recency_key(self, doc_id: int) -> tuple:
+        return (self._docs[doc_id][0], doc_id)
+
+    def _recent_order(self):
+        """按时间从新到旧遍历文档编号；_recent 按时间升序保存，新增通知时插入而不重新排序"""
+        if self._recent is None:
+            self._recent = sorted(range(len(self._docs)), key=self._recency_key)
+        return reversed(self._recent)
+
+    def search(self, query: str, limit: int = 10) -> tuple[int, list[dict]]:
+        """
+        搜索标题，返回 (匹配总数, 排名前 limit 的通知)
+        排序：包含完整查询片段的优先，其次命中索引项多的，再按时间从新到旧
+        所有索引项都命中的标题为匹配结果；一个都没有时退而取命中过半的标题
+        """
+        terms = self.query_terms(query)
+        segments = self.segments(query)
+        if not terms:
+            return 0, []
+
+        with self._lock:
+            normalized = self._normalized
+            postings = sorted((self._postings.get(term, array("I")) for term in terms), key=len)
+            # 出现在所有标题中的索引项不起筛选作用，跳过；都跳过时 candidates 为 None 表示全部标题
+            selective = [term_postings for term_postings in postings if len(term_postings) < len(self._docs)]
+            candidates = None
+            if selective:
+                # 从最短的倒排表出发逐个求交
+                candidates = set(selective[0])
+                for other in selective[1:]:
+                    if not candidates:
+                        break
+                    candidates = self._intersect(candidates, other)
+
+            if candidates is None or (candidates and len(candidates) * 16 > len(self._docs)):
+                # 命中大部分标题的宽泛查询：按时间顺序扫描，凑够 limit 条完整匹配即停止
+                top, partial = [], []
+                for doc_id in self._recent_order():
+                    if candidates is not None and doc_id not in candidates:
+                        continue
+                    if all(segment in normalized[doc_id] for segment in segments):
+                        top.append(doc_id)
+                        if len(top) == limit:
+                            break
+                    elif len(partial) < limit:
+                        partial.append(doc_id)
+                top = (top + partial)[:limit]
+                total = len(self._docs) if candidates is None else len(candidates)
+            else:
+                if candidates:
+                    hits = dict.fromkeys(candidates, len(terms))
+                else:
+                    counts = Counter()
+                    for term_postings in postings:
+                        counts.update(term_postings)
+                    threshold = max(1, int(len(terms) * self.MIN_FALLBACK_RATIO + 0.5))
+                    hits = {doc_id: count for doc_id, count in counts.items() if count >= threshold}
+                ranked = [
+                    (all(segment in normalized[doc_id] for segment in segments), count, self._docs[doc_id][0], doc_id)
+                    for doc_id, count in hits.items()
+                ]
+                top = [item[3] for item in heapq.nlargest(limit, ranked)]
+                total = len(hits)
+
+            results = [
+                {"时间": self._docs[doc_id][0], "标题": self._docs[doc_id][1], "链接": self._docs[doc_id][2]}
+                for doc_id in top
+            ]
+        return total, results
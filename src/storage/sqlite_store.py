@@ -0,0 +1,108 @@
+"""
+SQLite通知存储
+链接唯一索引负责去重，日期索引负责排序与分页，写入为 O(log n)
+首次启动时会自动把旧的CSV数据迁移进来
+"""
+
+import os
+import csv
+import sqlite3
+from typing import Optional
+
+from astrbot.api import logger
+from .base import NoticeStore, NOTICE_FIELDNAMES, synchronized
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    id    INTEGER PRIMARY KEY AUTOINCREMENT,
+    date  TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link  TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_notices_link ON notices(link);
+CREATE INDEX IF NOT EXISTS idx_notices_date ON notices(date DESC, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SqliteNoticeStore(NoticeStore):
+    """基于SQLite的通知存储"""
+
+    def __init__(self, db_path: str, legacy_csv_path: Optional[str] = None):
+        super().__init__()
+        self.db_path = db_path
+        # 连接会在工作线程中使用，由锁保证同一时刻只有一个线程访问
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        if legacy_csv_path:
+            self._migrate_from_csv(legacy_csv_path)
+
+    ### 私有方法 ###
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _migrate_from_csv(self, csv_path: str):
+        """一次性把旧的CSV数据导入数据库（按文件顺序导入，保持同日期通知的先后顺序）"""
+        if self._get_meta("csv_migrated"):
+            return
+        if os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
+            try:
+                with open(csv_path, "r", encoding="UTF-8") as f:
+                    rows = list(csv.DictReader(f))
+            except Exception as e:
+                logger.error(f"读取旧CSV数据失败，跳过迁移: {str(e)}")
+                return
+            migrated = self.add_notices(rows)
+            logger.info(f"已从 {csv_path} 迁移 {len(migrated)} 条通知到 {self.db_path}")
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('csv_migrated', '1')")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_notice(row: tuple) -> dict:
+        return dict(zip(NOTICE_FIELDNAMES, row))
+
+    ### 接口实现 ###
+    @synchronized
+    def add_notices(self, notices: list[dict]) -> list[dict]:
+        inserted = []
+        with self._conn:
+            for notice in notices:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO notices (date, title, link) VALUES (?, ?, ?)",
+                    (notice["时间"], notice["标题"], notice["链接"]),
+                )
+                if cursor.rowcount:
+                    inserted.append(notice)
+        return inserted
+
+    @synchronized
+    def existing_links(self) -> set:
+        return {row[0] for row in self._conn.execute("SELECT link FROM notices")}
+
+    @synchronized
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM notices").fetchone()[0]
+
+    @synchronized
+    def read_page(self, n: int, page: int) -> list[dict]:
+        skip = (page - 1) * n
+        rows = self._conn.execute(
+            "SELECT date, title, link FROM notices ORDER BY date DESC, id ASC LIMIT ? OFFSET ?",
+            (n, skip),
+        )
+        return [self._to_notice(row) for row in rows]
+
+    @synchronized
+    def latest_date(self) -> Optional[str]:
+        row = self._conn.execute("SELECT MAX(date) FROM notices").fetchone()
+        return row[0] if row else None
+
+    @synchronized
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,57 @@
+"""
+测试公共配置
+以插件根目录为导入根，使 src 可以作为包导入；
+不在AstrBot环境中运行时，用桩模块代替 astrbot.api（插件模块只用到 logger 等少数名字）
+"""
+
+import os
+import sys
+import types
+import logging
+import importlib.util
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PLUGIN_ROOT not in sys.path:
+    sys.path.insert(0, PLUGIN_ROOT)
+
+
+def _install_astrbot_stub():
+    """注册最小的 astrbot / astrbot.api / astrbot.api.event / astrbot.api.star 模块"""
+    api = types.ModuleType("astrbot.api")
+    api.logger = logging.getLogger("astrbot")
+    api.AstrBotConfig = dict
+
+    class _Filter:
+        """filter.command(...) 等装饰器原样返回被装饰的函数"""
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: (lambda func: func)
+
+    event = types.ModuleType("astrbot.api.event")
+    event.filter = _Filter()
+    for name in ("AstrMessageEvent", "MessageEventResult", "MessageChain"):
+        setattr(event, name, type(name, (), {}))
+
+    class Star:
+        def __init__(self, context=None):
+            self.context = context
+
+    star = types.ModuleType("astrbot.api.star")
+    star.Context = type("Context", (), {})
+    star.Star = Star
+    star.register = lambda *args, **kwargs: (lambda cls: cls)
+
+    astrbot = types.ModuleType("astrbot")
+    astrbot.api = api
+    api.event = event
+    api.star = star
+    sys.modules.update({
+        "astrbot": astrbot,
+        "astrbot.api": api,
+        "astrbot.api.event": event,
+        "astrbot.api.star": star,
+    })
+
+
+if importlib.util.find_spec("astrbot") is None:
+    _install_astrbot_stub()
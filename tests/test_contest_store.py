@@ -0,0 +1,130 @@
+"""
+比赛增量存储测试
+以 (平台, 链接) 为键合并；爬取失败的平台保留原有比赛；重启后由快照与日志恢复出相同的数据
+"""
+
+import os
+import json
+
+import pytest
+
+from src.crawlers import Contest, ContestStore
+
+
+def _contest(oj: str, index: int, stime: int = 0) -> Contest:
+    return Contest(
+        oj=oj, name=f"{oj} Round {index}", stime=stime or 1_700_000_000 + index * 3600,
+        dtime=7200, etime=(stime or 1_700_000_000 + index * 3600) + 7200,
+        link=f"https://{oj.lower()}.example.com/contest/{index}",
+    )
+
+
+def _keys(contests) -> list[tuple]:
+    return sorted(ContestStore.key(contest) for contest in contests)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "json_innovation_contests.json")
+
+
+def test_merge_detects_insert_update_remove(snapshot_path):
+    store = ContestStore(snapshot_path)
+    first = [_contest("Codeforces", i) for i in range(3)] + [_contest("AtCoder", i) for i in range(2)]
+    changes = store.merge(first)
+    assert changes.summary() == {"inserted": 5, "updated": 0, "removed": 0}
+
+    rescheduled = _contest("Codeforces", 1, stime=1_800_000_000)
+    second = [first[0], rescheduled, first[3], first[4], _contest("AtCoder", 9)]
+    changes = store.merge(second)
+    assert changes.summary() == {"inserted": 1, "updated": 1, "removed": 1}
+    assert changes.updated == [(first[1], rescheduled)]
+    assert changes.removed == [first[2]]
+    assert _keys(store.read_all()) == _keys(second)
+
+    # 没有变化时不写日志
+    size = os.path.getsize(store.log_path)
+    assert not store.merge(second)
+    assert os.path.getsize(store.log_path) == size
+
+
+def test_key_is_platform_and_link(snapshot_path):
+    store = ContestStore(snapshot_path)
+    shared = "https://example.com/contest/1"
+    a = Contest(oj="LeetCode", name="Weekly 1", stime=1, link=shared)
+    b = Contest(oj="NowCoder", name="Weekly 1", stime=1, link=shared)
+    store.merge([a, b])
+    assert len(store) == 2
+
+    # 同一平台同一链接的重复条目只保留最后一条
+    renamed = Contest(oj="LeetCode", name="Weekly 1 (renamed)", stime=1, link=shared)
+    changes = store.merge([a, renamed, b])
+    assert changes.summary() == {"inserted": 0, "updated": 1, "removed": 0}
+    assert len(store) == 2
+
+
+def test_partial_failure_keeps_failed_sources(snapshot_path):
+    store = ContestStore(snapshot_path)
+    codeforces = [_contest("Codeforces", i) for i in range(3)]
+    atcoder = [_contest("AtCoder", i) for i in range(3)]
+    store.merge(codeforces + atcoder, sources=["Codeforces", "AtCoder"])
+
+    # AtCoder 爬取失败：本次结果中没有它的比赛，但不应视为移除
+    changes = store.merge(codeforces[1:], sources=["Codeforces"])
+    assert changes.summary() == {"inserted": 0, "updated": 0, "removed": 1}
+    assert changes.removed == [codeforces[0]]
+    assert _keys(store.read_all()) == _keys(codeforces[1:] + atcoder)
+
+    # 只有被移除的比赛进入历史
+    assert store.history() == [codeforces[0]]
+
+    # 所有平台都失败时什么也不移除
+    assert not store.merge([], sources=[])
+    assert len(store) == 5
+
+
+def test_reload_replays_snapshot_and_log(snapshot_path):
+    store = ContestStore(snapshot_path)
+    contests = [_contest("Codeforces", i) for i in range(6)]
+    store.merge(contests)
+    store.compact()
+    assert not os.path.exists(store.log_path)
+
+    # 快照之后的变化只存在于日志中
+    rescheduled = _contest("Codeforces", 2, stime=1_800_000_000)
+    latest = contests[1:2] + [rescheduled] + contests[3:] + [_contest("Codeforces", 10)]
+    store.merge(latest)
+    with open(store.log_path, "r", encoding="utf-8") as f:
+        ops = [json.loads(line)["op"] for line in f]
+    assert sorted(ops) == ["remove", "upsert", "upsert"]
+
+    reloaded = ContestStore(snapshot_path)
+    assert reloaded.read_all() == store.read_all()
+    assert reloaded.history() == [contests[0]]
+    # 重放后继续合并，结果与未重启时一致
+    assert not reloaded.merge(latest)
+
+
+def test_reload_ignores_truncated_log_line(snapshot_path):
+    store = ContestStore(snapshot_path)
+    contests = [_contest("AtCoder", i) for i in range(3)]
+    store.merge(contests)
+    with open(store.log_path, "a", encoding="utf-8") as f:
+        f.write('{"time": 1, "op": "upsert", "contest": {"oj": "AtC')
+
+    reloaded = ContestStore(snapshot_path)
+    assert reloaded.read_all() == store.read_all()
+    # 不完整的记录被丢弃并立即压缩进快照
+    assert not os.path.exists(reloaded.log_path)
+    assert ContestStore(snapshot_path).read_all() == store.read_all()
+
+
+def test_log_compacts_above_threshold(snapshot_path, monkeypatch):
+    monkeypatch.setattr(ContestStore, "COMPACT_THRESHOLD", 10)
+    store = ContestStore(snapshot_path)
+    contests = []
+    for i in range(12):
+        contests.append(_contest("Codeforces", i))
+        store.merge(contests)
+    assert store._log_records <= ContestStore.COMPACT_THRESHOLD
+    assert ContestStore(snapshot_path).read_all() == store.read_all()
@@ -0,0 +1,106 @@
+"""
+CSV通知存储测试
+按顺序追加 / 拼接到表头之后的快速路径，结果应与追加后整体排序完全一致
+"""
+
+import os
+import csv
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.storage import CsvNoticeStore, CsvOffsetIndex, NOTICE_FIELDNAMES
+
+
+def _notice(day: date, index: int) -> dict:
+    return {"时间": day.isoformat(), "标题": f"关于“挑战杯”,第{index}号\n通知", "链接": f"https://bksy.csu.edu.cn/info/1012/{index}.htm"}
+
+
+def _reference_rows(batches: list[list[dict]]) -> list[dict]:
+    """逐批追加后稳定排序（新的在前）的结果"""
+    rows = []
+    for batch in batches:
+        rows = sorted(rows + batch, key=lambda row: row["时间"], reverse=True)
+    return rows
+
+
+def _read_csv(path: str) -> list[dict]:
+    with open(path, "r", encoding="UTF-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CsvNoticeStore(str(tmp_path / "notices.csv"))
+    yield store
+    store.close()
+
+
+def test_ordered_batches_skip_full_sort(store, monkeypatch):
+    start = date(2026, 10, 1)
+    batches = [
+        [_notice(start, 0), _notice(start - timedelta(days=2), 1)],
+        [_notice(start - timedelta(days=3), 2), _notice(start - timedelta(days=2), 3)],   # 不晚于最早的通知：追加
+        [_notice(start + timedelta(days=1), 4), _notice(start + timedelta(days=5), 5)],   # 晚于最新的通知：拼接
+        [_notice(start + timedelta(days=5), 6), _notice(start + timedelta(days=5), 7)],   # 与最新的通知同一天：放在其后
+        [_notice(start, 8), _notice(start - timedelta(days=1), 9)],                       # 插入到中间
+    ]
+    store.add_notices(batches[0])
+
+    def fail_sort():
+        raise AssertionError("有序批次不应整体排序")
+    monkeypatch.setattr(store, "sort", fail_sort)
+    for batch in batches[1:]:
+        assert store.add_notices(batch) == batch
+
+    expected = _reference_rows(batches)
+    assert _read_csv(store.storage_path) == expected
+    assert store.read_page(100, 1) == expected
+    assert store.read_page(2, 2) == expected[2:4]
+    # 增量维护的行偏移与重新扫描的结果一致，重新加载时不需要重建
+    assert store.offset_index.offsets == CsvOffsetIndex(store.storage_path).offsets
+    assert list(store.offset_index.offsets) == list(_rebuilt_offsets(store.storage_path))
+
+
+def _rebuilt_offsets(path: str):
+    index = CsvOffsetIndex(path)
+    index.rebuild()
+    return index.offsets
+
+
+def test_random_batches_match_full_sort(store):
+    rng = random.Random(7)
+    start = date(2025, 1, 1)
+    batches, next_index = [], 0
+    for _ in range(30):
+        batch = []
+        for _ in range(rng.randint(1, 5)):
+            batch.append(_notice(start + timedelta(days=rng.randint(0, 40)), next_index))
+            next_index += 1
+        batches.append(batch)
+        store.add_notices(batch)
+        assert store.read_page(1000, 1) == _reference_rows(batches)
+
+    assert _read_csv(store.storage_path) == _reference_rows(batches)
+    assert list(store.offset_index.offsets) == list(_rebuilt_offsets(store.storage_path))
+    assert store.count() == next_index
+
+
+def test_duplicate_links_are_not_written(store):
+    notice = _notice(date(2026, 1, 1), 1)
+    assert store.add_notices([notice, notice]) == [notice]
+    assert store.add_notices([notice]) == []
+    assert len(_read_csv(store.storage_path)) == 1
+
+
+def test_append_after_missing_trailing_newline(store):
+    store.add_notices([_notice(date(2026, 1, 2), 1)])
+    with open(store.storage_path, "rb+") as f:
+        f.seek(-2, os.SEEK_END)
+        f.truncate()     # 去掉最后的 \r\n
+    store.add_notices([_notice(date(2026, 1, 1), 2)])
+    rows = _read_csv(store.storage_path)
+    assert [row["链接"][-6:] for row in rows] == ["/1.htm", "/2.htm"]
+    assert list(rows[0]) == NOTICE_FIELDNAMES
+    assert store.read_page(10, 1) == rows
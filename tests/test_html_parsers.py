@@ -0,0 +1,143 @@
+"""
+HTML解析后端测试
+各后端对同一页面应给出完全相同的结果，html.parser 后端作为基准
+"""
+
+import html
+import json
+
+import pytest
+
+from src.core.html_parsers import _BACKENDS, _slice_fragment
+
+
+def _available_backends():
+    backends = []
+    for backend_cls in _BACKENDS.values():
+        try:
+            backends.append(backend_cls())
+        except ImportError:
+            continue    # 未安装的后端跳过
+    return backends
+
+
+BACKENDS = _available_backends()
+REFERENCE = _BACKENDS["html.parser"]()
+
+
+NOTICE_PAGE = """<html><head><title>创新与创业教育办公室-中南大学本科生院</title></head><body>
+<div class="header"><ul class="menu"><li><a href="../index.htm">首页</a><ul class="sub"><li><a href="../gk/jj.htm">概况</a></li></ul></li></ul></div>
+<div class="right"><ul class="right-list">
+<li id="line_u10_0"><a href="../info/1012/18342.htm" target="_blank" title="关于组织参加第十八届蓝桥杯全国软件和信息技术专业人才大赛的通知">关于组织参加第十八届蓝桥杯全国软件和信息技术专业人才大赛的通知</a><span>[2026-10-16]</span></li>
+<li id="line_u10_1"><a href="../info/1012/18339.htm" target="_blank" title="关于举办第十二届“互联网+”校内选拔赛的通知">关于举办第十二届“<b>互联网+</b>”校内选拔赛的通知 </a><span>[2026-10-14]</span><ul class="attach-list"><li><a href="../system/_content/download.jsp?wbfileid=98101">附件1：报名表.docx</a></li><li><a href="../system/_content/download.jsp?wbfileid=98111">附件2：竞赛章程.pdf</a></li></ul></li>
+<li id="line_u10_2"><a href="../info/1012/18336.htm" target="_blank" title="关于2026年大学生创新创业训练计划项目中期检查工作的通知">关于2026年大学生创新创业训练计划项目中期检查工作的通知</a><span>[2026-10-11]</span></li>
+<li id="line_u10_3">没有链接的条目</li>
+</ul>
+<div class="pb_sys_common"><span class="p_no"><a href="cxycyjybgs/17.htm">2</a></span></div></div>
+</body></html>"""
+
+
+def _atcoder_row(slug: str, name: str, start: str, duration: str) -> str:
+    return (
+        "<tr>\n"
+        "\t<td class=\"text-center\"><a href='http://www.timeanddate.com/worldclock/fixedtime.html?iso=x&p1=248' target='blank'>"
+        f"<time class='fixtime fixtime-full'>{start}</time></a></td>\n"
+        "\t<td ><span aria-hidden='true' data-toggle='tooltip' data-placement='top' title=\"Algorithm\">Ⓐ</span>\n"
+        f"\t\t<span class=\"user-blue\">◉</span>\n\t\t<a href=\"/contests/{slug}\">{name}</a>\n\t</td>\n"
+        f"\t<td class=\"text-center\">{duration}</td>\n\t<td class=\"text-center\"> - 1999</td>\n</tr>\n"
+    )
+
+
+def _atcoder_table(div_id: str, rows: list[str]) -> str:
+    return (
+        f"<div id=\"{div_id}\" class=\"mb-2\"><h3>{div_id}</h3>\n"
+        "<div class=\"panel panel-default\"><div class=\"table-responsive\"><table class=\"table table-default\">\n"
+        "<thead><tr><th>Start Time</th><th>Contest Name</th><th>Duration</th><th>Rated Range</th></tr></thead>\n"
+        f"<tbody>\n{''.join(rows)}</tbody></table></div></div></div>\n"
+    )
+
+
+ATCODER_PAGE = (
+    "<!DOCTYPE html><html><head><title>Contest - AtCoder</title></head><body>"
+    "<nav class=\"navbar\"><div class=\"container\"><ul class=\"nav navbar-nav\"><li><a href=\"/home\">Home</a></li></ul></div></nav>"
+    "<div id=\"main-container\" class=\"container\"><div class=\"row\"><div class=\"col-lg-9 col-md-8\">\n"
+    + _atcoder_table("contest-table-permanent", [_atcoder_row("practice", "practice contest", "-", "-")])
+    + _atcoder_table("contest-table-upcoming", [
+        _atcoder_row("abc478", "AtCoder Beginner Contest 478", "2026-10-24 21:00:00+0900", "01:40"),
+        _atcoder_row("arc210", "AtCoder Regular Contest 210 (Div. 1)", "2026-10-25 21:00:00+0900", "02:00"),
+    ])
+    + _atcoder_table("contest-table-recent", [_atcoder_row("abc477", "AtCoder Beginner Contest 477", "2026-10-17 21:00:00+0900", "01:40")])
+    + "</div></div></div></body></html>"
+)
+
+
+def _nowcoder_item(contest_id: int, name: str) -> str:
+    info = {"contestId": contest_id, "contestName": name, "contestStartTime": 1792321200000,
+            "contestEndTime": 1792328400000, "settingInfo": {"description": "<b>&amp;</b>"}}
+    return (
+        f"<div class=\"platform-item js-item \" data-id=\"{contest_id}\" data-json=\"{html.escape(json.dumps(info, ensure_ascii=False))}\">\n"
+        f"<div class=\"platform-item-main\"><div class=\"platform-item-cont\"><h4><a href=\"/acm/contest/{contest_id}\">{name}</a></h4></div></div>\n"
+        "</div>\n"
+    )
+
+
+NOWCODER_PAGE = (
+    "<!DOCTYPE html><html><head><title>牛客竞赛</title></head><body>"
+    "<div class=\"nk-container acm-container\"><div class=\"nk-main clearfix js-container\">\n"
+    "<div class=\"platform-mod js-current\"><h2 class=\"platform-mod-tit\">正在报名</h2>\n"
+    + _nowcoder_item(120461, "牛客周赛 Round 118")
+    + _nowcoder_item(120455, "牛客小白月赛 127")
+    + "</div>\n<div class=\"platform-mod js-end\"><h2 class=\"platform-mod-tit\">已结束</h2>\n"
+    + _nowcoder_item(120400, "牛客周赛 Round 117")
+    + "</div>\n</div></div></body></html>"
+)
+
+
+@pytest.fixture(params=BACKENDS, ids=lambda backend: backend.name)
+def backend(request):
+    return request.param
+
+
+def test_notice_items(backend):
+    items = backend.notice_items(NOTICE_PAGE)
+    assert items == REFERENCE.notice_items(NOTICE_PAGE)
+    # 条目内嵌套的附件列表不会提前截断通知列表，没有链接的条目被跳过
+    assert [link for _, link, _ in items if "info/1012" in link] == [
+        "../info/1012/18342.htm", "../info/1012/18339.htm", "../info/1012/18336.htm",
+    ]
+    assert items[1][0] == "关于举办第十二届“互联网+”校内选拔赛的通知"
+    assert items[-1][2] == "[2026-10-11]"
+
+
+def test_atcoder_rows(backend):
+    rows = backend.atcoder_rows(ATCODER_PAGE)
+    assert rows == REFERENCE.atcoder_rows(ATCODER_PAGE)
+    assert rows == [
+        ("2026-10-24 21:00:00+0900", "/contests/abc478", "AtCoder Beginner Contest 478", "01:40"),
+        ("2026-10-25 21:00:00+0900", "/contests/arc210", "AtCoder Regular Contest 210 (Div. 1)", "02:00"),
+    ]
+
+
+def test_nowcoder_items(backend):
+    items = backend.nowcoder_items(NOWCODER_PAGE)
+    assert items == REFERENCE.nowcoder_items(NOWCODER_PAGE)
+    # 只取正在报名的比赛，data-json 已反转义
+    assert [json.loads(item)["contestId"] for item in items] == [120461, 120455]
+    assert json.loads(items[0])["settingInfo"]["description"] == "<b>&amp;</b>"
+
+
+def test_missing_container_returns_none(backend):
+    page = "<html><body><div class=\"main\"><ul><li><a href=\"x\">无关内容</a><span>x</span></li></ul></div></body></html>"
+    assert backend.notice_items(page) is None
+    assert backend.atcoder_rows(page) is None
+    assert backend.nowcoder_items(page) is None
+
+
+def test_slice_fragment_balances_nested_tags():
+    page = "<div><ul class=\"right-list\"><li><ul><li>a</li></ul></li><li>b</li></ul><p>tail</p></div>"
+    assert _slice_fragment(page, "right-list", "ul") == (
+        "<ul class=\"right-list\"><li><ul><li>a</li></ul></li><li>b</li></ul>"
+    )
+    assert _slice_fragment(page, "missing", "ul") == page
+    # 缺少闭合标签时截取到末尾
+    assert _slice_fragment("<p><ul class=\"right-list\"><li>a</li>", "right-list", "ul") == "<ul class=\"right-list\"><li>a</li>"
@@ -0,0 +1,242 @@
+"""
+任务调度测试
+cron 触发器的下一次执行时间与逐分钟枚举一致；错过执行时的合并、上一次未结束时的跳过；
+推送命令把 HH:MM 转换为 "M H * * *"
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.scheduler import JobScheduler, CronTrigger, IntervalTrigger
+from src.core.command_handler import CommandHelper
+from astrbot.api.event import AstrMessageEvent
+
+
+###### 触发器 ######
+
+@pytest.mark.parametrize("expr, after, expected", [
+    # 5段：分 时 日 月 周
+    ("30 8 * * *", datetime(2024, 1, 1, 8, 29, 59), datetime(2024, 1, 1, 8, 30)),
+    ("30 8 * * *", datetime(2024, 1, 1, 8, 30), datetime(2024, 1, 2, 8, 30)),
+    ("*/20 9-10 * * *", datetime(2024, 1, 1, 10, 40), datetime(2024, 1, 2, 9, 0)),
+    # 6段：秒 分 时 日 月 周
+    ("*/15 * * * * *", datetime(2024, 1, 1, 10, 0, 7), datetime(2024, 1, 1, 10, 0, 15)),
+    ("45 59 23 * * *", datetime(2024, 1, 1, 23, 59, 45), datetime(2024, 1, 2, 23, 59, 45)),
+    # 月末、年末进位
+    ("0 0 1 * *", datetime(2024, 1, 31, 12, 0), datetime(2024, 2, 1, 0, 0)),
+    ("0 0 31 * *", datetime(2024, 1, 31, 0, 0), datetime(2024, 3, 31, 0, 0)),
+    ("59 23 31 12 *", datetime(2024, 12, 31, 23, 59), datetime(2025, 12, 31, 23, 59)),
+    ("0 12 29 2 *", datetime(2024, 3, 1), datetime(2028, 2, 29, 12, 0)),
+    # 周字段：0 和 7 都是周日；日与周同时限定时满足其一即可
+    ("0 9 * * 0", datetime(2024, 1, 1), datetime(2024, 1, 7, 9, 0)),
+    ("0 9 * * 7", datetime(2024, 1, 1), datetime(2024, 1, 7, 9, 0)),
+    ("0 0 13 * 5", datetime(2024, 1, 1), datetime(2024, 1, 5, 0, 0)),
+    ("0 0 1,15 * 1-5", datetime(2024, 6, 14, 1), datetime(2024, 6, 15, 0, 0)),
+])
+def test_cron_next_fire(expr, after, expected):
+    assert CronTrigger(expr).next_fire(after) == expected
+
+
+@pytest.mark.parametrize("expr", ["15 */6 * * *", "0 8 * * 1-5", "5,35 12 10-20 * *", "0 0 29 * 0", "*/7 3 * 2 *"])
+def test_cron_matches_minute_scan(expr):
+    """与逐分钟枚举的结果一致"""
+    trigger = CronTrigger(expr)
+    minute, hour, day, month, weekday = expr.split()
+
+    def match(dt: datetime) -> bool:
+        fields = [
+            (minute, dt.minute, 0, 59), (hour, dt.hour, 0, 23), (day, dt.day, 1, 31), (month, dt.month, 1, 12),
+        ]
+        ok = [value in CronTrigger._parse_field(part, "", lo, hi) for part, value, lo, hi in fields]
+        weekday_ok = dt.isoweekday() % 7 in {w % 7 for w in CronTrigger._parse_field(weekday, "", 0, 7)}
+        if day != "*" and weekday != "*":
+            return ok[0] and ok[1] and ok[3] and (ok[2] or weekday_ok)
+        return all(ok) and (weekday == "*" or weekday_ok)
+
+    dt = datetime(2024, 1, 28, 0, 0)
+    fire = trigger.next_fire(dt - timedelta(seconds=1))
+    end = datetime(2024, 4, 1)
+    while dt < end:
+        if match(dt):
+            assert fire == dt
+            fire = trigger.next_fire(dt)
+        dt += timedelta(minutes=1)
+
+
+def test_cron_next_fire_after_missed_run():
+    """从很久以前的时间计算时，返回其后的第一次，而不是当前时间之后的"""
+    trigger = CronTrigger("0 8 * * *")
+    missed = datetime(2024, 1, 1, 8, 0)
+    assert trigger.next_fire(missed) == datetime(2024, 1, 2, 8, 0)
+    assert trigger.next_fire(missed - timedelta(microseconds=1)) == missed
+
+
+@pytest.mark.parametrize("expr", ["0 8 * *", "0 0 8 * * * *", "60 * * * *", "0 24 * * *", "0 0 0 * *", "a * * * *", "*/0 * * * *"])
+def test_cron_rejects_invalid(expr):
+    with pytest.raises(ValueError):
+        CronTrigger(expr)
+
+
+def test_cron_never_fires():
+    with pytest.raises(ValueError):
+        CronTrigger("0 0 30 2 *").next_fire(datetime(2024, 1, 1))
+
+
+def test_interval_trigger_does_not_drift():
+    start = datetime(2024, 1, 1)
+    trigger = IntervalTrigger(90, start=start)
+    assert trigger.next_fire(start - timedelta(days=1)) == start
+    assert trigger.next_fire(start) == start + timedelta(seconds=90)
+    assert trigger.next_fire(start + timedelta(seconds=100)) == start + timedelta(seconds=180)
+
+
+###### 调度器 ######
+
+def test_missed_runs_are_coalesced():
+    async def main():
+        scheduler = JobScheduler()
+        calls = []
+
+        async def func():
+            calls.append(datetime.now())
+
+        job = scheduler.add_job("hourly", CronTrigger("0 * * * *"), func)
+        # 模拟系统休眠：上一次应执行的时间在3个多小时前
+        job.next_run = datetime.now() - timedelta(hours=3, minutes=30)
+        scheduler._fire(job)
+        await job._task
+
+        now = datetime.now()
+        assert len(calls) == 1
+        assert job.missed >= 3
+        assert now < job.next_run <= now + timedelta(hours=1)
+        assert scheduler.next_run_time() == job.next_run
+
+    asyncio.run(main())
+
+
+def test_missed_runs_without_coalesce_catch_up():
+    async def main():
+        scheduler = JobScheduler()
+
+        async def func():
+            pass
+
+        job = scheduler.add_job("hourly", CronTrigger("0 * * * *"), func, coalesce=False)
+        missed = (datetime.now() - timedelta(hours=3)).replace(minute=0, second=0, microsecond=0)
+        job.next_run = missed
+        scheduler._fire(job)
+        await job._task
+        # 逐次补上错过的执行
+        assert job.missed == 0
+        assert job.next_run == missed + timedelta(hours=1)
+
+    asyncio.run(main())
+
+
+def test_skip_while_previous_run_is_running():
+    async def main():
+        scheduler = JobScheduler()
+        release = asyncio.Event()
+        started = []
+
+        async def func():
+            started.append(1)
+            await release.wait()
+
+        job = scheduler.add_job("slow", IntervalTrigger(60), func)
+        scheduler._fire(job)
+        await asyncio.sleep(0)
+        assert job.running
+
+        scheduler._fire(job)
+        await asyncio.sleep(0)
+        assert job.skipped == 1
+        assert len(started) == 1
+
+        release.set()
+        await job._task
+        scheduler._fire(job)
+        await job._task
+        assert job.runs == 2
+        assert job.skipped == 1
+        await scheduler.stop()
+
+    asyncio.run(main())
+
+
+def test_run_loop_fires_and_removes_jobs():
+    async def main():
+        scheduler = JobScheduler()
+        fired = asyncio.Event()
+
+        async def func(tag):
+            fired.set()
+
+        scheduler.start()
+        job = scheduler.add_job("soon", IntervalTrigger(0.05), func, "tag")
+        await asyncio.wait_for(fired.wait(), timeout=5)
+        assert job.runs >= 1
+
+        assert scheduler.remove_job("soon")
+        assert "soon" not in scheduler
+        assert scheduler.next_run_time() is None
+        await scheduler.stop()
+        assert not scheduler.running
+
+    asyncio.run(main())
+
+
+###### 推送命令 ######
+
+class _Event(AstrMessageEvent):
+    def get_session_id(self) -> str:
+        return "group_1"
+
+    def plain_result(self, text: str) -> str:
+        return text
+
+
+class _GroupConfig:
+    def __init__(self):
+        self.tasks = []
+
+    async def set_push_task(self, session_id, script_path, cron_expr):
+        self.tasks.append((session_id, script_path, cron_expr))
+
+
+class _ConfigManager:
+    def get_storage_root(self) -> str:
+        return "/tmp"
+
+
+def _set_pushing_time(time: str):
+    group_config = _GroupConfig()
+    helper = CommandHelper(_ConfigManager(), None, group_config)
+
+    async def main():
+        return [result async for result in helper.set_task_pushing_time(_Event(), "scripts/weather.py", time)]
+
+    return asyncio.run(main()), group_config.tasks
+
+
+@pytest.mark.parametrize("time, expected", [
+    ("08:05", "5 8 * * *"),
+    ("23:59", "59 23 * * *"),
+    (" 7:30 ", "30 7 * * *"),
+    ("*/30 9-18 * * 1-5", "*/30 9-18 * * 1-5"),
+])
+def test_pushing_time_to_cron(time, expected):
+    results, tasks = _set_pushing_time(time)
+    assert tasks == [("group_1", "scripts/weather.py", expected)]
+    assert expected in results[0]
+    # 转换结果是调度器可以接受的表达式
+    CronTrigger(expected)
+
+
+def test_pushing_time_rejects_invalid_clock():
+    results, tasks = _set_pushing_time("25:00")
+    assert tasks == []
+    assert results[0].startswith("参数错误")
@@ -0,0 +1,126 @@
+"""
+JSON数组流式解析测试
+任意切分响应（包括在字符串、转义序列与多字节字符中间切开）时，结果都应与 json.loads 一致
+"""
+
+import os
+import json
+import random
+
+import pytest
+
+from src.crawlers.json_stream import JsonArrayStream
+
+CF_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "contest_cf.json")
+
+
+def _chunks(data: bytes, sizes):
+    pos = 0
+    for size in sizes:
+        if pos >= len(data):
+            return
+        yield data[pos:pos + size]
+        pos += size
+    if pos < len(data):
+        yield data[pos:]
+
+
+def _stream_all(data: bytes, sizes, key: str = "result"):
+    stream = JsonArrayStream(key)
+    items = []
+    for chunk in _chunks(data, sizes):
+        items += stream.feed(chunk)
+    items += stream.close()
+    return stream, items
+
+
+def _random_sizes(seed: int, max_size: int):
+    rng = random.Random(seed)
+    while True:
+        yield rng.randint(1, max_size)
+
+
+@pytest.fixture(scope="module")
+def cf_body() -> bytes:
+    with open(CF_FIXTURE, "rb") as f:
+        return f.read()
+
+
+def test_cf_fixture_one_byte_chunks(cf_body):
+    expected = json.loads(cf_body)
+    stream, items = _stream_all(cf_body, iter(lambda: 1, 0))
+    assert items == expected["result"]
+    assert stream.header == {"status": "OK"}
+    assert stream.finished
+    assert stream.consumed_bytes == len(cf_body)
+
+
+@pytest.mark.parametrize("seed, max_size", [(0, 7), (1, 64), (2, 4096), (3, 65536)])
+def test_cf_fixture_random_chunks(cf_body, seed, max_size):
+    stream, items = _stream_all(cf_body, _random_sizes(seed, max_size))
+    assert items == json.loads(cf_body)["result"]
+    assert stream.header == {"status": "OK"}
+
+
+def test_strings_escapes_and_multibyte_characters():
+    payload = {
+        "status": "OK",
+        "comment": "前缀里的 \"result\": [ 不是数组",
+        "result": [
+            {"name": "含有 ] , { } 与 \\\" 的名称", "id": 1},
+            {"name": "转义 \\u4e2d\\u6587 与 \n 换行", "id": -2.5e3},
+            "字符串元素",
+            12345678901234567890,
+            [1, [2, [3]]],
+            None,
+            True,
+        ],
+        "trailing": {"ignored": True},
+    }
+    for ensure_ascii in (True, False):
+        data = json.dumps(payload, ensure_ascii=ensure_ascii).encode("utf-8")
+        for seed in range(20):
+            stream, items = _stream_all(data, _random_sizes(seed, 5))
+            assert items == payload["result"]
+            assert stream.header == {"status": "OK", "comment": payload["comment"]}
+
+
+def test_scalar_at_chunk_end_waits_for_more_data():
+    stream = JsonArrayStream("result")
+    assert stream.feed(b'{"result": [12') == []       # 12 之后可能还有数字
+    assert stream.feed(b'34, 5') == [1234]
+    assert stream.feed(b"]}") == [5]
+    assert stream.finished
+    assert stream.close() == []
+
+
+def test_missing_key_parses_whole_response():
+    data = json.dumps({"status": "FAILED", "comment": "Call limit exceeded"}).encode("utf-8")
+    stream, items = _stream_all(data, _random_sizes(0, 3))
+    assert items == []
+    assert stream.header == {"status": "FAILED", "comment": "Call limit exceeded"}
+    assert not stream.finished
+
+
+def test_empty_array():
+    stream, items = _stream_all(b'{"status": "OK", "result": []}', iter(lambda: 1, 0))
+    assert items == []
+    assert stream.finished
+
+
+@pytest.mark.parametrize("data", [
+    b'{"status": "OK", "result": [{"id": 1}, {"id": 2',      # 元素被截断
+    b'{"status": "OK", "result": [{"id": 1}, {"id": 2}',     # 数组未结束
+    b'{"status": "OK", "resu',                              # 还没到数组
+])
+def test_truncated_input_raises_on_close(data):
+    stream = JsonArrayStream("result")
+    for chunk in _chunks(data, iter(lambda: 3, 0)):
+        stream.feed(chunk)
+    with pytest.raises(json.JSONDecodeError):
+        stream.close()
+
+
+def test_items_before_truncation_are_returned_by_feed():
+    stream = JsonArrayStream("result")
+    assert stream.feed(b'{"status": "OK", "result": [{"id": 1}, {"id": 2}, {"id"') == [{"id": 1}, {"id": 2}]
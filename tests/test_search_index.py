@@ -0,0 +1,125 @@
+"""
+通知标题搜索索引测试
+与逐条子串匹配的朴素扫描对比：完整匹配的结果与顺序一致，经过日志压缩与重新加载后也一致
+"""
+
+import os
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.storage import NoticeSearchIndex
+
+QUERIES = [
+    "第4242届", "第12届", "挑战杯", "“挑战杯”", "选拔赛 通知", "届", "ACM", "ａｃｍ", "程序设计竞赛", "第7届 ACM",
+    "不存在的关键词", "x",
+]
+
+
+def _synthetic_rows(size: int, seed: int = 0) -> list[dict]:
+    """与基准测试相同的合成通知（每天约3条），夹杂少量其他标题"""
+    rng = random.Random(seed)
+    start = date(2024, 12, 31)
+    rows = []
+    for i in range(size):
+        if i % 7 == 0:
+            title = f"关于组织第{i}届ＡＣＭ国际大学生程序设计竞赛{rng.choice(['校赛', '选拔赛', '集训'])}的通知"
+        else:
+            title = f"关于举办第{i}届“挑战杯”大学生课外学术科技作品竞赛校内选拔赛的通知"
+        rows.append({
+            "时间": (start - timedelta(days=i // 3)).strftime("%Y-%m-%d"),
+            "标题": title,
+            "链接": f"https://bksy.csu.edu.cn/info/1012/{100000 + i}.htm",
+        })
+    return rows
+
+
+def _scan(docs: list[dict], query: str, limit: int) -> list[dict]:
+    """朴素扫描：标题包含查询的每一段即为匹配，按时间从新到旧（同一天后加入的在前）"""
+    segments = NoticeSearchIndex.segments(query)
+    matches = [
+        (doc["时间"], doc_id, doc) for doc_id, doc in enumerate(docs)
+        if all(segment in NoticeSearchIndex.normalize(doc["标题"]) for segment in segments)
+    ]
+    matches.sort(key=lambda item: item[:2], reverse=True)
+    return [doc for _, _, doc in matches[:limit]]
+
+
+def _assert_parity(index: NoticeSearchIndex, docs: list[dict], limit: int = 10):
+    for query in QUERIES:
+        expected = _scan(docs, query, limit)
+        total, results = index.search(query, limit)
+        # 完整匹配排在前面，顺序与朴素扫描一致；不足 limit 条时后面可能跟着部分匹配
+        assert results[:len(expected)] == expected, query
+        assert total >= len(expected), query
+        for notice in results[len(expected):]:
+            assert notice not in expected
+
+
+def test_search_matches_substring_scan(tmp_path):
+    rows = _synthetic_rows(600)
+    random.Random(1).shuffle(rows)
+    index = NoticeSearchIndex(str(tmp_path / "search.json"))
+    index.add(rows)
+    _assert_parity(index, rows)
+    _assert_parity(index, rows, limit=1000)
+
+
+def test_parity_across_compaction_and_reload(tmp_path, monkeypatch):
+    snapshot_path = str(tmp_path / "search.json")
+    rows = _synthetic_rows(5000, seed=2)
+    random.Random(3).shuffle(rows)
+    index = NoticeSearchIndex(snapshot_path)
+    compactions = []
+    compact = NoticeSearchIndex.compact
+
+    def counting_compact(self):
+        compactions.append(self._log_records)
+        compact(self)
+
+    monkeypatch.setattr(NoticeSearchIndex, "compact", counting_compact)
+
+    added = []
+    for start in range(0, len(rows), 250):
+        batch = rows[start:start + 250]
+        # 重复加入已有的链接不会产生重复结果
+        assert index.add(batch + added[-5:]) == len(batch)
+        added += batch
+        if start % 1000 == 0:
+            # 查询后再增量加入，检验按时间排序的缓存
+            _assert_parity(index, added)
+
+    assert compactions, "日志超过阈值时应压缩进快照"
+    assert all(records > NoticeSearchIndex.COMPACT_THRESHOLD for records in compactions)
+    assert 0 < index._log_records <= NoticeSearchIndex.COMPACT_THRESHOLD
+    assert os.path.exists(index.log_path)
+    _assert_parity(index, added)
+
+    # 快照 + 日志重新加载
+    reloaded = NoticeSearchIndex(snapshot_path)
+    assert len(reloaded) == len(rows)
+    _assert_parity(reloaded, added)
+    for query in QUERIES:
+        assert reloaded.search(query, 20) == index.search(query, 20)
+
+
+def test_truncated_log_is_compacted(tmp_path):
+    snapshot_path = str(tmp_path / "search.json")
+    rows = _synthetic_rows(50)
+    index = NoticeSearchIndex(snapshot_path)
+    index.add(rows)
+    with open(index.log_path, "a", encoding="utf-8") as f:
+        f.write('{"时间": "2024-01-01", "标题": "关于')
+
+    reloaded = NoticeSearchIndex(snapshot_path)
+    assert len(reloaded) == len(rows)
+    assert not os.path.exists(reloaded.log_path)
+    _assert_parity(reloaded, rows)
+
+
+@pytest.mark.parametrize("query", ["", "   ", "，。！"])
+def test_empty_query(tmp_path, query):
+    index = NoticeSearchIndex(str(tmp_path / "search.json"))
+    index.add(_synthetic_rows(10))
+    assert index.search(query) == (0, [])
@@ -0,0 +1,140 @@
+"""
+SQLite通知存储测试
+首次启动从CSV迁移（只迁移一次），分页顺序（时间倒序，同一天先存储的在前）与CSV后端一致
+"""
+
+import csv
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from src.storage import CsvNoticeStore, SqliteNoticeStore, NOTICE_FIELDNAMES
+
+
+def _notice(day: date, index: int) -> dict:
+    return {"时间": day.isoformat(), "标题": f"关于“挑战杯”,第{index}号\n通知", "链接": f"https://bksy.csu.edu.cn/info/1012/{index}.htm"}
+
+
+def _batches(count: int, size: int, seed: int) -> list[list[dict]]:
+    """日期随机（大量同一天）的若干批通知，批次内与批次间都有重复链接"""
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    return [
+        [_notice(start + timedelta(days=rng.randrange(30)), rng.randrange(count * size)) for _ in range(size)]
+        for _ in range(count)
+    ]
+
+
+def _write_csv(path: str, rows: list[dict]):
+    with open(path, "w", encoding="UTF-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=NOTICE_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _pages(store, n: int) -> list[list[dict]]:
+    pages = []
+    page = 1
+    while True:
+        rows = store.read_page(n, page)
+        pages.append(rows)
+        if not rows:
+            return pages
+        page += 1
+
+
+@pytest.fixture
+def legacy_csv(tmp_path):
+    """旧版本留下的CSV：由CSV后端逐批写入，按时间倒序"""
+    path = str(tmp_path / "csu_innovation_notices.csv")
+    store = CsvNoticeStore(path)
+    for batch in _batches(5, 40, seed=0):
+        store.add_notices(batch)
+    store.close()
+    return path
+
+
+def test_migrates_legacy_csv(tmp_path, legacy_csv):
+    with open(legacy_csv, "r", encoding="UTF-8", newline="") as f:
+        expected = list(csv.DictReader(f))
+
+    store = SqliteNoticeStore(str(tmp_path / "notices.db"), legacy_csv_path=legacy_csv)
+    assert store.count() == len(expected)
+    assert store.read_page(len(expected) + 1, 1) == expected
+    assert store.existing_links() == {row["链接"] for row in expected}
+    assert store.latest_date() == expected[0]["时间"]
+    assert store._get_meta("csv_migrated") == "1"
+    store.close()
+
+
+def test_second_start_does_not_migrate_again(tmp_path, legacy_csv):
+    db_path = str(tmp_path / "notices.db")
+    store = SqliteNoticeStore(db_path, legacy_csv_path=legacy_csv)
+    count = store.count()
+    store.add_notices([_notice(date(2025, 1, 1), 10_000)])
+    store.close()
+
+    # 迁移之后CSV不再使用：即使被修改，再次启动也不会重复导入
+    with open(legacy_csv, "a", encoding="UTF-8", newline="") as f:
+        csv.DictWriter(f, fieldnames=NOTICE_FIELDNAMES).writerow(_notice(date(2025, 2, 1), 20_000))
+    store = SqliteNoticeStore(db_path, legacy_csv_path=legacy_csv)
+    assert store.count() == count + 1
+    assert "https://bksy.csu.edu.cn/info/1012/20000.htm" not in store.existing_links()
+    store.close()
+
+    with sqlite3.connect(db_path) as conn:
+        links = [row[0] for row in conn.execute("SELECT link FROM notices")]
+        meta = conn.execute("SELECT key, value FROM meta").fetchall()
+    assert len(links) == len(set(links))
+    assert meta == [("csv_migrated", "1")]
+
+
+def test_missing_csv_marks_migrated(tmp_path):
+    csv_path = str(tmp_path / "csu_innovation_notices.csv")
+    db_path = str(tmp_path / "notices.db")
+    store = SqliteNoticeStore(db_path, legacy_csv_path=csv_path)
+    assert store.count() == 0
+    assert store._get_meta("csv_migrated") == "1"
+    store.close()
+
+    # 之后出现的CSV（如CSV后端新写入的）不会被导入
+    _write_csv(csv_path, [_notice(date(2024, 1, 1), 1)])
+    store = SqliteNoticeStore(db_path, legacy_csv_path=csv_path)
+    assert store.count() == 0
+    store.close()
+
+
+def test_unreadable_csv_is_retried(tmp_path):
+    csv_path = tmp_path / "csu_innovation_notices.csv"
+    db_path = str(tmp_path / "notices.db")
+    csv_path.write_bytes(b"\xff\xfe\x00broken")
+    store = SqliteNoticeStore(db_path, legacy_csv_path=str(csv_path))
+    assert store.count() == 0
+    assert store._get_meta("csv_migrated") is None
+    store.close()
+
+    rows = [_notice(date(2024, 1, 2), 2), _notice(date(2024, 1, 1), 1)]
+    _write_csv(str(csv_path), rows)
+    store = SqliteNoticeStore(db_path, legacy_csv_path=str(csv_path))
+    assert store.read_page(10, 1) == rows
+    store.close()
+
+
+@pytest.mark.parametrize("page_size", [1, 7, 10, 64])
+def test_paging_matches_csv_backend(tmp_path, legacy_csv, page_size):
+    csv_store = CsvNoticeStore(legacy_csv)
+    sqlite_store = SqliteNoticeStore(str(tmp_path / "notices.db"), legacy_csv_path=legacy_csv)
+    assert _pages(sqlite_store, page_size) == _pages(csv_store, page_size)
+
+    # 迁移后两个后端写入相同的批次，返回的新增通知与分页结果都一致
+    for batch in _batches(6, 30, seed=1):
+        assert sqlite_store.add_notices(batch) == csv_store.add_notices(batch)
+        assert sqlite_store.count() == csv_store.count()
+        assert sqlite_store.latest_date() == csv_store.latest_date()
+    assert _pages(sqlite_store, page_size) == _pages(csv_store, page_size)
+    assert sqlite_store.read_page(page_size, 10_000) == []
+
+    csv_store.close()
+    sqlite_store.close()